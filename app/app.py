@@ -11,6 +11,9 @@ from database.db import (
     init_login_table,
     init_user_table
 )
+from utils.metrics import set_page
+
+set_page("login")
 
 # =====================================================
 # PAGE CONFIG (MUST BE FIRST)
@@ -116,6 +119,7 @@ if role == "doctor":
             "Heart Risk",
             "Medical Report Analyzer",
             "Telemedicine",
+            "Model Insights",
             "Admin Analytics"
         ]
     )
@@ -148,6 +152,7 @@ Welcome Dr. *{username}*
 - Access Admin Analytics  
 - Review Reports  
 - Manage Telemedicine  
+- Explore Model Insights  
 """)
 
     else:
@@ -174,5 +179,8 @@ elif menu == "Medical Report Analyzer":
 elif menu == "Telemedicine":
     st.switch_page("pages/5_Telemedicine.py")
 
+elif menu == "Model Insights":
+    st.switch_page("pages/6_Model_Insights.py")
+
 elif menu == "Admin Analytics":
     st.switch_page("pages/9_Admin_Dashboard.py")
\ No newline at end of file
@@ -0,0 +1,115 @@
+import os
+
+# --------------------------------------------------
+# Project paths
+# --------------------------------------------------
+BASE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+
+DATASETS_DIR = os.path.join(BASE_DIR, "training", "datasets")
+
+# --------------------------------------------------
+# Runtime settings (override through environment variables)
+# --------------------------------------------------
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# SHAP explanation memo (per model)
+SHAP_CACHE_MAX_ENTRIES = _env_int("SHAP_CACHE_MAX_ENTRIES", 1024)
+SHAP_CACHE_MAX_BYTES = _env_int("SHAP_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Features shown individually in explanation charts (the rest are summed)
+EXPLANATION_TOP_N = _env_int("EXPLANATION_TOP_N", 9)
+
+# Translation layer
+TRANSLATION_CACHE_SIZE = _env_int("TRANSLATION_CACHE_SIZE", 4096)
+TRANSLATION_BATCH_SIZE = _env_int("TRANSLATION_BATCH_SIZE", 16)
+
+# Long-document summarization
+SUMMARY_CHUNK_TOKENS = _env_int("SUMMARY_CHUNK_TOKENS", 480)
+SUMMARY_BATCH_SIZE = _env_int("SUMMARY_BATCH_SIZE", 8)
+SUMMARY_TOKEN_BUDGET = _env_int("SUMMARY_TOKEN_BUDGET", 16_384)
+SUMMARY_MAX_LENGTH = _env_int("SUMMARY_MAX_LENGTH", 150)
+
+# Compiled tree inference is used for batches up to this many rows; larger
+# batches go to sklearn, whose Cython traversal wins at that size
+COMPILED_TREE_MAX_ROWS = _env_int("COMPILED_TREE_MAX_ROWS", 256)
+
+# Disease prediction cache (keyed by symptom bitmask, prewarmed from
+# Training.csv)
+PREDICTION_CACHE_SIZE = _env_int("PREDICTION_CACHE_SIZE", 4096)
+PREDICTION_CACHE_TOP_K = _env_int("PREDICTION_CACHE_TOP_K", 5)
+
+# Transformer model registry
+MODEL_MEMORY_BUDGET_MB = _env_int("MODEL_MEMORY_BUDGET_MB", 2048)
+MODEL_IDLE_TTL_SECONDS = _env_int("MODEL_IDLE_TTL_SECONDS", 1800)
+
+# Fast CPU inference: comma-separated model names (or "all") to load with
+# dynamic int8 quantization; 0 threads keeps torch's default
+CPU_FAST_MODELS = [
+    name.strip()
+    for name in os.environ.get("CPU_FAST_MODELS", "").split(",")
+    if name.strip()
+]
+TORCH_INTRA_OP_THREADS = _env_int("TORCH_INTRA_OP_THREADS", 0)
+TORCH_INTER_OP_THREADS = _env_int("TORCH_INTER_OP_THREADS", 0)
+
+# SQLite data-access layer
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 8)
+DB_BUSY_TIMEOUT_MS = _env_int("DB_BUSY_TIMEOUT_MS", 5000)
+
+# Login history writer and retention
+LOGIN_FLUSH_INTERVAL_MS = _env_int("LOGIN_FLUSH_INTERVAL_MS", 500)
+LOGIN_FLUSH_BATCH_SIZE = _env_int("LOGIN_FLUSH_BATCH_SIZE", 256)
+LOGIN_RAW_RETENTION_DAYS = _env_int("LOGIN_RAW_RETENTION_DAYS", 30)
+LOGIN_HOURLY_RETENTION_DAYS = _env_int("LOGIN_HOURLY_RETENTION_DAYS", 180)
+LOGIN_RETENTION_INTERVAL_SECONDS = _env_int("LOGIN_RETENTION_INTERVAL_SECONDS", 3600)
+
+# Authentication
+BCRYPT_ROUNDS = _env_int("BCRYPT_ROUNDS", 12)
+AUTH_WORKERS = _env_int("AUTH_WORKERS", os.cpu_count() or 2)
+USER_CACHE_SIZE = _env_int("USER_CACHE_SIZE", 1024)
+USER_CACHE_TTL_SECONDS = _env_int("USER_CACHE_TTL_SECONDS", 60)
+
+# Report Analyzer pipeline cache
+REPORT_CACHE_DIR = os.environ.get(
+    "REPORT_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "reports")
+)
+REPORT_CACHE_SIZE = _env_int("REPORT_CACHE_SIZE", 64)
+# Reports hold patient text, so the on-disk copies are capped and expire;
+# REPORT_CACHE_DISK_ENTRIES=0 keeps results in memory only
+REPORT_CACHE_DISK_ENTRIES = _env_int("REPORT_CACHE_DISK_ENTRIES", 256)
+REPORT_CACHE_MAX_AGE_DAYS = _env_int("REPORT_CACHE_MAX_AGE_DAYS", 7)
+
+# PDF text extraction
+PDF_PARALLEL_PAGE_THRESHOLD = _env_int("PDF_PARALLEL_PAGE_THRESHOLD", 64)
+PDF_WORKERS = _env_int("PDF_WORKERS", min(4, os.cpu_count() or 1))
+
+# Local inference worker ("host:port"; empty runs jobs in-process)
+INFERENCE_WORKER_ADDRESS = os.environ.get("INFERENCE_WORKER_ADDRESS", "")
+# Shared secret for the worker connection. Connections carry pickles, so
+# there is no default: without a key the worker refuses to start and pages
+# run every job in-process.
+INFERENCE_WORKER_AUTHKEY = os.environ.get("INFERENCE_WORKER_AUTHKEY", "").encode()
+INFERENCE_BATCH_WINDOW_MS = _env_int("INFERENCE_BATCH_WINDOW_MS", 10)
+INFERENCE_MAX_BATCH = _env_int("INFERENCE_MAX_BATCH", 32)
+INFERENCE_RETRY_SECONDS = _env_int("INFERENCE_RETRY_SECONDS", 30)
+# Client deadlines; past either one the job runs in-process instead
+INFERENCE_CONNECT_TIMEOUT_MS = _env_int("INFERENCE_CONNECT_TIMEOUT_MS", 2000)
+INFERENCE_REPLY_TIMEOUT_SECONDS = _env_int("INFERENCE_REPLY_TIMEOUT_SECONDS", 120)
+
+# Cold-start budget per page, checked by benchmarks/startup_time.py --check
+STARTUP_BUDGET_MS = _env_int("STARTUP_BUDGET_MS", 2000)
+
+# Timing spans (buffered in memory, flushed in batches to the metrics table)
+METRICS_ENABLED = bool(_env_int("METRICS_ENABLED", 1))
+METRICS_FLUSH_INTERVAL_MS = _env_int("METRICS_FLUSH_INTERVAL_MS", 2000)
+METRICS_BUFFER_SIZE = _env_int("METRICS_BUFFER_SIZE", 100_000)
+METRICS_RETENTION_DAYS = _env_int("METRICS_RETENTION_DAYS", 14)
@@ -1,88 +1,437 @@
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import os
+import queue
+
+from config import (
+    DB_BUSY_TIMEOUT_MS,
+    DB_POOL_SIZE,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL_SECONDS
+)
+from utils.metrics import latency_bin, rollup_bucket, timed
 
 # --------------------------------------------------
 # Correct Database Path (Project Root)
 # --------------------------------------------------
-print("DB FILE LOADED:",__file__)
 BASE_DIR = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "..")
 )
 
 DB_NAME = os.path.join(BASE_DIR, "patient_data.db")
 
+# sqlite3 keeps a per-connection cache of compiled statements keyed by SQL
+# text; pooled connections keep it warm across calls.
+STATEMENT_CACHE_SIZE = 128
 
-def get_connection():
-    return sqlite3.connect(DB_NAME)
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+]
 
 
 # ==================================================
-# CONSULTATIONS TABLE
+# CONNECTION POOL
 # ==================================================
 
-def init_db():
-    with get_connection() as conn:
-        c = conn.cursor()
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _open_connection(path):
+    conn = sqlite3.connect(
+        path,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 
-        # Check if consultations table exists
+def _pool_for(path):
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+            _pools[path] = pool
+        return pool
+
+
+@contextmanager
+def get_connection():
+    """Borrow a pooled connection; commits on success, rolls back on error.
+
+    A connection is only ever used by the thread that borrowed it.
+    """
+    path = DB_NAME
+    init_schema()
+
+    pool = _pool_for(path)
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = _open_connection(path)
+
+    try:
+        with conn:
+            yield conn
+    finally:
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def close_connections():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# ==================================================
+# SCHEMA MIGRATIONS (run once per process)
+# ==================================================
+
+def _migrate_v1(c):
+    # Base schema. Databases created before versioning already have some of
+    # these tables, so every step is idempotent.
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS consultations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        patient_username TEXT NOT NULL,
+        name TEXT NOT NULL,
+        age INTEGER NOT NULL,
+        doctor TEXT NOT NULL,
+        date TEXT NOT NULL,
+        time TEXT NOT NULL,
+        symptoms TEXT
+    )
+    """)
+
+    c.execute("PRAGMA table_info(consultations);")
+    columns = [column[1] for column in c.fetchall()]
+
+    if "patient_username" not in columns:
+        # Add missing column safely
         c.execute("""
-            SELECT name FROM sqlite_master
-            WHERE type='table' AND name='consultations';
+            ALTER TABLE consultations
+            ADD COLUMN patient_username TEXT DEFAULT 'unknown';
         """)
-        table_exists = c.fetchone()
 
-        if table_exists:
-            # Check columns
-            c.execute("PRAGMA table_info(consultations);")
-            columns = [column[1] for column in c.fetchall()]
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS login_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL,
+        role TEXT NOT NULL,
+        login_time TEXT NOT NULL
+    )
+    """)
+
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        role TEXT NOT NULL
+    )
+    """)
+
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS translations (
+        source_text TEXT NOT NULL,
+        language TEXT NOT NULL,
+        translated_text TEXT NOT NULL,
+        PRIMARY KEY (source_text, language)
+    )
+    """)
+
+
+def _migrate_v2(c):
+    # History lookups filter on one column and page by id, so each index
+    # carries id to serve ORDER BY id DESC without a sort.
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_consultations_patient
+        ON consultations (patient_username, id)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_consultations_doctor
+        ON consultations (doctor, id)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_consultations_date
+        ON consultations (date)
+    """)
+
+
+def _migrate_v3(c):
+    # Rollups for the admin dashboard, kept current by triggers so reads
+    # never scan consultations.
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS consultation_totals (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total INTEGER NOT NULL,
+        age_sum INTEGER NOT NULL
+    )
+    """)
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS consultation_doctor_counts (
+        doctor TEXT PRIMARY KEY,
+        total INTEGER NOT NULL
+    )
+    """)
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS consultation_daily_counts (
+        date TEXT PRIMARY KEY,
+        total INTEGER NOT NULL
+    )
+    """)
+
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_consultations_insert
+    AFTER INSERT ON consultations
+    BEGIN
+        UPDATE consultation_totals
+        SET total = total + 1, age_sum = age_sum + NEW.age
+        WHERE id = 1;
+
+        INSERT INTO consultation_doctor_counts (doctor, total)
+        VALUES (NEW.doctor, 1)
+        ON CONFLICT (doctor) DO UPDATE SET total = total + 1;
+
+        INSERT INTO consultation_daily_counts (date, total)
+        VALUES (NEW.date, 1)
+        ON CONFLICT (date) DO UPDATE SET total = total + 1;
+    END
+    """)
+
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_consultations_delete
+    AFTER DELETE ON consultations
+    BEGIN
+        UPDATE consultation_totals
+        SET total = total - 1, age_sum = age_sum - OLD.age
+        WHERE id = 1;
+
+        UPDATE consultation_doctor_counts SET total = total - 1
+        WHERE doctor = OLD.doctor;
+        DELETE FROM consultation_doctor_counts
+        WHERE doctor = OLD.doctor AND total <= 0;
+
+        UPDATE consultation_daily_counts SET total = total - 1
+        WHERE date = OLD.date;
+        DELETE FROM consultation_daily_counts
+        WHERE date = OLD.date AND total <= 0;
+    END
+    """)
+
+    c.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_consultations_update
+    AFTER UPDATE OF age, doctor, date ON consultations
+    BEGIN
+        UPDATE consultation_totals
+        SET age_sum = age_sum - OLD.age + NEW.age
+        WHERE id = 1;
+
+        UPDATE consultation_doctor_counts SET total = total - 1
+        WHERE doctor = OLD.doctor;
+        DELETE FROM consultation_doctor_counts
+        WHERE doctor = OLD.doctor AND total <= 0;
+        INSERT INTO consultation_doctor_counts (doctor, total)
+        VALUES (NEW.doctor, 1)
+        ON CONFLICT (doctor) DO UPDATE SET total = total + 1;
+
+        UPDATE consultation_daily_counts SET total = total - 1
+        WHERE date = OLD.date;
+        DELETE FROM consultation_daily_counts
+        WHERE date = OLD.date AND total <= 0;
+        INSERT INTO consultation_daily_counts (date, total)
+        VALUES (NEW.date, 1)
+        ON CONFLICT (date) DO UPDATE SET total = total + 1;
+    END
+    """)
+
+    _rebuild_consultation_stats(c)
+
+
+def _rebuild_consultation_stats(c):
+    c.execute("DELETE FROM consultation_totals")
+    c.execute("DELETE FROM consultation_doctor_counts")
+    c.execute("DELETE FROM consultation_daily_counts")
+
+    c.execute("""
+        INSERT INTO consultation_totals (id, total, age_sum)
+        SELECT 1, COUNT(*), COALESCE(SUM(age), 0) FROM consultations
+    """)
+    c.execute("""
+        INSERT INTO consultation_doctor_counts (doctor, total)
+        SELECT doctor, COUNT(*) FROM consultations GROUP BY doctor
+    """)
+    c.execute("""
+        INSERT INTO consultation_daily_counts (date, total)
+        SELECT date, COUNT(*) FROM consultations GROUP BY date
+    """)
+
+
+def _migrate_v4(c):
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_login_history_time
+        ON login_history (login_time)
+    """)
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS login_rollups (
+        granularity TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        role TEXT NOT NULL,
+        total INTEGER NOT NULL,
+        PRIMARY KEY (granularity, bucket, role)
+    )
+    """)
+
+
+def _migrate_v5(c):
+    # Timing spans from utils.metrics
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS metric_spans (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        recorded_at TEXT NOT NULL,
+        page TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        duration_ms REAL NOT NULL
+    )
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_metric_spans_time
+        ON metric_spans (recorded_at)
+    """)
+
+
+def _migrate_v6(c):
+    # Latency histograms per rollup bucket, written alongside the spans so
+    # the dashboard never reads raw spans
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS metric_rollups (
+        bucket TEXT NOT NULL,
+        page TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        bin INTEGER NOT NULL,
+        total INTEGER NOT NULL,
+        PRIMARY KEY (bucket, page, stage, bin)
+    )
+    """)
+
+    c.connection.create_function("rollup_bucket", 1, rollup_bucket)
+    c.connection.create_function("latency_bin", 1, latency_bin)
+    c.execute("""
+        INSERT INTO metric_rollups (bucket, page, stage, bin, total)
+        SELECT rollup_bucket(recorded_at), page, stage, latency_bin(duration_ms),
+               COUNT(*)
+        FROM metric_spans
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def _migrate_v7(c):
+    # Nothing reads raw spans once v6 has folded them into the rollups
+    c.execute("DROP TABLE IF EXISTS metric_spans")
+
+
+# Position N (1-based) upgrades a database from user_version N-1 to N.
+MIGRATIONS = [
+    _migrate_v1,
+    _migrate_v2,
+    _migrate_v3,
+    _migrate_v4,
+    _migrate_v5,
+    _migrate_v6,
+    _migrate_v7,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+
+def migrate(path):
+    conn = _open_connection(path)
+    try:
+        c = conn.cursor()
+
+        # IMMEDIATE takes the write lock so concurrent processes migrate once
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            version = c.execute("PRAGMA user_version").fetchone()[0]
 
-            if "patient_username" not in columns:
-                # Add missing column safely
-                c.execute("""
-                    ALTER TABLE consultations
-                    ADD COLUMN patient_username TEXT DEFAULT 'unknown';
-                """)
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                MIGRATIONS[target - 1](c)
+                c.execute(f"PRAGMA user_version = {target}")
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    finally:
+        conn.close()
+
+
+def init_schema():
+    path = DB_NAME
+    if path in _schema_ready:
+        return
+
+    with _schema_lock:
+        if path not in _schema_ready:
+            migrate(path)
+            _schema_ready.add(path)
 
-        else:
-            # Create table if it doesn't exist
-            c.execute("""
-            CREATE TABLE consultations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                patient_username TEXT NOT NULL,
-                name TEXT NOT NULL,
-                age INTEGER NOT NULL,
-                doctor TEXT NOT NULL,
-                date TEXT NOT NULL,
-                time TEXT NOT NULL,
-                symptoms TEXT
-            )
-            """)
 
-        conn.commit()
+# Kept for callers that initialise tables explicitly
+init_db = init_schema
+init_login_table = init_schema
+init_user_table = init_schema
+init_translation_table = init_schema
 
+
+# ==================================================
+# CONSULTATIONS TABLE
+# ==================================================
+
+@timed("db.save_consultation")
 def save_consultation(patient_username, name, age, doctor, date, time, symptoms):
-    init_db()
     with get_connection() as conn:
-        c = conn.cursor()
-        c.execute("""
-        INSERT INTO consultations 
+        conn.execute("""
+        INSERT INTO consultations
         (patient_username, name, age, doctor, date, time, symptoms)
         VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (patient_username, name, age, doctor, date, time, symptoms))
-        conn.commit()
 
 
+@timed("db.get_consultations")
 def get_consultations():
-    init_db()
     with get_connection() as conn:
         c = conn.cursor()
         c.execute("SELECT * FROM consultations ORDER BY id DESC")
         return c.fetchall()
 
 
+@timed("db.get_consultations_by_user")
 def get_consultations_by_user(username, role):
-    init_db()
     with get_connection() as conn:
         c = conn.cursor()
 
@@ -101,22 +450,72 @@ def get_consultations_by_user(username, role):
         return c.fetchall()
 
 
-def get_statistics():
-    init_db()
+CONSULTATION_COLUMNS = (
+    "id, patient_username, name, age, doctor, date, time, symptoms"
+)
+
+
+@timed("db.get_consultations_page")
+def get_consultations_page(username, role, before_id=None, limit=20,
+                           doctor=None, date_from=None, date_to=None):
+    """Keyset-paginated consultation history, newest first.
+
+    Returns ``(rows, next_cursor)``; pass ``next_cursor`` back as
+    ``before_id`` for the following page. ``next_cursor`` is None on the
+    last page. Rows use the same column order as ``get_consultations``.
+    """
+    clauses = []
+    params = []
+
+    if role == "patient":
+        clauses.append("patient_username = ?")
+        params.append(username)
+    if doctor:
+        clauses.append("doctor = ?")
+        params.append(doctor)
+    if date_from:
+        clauses.append("date >= ?")
+        params.append(str(date_from))
+    if date_to:
+        clauses.append("date <= ?")
+        params.append(str(date_to))
+    if before_id is not None:
+        clauses.append("id < ?")
+        params.append(before_id)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
     with get_connection() as conn:
         c = conn.cursor()
+        # Fetch one extra row to know whether another page exists
+        c.execute(f"""
+            SELECT {CONSULTATION_COLUMNS} FROM consultations
+            {where}
+            ORDER BY id DESC
+            LIMIT ?
+        """, (*params, limit + 1))
+        rows = c.fetchall()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1][0]
+
+    return rows, None
 
-        c.execute("SELECT COUNT(*) FROM consultations")
-        total = c.fetchone()[0]
 
-        c.execute("SELECT AVG(age) FROM consultations")
-        avg_age = c.fetchone()[0]
+@timed("db.get_statistics")
+def get_statistics():
+    with get_connection() as conn:
+        c = conn.cursor()
+
+        c.execute("SELECT total, age_sum FROM consultation_totals WHERE id = 1")
+        total, age_sum = c.fetchone() or (0, 0)
+        avg_age = age_sum / total if total else None
 
         c.execute("""
-            SELECT doctor, COUNT(*)
-            FROM consultations
-            GROUP BY doctor
-            ORDER BY COUNT(*) DESC
+            SELECT doctor, total
+            FROM consultation_doctor_counts
+            ORDER BY total DESC
             LIMIT 1
         """)
         doctor_data = c.fetchone()
@@ -124,79 +523,324 @@ def get_statistics():
         return total, avg_age, doctor_data
 
 
-# ==================================================
-# LOGIN HISTORY TABLE
-# ==================================================
-
-def init_login_table():
+@timed("db.get_doctor_counts")
+def get_doctor_counts():
     with get_connection() as conn:
         c = conn.cursor()
         c.execute("""
-        CREATE TABLE IF NOT EXISTS login_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL,
-            role TEXT NOT NULL,
-            login_time TEXT NOT NULL
-        )
+            SELECT doctor, total FROM consultation_doctor_counts
+            ORDER BY total DESC
         """)
-        conn.commit()
+        return c.fetchall()
 
 
-def save_login_history(username, role):
-    init_login_table()
+@timed("db.get_daily_counts")
+def get_daily_counts(limit=90):
+    """Consultations per day for the most recent ``limit`` days, oldest first."""
     with get_connection() as conn:
         c = conn.cursor()
         c.execute("""
+            SELECT date, total FROM (
+                SELECT date, total FROM consultation_daily_counts
+                ORDER BY date DESC
+                LIMIT ?
+            ) ORDER BY date
+        """, (limit,))
+        return c.fetchall()
+
+
+@timed("db.rebuild_consultation_stats")
+def rebuild_consultation_stats():
+    with get_connection() as conn:
+        c = conn.cursor()
+        c.execute("BEGIN IMMEDIATE")
+        _rebuild_consultation_stats(c)
+
+
+# ==================================================
+# LOGIN HISTORY TABLE
+# ==================================================
+
+LOGIN_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@timed("db.save_login_history")
+def save_login_history(username, role):
+    save_login_events([
+        (username, role, datetime.now().strftime(LOGIN_TIME_FORMAT))
+    ])
+
+
+@timed("db.save_login_events")
+def save_login_events(events):
+    """Insert ``(username, role, login_time)`` rows in one transaction."""
+    with get_connection() as conn:
+        conn.executemany("""
         INSERT INTO login_history (username, role, login_time)
         VALUES (?, ?, ?)
-        """, (
-            username,
-            role,
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        ))
-        conn.commit()
+        """, events)
+
 
+@timed("db.get_login_history")
+def get_login_history(limit=500):
+    return get_login_history_page(limit=limit)[0]
 
-def get_login_history():
-    init_login_table()
+
+@timed("db.get_login_history_page")
+def get_login_history_page(before_id=None, limit=50):
+    """Keyset-paginated login events, newest first; see get_consultations_page."""
     with get_connection() as conn:
         c = conn.cursor()
-        c.execute("SELECT * FROM login_history ORDER BY id DESC")
+        if before_id is None:
+            c.execute("""
+                SELECT id, username, role, login_time FROM login_history
+                ORDER BY id DESC
+                LIMIT ?
+            """, (limit + 1,))
+        else:
+            c.execute("""
+                SELECT id, username, role, login_time FROM login_history
+                WHERE id < ?
+                ORDER BY id DESC
+                LIMIT ?
+            """, (before_id, limit + 1))
+        rows = c.fetchall()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1][0]
+
+    return rows, None
+
+
+@timed("db.get_login_counts_by_day")
+def get_login_counts_by_day(days=90):
+    """Logins per (day, role) over raw events and rollups, oldest first."""
+    since = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+    with get_connection() as conn:
+        c = conn.cursor()
+        c.execute("""
+            SELECT day, role, SUM(total) FROM (
+                SELECT substr(login_time, 1, 10) AS day, role, COUNT(*) AS total
+                FROM login_history
+                WHERE login_time >= ?
+                GROUP BY day, role
+                UNION ALL
+                SELECT substr(bucket, 1, 10) AS day, role, total
+                FROM login_rollups
+                WHERE bucket >= ?
+            )
+            GROUP BY day, role
+            ORDER BY day
+        """, (since, since))
         return c.fetchall()
 
 
+@timed("db.apply_login_retention")
+def apply_login_retention(raw_days, hourly_days, now=None):
+    """Roll old login events into hourly counts, and old hours into days.
+
+    Raw events older than ``raw_days`` become per-role hourly rollups;
+    hourly rollups older than ``hourly_days`` become daily rollups.
+    Returns (events rolled up, hourly buckets rolled up).
+    """
+    now = now or datetime.now()
+    raw_cutoff = (now - timedelta(days=raw_days)).strftime(LOGIN_TIME_FORMAT)
+    hourly_cutoff = (now - timedelta(days=hourly_days)).strftime("%Y-%m-%d %H:00")
+
+    with get_connection() as conn:
+        c = conn.cursor()
+        c.execute("BEGIN IMMEDIATE")
+
+        c.execute("""
+            INSERT INTO login_rollups (granularity, bucket, role, total)
+            SELECT 'hour', substr(login_time, 1, 13) || ':00', role, COUNT(*)
+            FROM login_history
+            WHERE login_time < ?
+            GROUP BY 2, 3
+            ON CONFLICT (granularity, bucket, role)
+            DO UPDATE SET total = total + excluded.total
+        """, (raw_cutoff,))
+        c.execute("DELETE FROM login_history WHERE login_time < ?", (raw_cutoff,))
+        events = c.rowcount
+
+        c.execute("""
+            INSERT INTO login_rollups (granularity, bucket, role, total)
+            SELECT 'day', substr(bucket, 1, 10), role, SUM(total)
+            FROM login_rollups
+            WHERE granularity = 'hour' AND bucket < ?
+            GROUP BY 2, 3
+            ON CONFLICT (granularity, bucket, role)
+            DO UPDATE SET total = total + excluded.total
+        """, (hourly_cutoff,))
+        c.execute("""
+            DELETE FROM login_rollups
+            WHERE granularity = 'hour' AND bucket < ?
+        """, (hourly_cutoff,))
+        hours = c.rowcount
+
+    return events, hours
+
+
 # ==================================================
 # USERS TABLE
 # ==================================================
 
-def init_user_table():
+# Login checks look the same user up repeatedly; the TTL bounds staleness
+# when another server process changes the row.
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+_MISSING = object()
+
+
+def _invalidate_user(username):
+    with _user_cache_lock:
+        _user_cache.pop(username, None)
+
+
+@timed("db.create_user")
+def create_user(username, hashed_password, role):
+    try:
+        with get_connection() as conn:
+            conn.execute("""
+            INSERT INTO users (username, password, role)
+            VALUES (?, ?, ?)
+            """, (username, hashed_password, role))
+    finally:
+        _invalidate_user(username)
+
+
+@timed("db.update_user_password")
+def update_user_password(username, hashed_password):
+    try:
+        with get_connection() as conn:
+            conn.execute("""
+            UPDATE users SET password = ? WHERE username = ?
+            """, (hashed_password, username))
+    finally:
+        _invalidate_user(username)
+
+
+@timed("db.get_user")
+def get_user(username):
+    now = time.monotonic()
+
+    with _user_cache_lock:
+        cached = _user_cache.get(username)
+        if cached is not None and cached[1] > now:
+            _user_cache.move_to_end(username)
+            user = cached[0]
+            return None if user is _MISSING else user
+
     with get_connection() as conn:
         c = conn.cursor()
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            role TEXT NOT NULL
+        c.execute("SELECT * FROM users WHERE username = ?", (username,))
+        user = c.fetchone()
+
+    with _user_cache_lock:
+        _user_cache[username] = (
+            _MISSING if user is None else user,
+            now + USER_CACHE_TTL_SECONDS
         )
-        """)
-        conn.commit()
+        _user_cache.move_to_end(username)
+        while len(_user_cache) > USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
 
+    return user
+
+
+# ==================================================
+# TRANSLATION CACHE TABLE
+# ==================================================
+
+@timed("db.get_cached_translations")
+def get_cached_translations(texts, language):
+    found = {}
+    texts = list(texts)
 
-def create_user(username, hashed_password, role):
-    init_user_table()
     with get_connection() as conn:
         c = conn.cursor()
-        c.execute("""
-        INSERT INTO users (username, password, role)
+
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(texts), 500):
+            batch = texts[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            c.execute(f"""
+                SELECT source_text, translated_text FROM translations
+                WHERE language = ? AND source_text IN ({placeholders})
+            """, (language, *batch))
+            found.update(c.fetchall())
+
+    return found
+
+
+@timed("db.save_translations")
+def save_translations(translations, language):
+    with get_connection() as conn:
+        conn.executemany("""
+        INSERT OR REPLACE INTO translations (source_text, language, translated_text)
         VALUES (?, ?, ?)
-        """, (username, hashed_password, role))
-        conn.commit()
+        """, [
+            (source, language, translated)
+            for source, translated in translations.items()
+        ])
 
 
-def get_user(username):
-    init_user_table()
+# ==================================================
+# METRIC SPANS TABLE
+# ==================================================
+# Not timed themselves, so flushing spans does not produce new ones.
+
+def save_metric_rollups(rollups):
+    """Add ``(bucket, page, stage, bin, total)`` histogram counts in one transaction."""
+    with get_connection() as conn:
+        conn.executemany("""
+        INSERT INTO metric_rollups (bucket, page, stage, bin, total)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (bucket, page, stage, bin)
+        DO UPDATE SET total = total + excluded.total
+        """, rollups)
+
+
+def get_metric_histograms(since):
+    """``(page, stage, bin, total)`` latency histograms over buckets at or after ``since``."""
     with get_connection() as conn:
         c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE username = ?", (username,))
-        return c.fetchone()
\ No newline at end of file
+        c.execute("""
+            SELECT page, stage, bin, SUM(total) FROM metric_rollups
+            WHERE bucket >= ?
+            GROUP BY page, stage, bin
+            ORDER BY page, stage, bin
+        """, (rollup_bucket(since),))
+        return c.fetchall()
+
+
+def get_metric_trend(since, page, minutes):
+    """``(bucket, stage, bin, total)`` histograms of ``page`` per ``minutes``-wide bucket."""
+    with get_connection() as conn:
+        c = conn.cursor()
+        c.execute("""
+            SELECT substr(bucket, 1, 11) || printf('%02d:%02d',
+                       minute_of_day / ? * ? / 60, minute_of_day / ? * ? % 60),
+                   stage, bin, SUM(total)
+            FROM (
+                SELECT bucket, stage, bin, total,
+                       CAST(substr(bucket, 12, 2) AS INTEGER) * 60
+                       + CAST(substr(bucket, 15, 2) AS INTEGER) AS minute_of_day
+                FROM metric_rollups
+                WHERE bucket >= ? AND page = ?
+            )
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+        """, (minutes, minutes, minutes, minutes, rollup_bucket(since), page))
+        return c.fetchall()
+
+
+def prune_metric_rollups(before):
+    with get_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            "DELETE FROM metric_rollups WHERE bucket < ?", (rollup_bucket(before),)
+        )
+        return c.rowcount
@@ -0,0 +1,114 @@
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+
+from config import (
+    LOGIN_FLUSH_BATCH_SIZE,
+    LOGIN_FLUSH_INTERVAL_MS,
+    LOGIN_HOURLY_RETENTION_DAYS,
+    LOGIN_RAW_RETENTION_DAYS,
+    LOGIN_RETENTION_INTERVAL_SECONDS
+)
+from database import db
+
+
+class LoginHistoryWriter:
+    """Background writer that group-commits login events.
+
+    ``record`` only enqueues, so the login request never waits on SQLite.
+    The writer thread drains up to ``batch_size`` events per transaction
+    and periodically applies the retention policy.
+    """
+
+    def __init__(self, flush_interval=LOGIN_FLUSH_INTERVAL_MS / 1000,
+                 batch_size=LOGIN_FLUSH_BATCH_SIZE,
+                 retention_interval=LOGIN_RETENTION_INTERVAL_SECONDS):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention_interval = retention_interval
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_retention = 0.0
+
+    def record(self, username, role):
+        self._queue.put(
+            (username, role, datetime.now().strftime(db.LOGIN_TIME_FORMAT))
+        )
+        self._ensure_started()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="login-history-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _drain(self, first=None):
+        events = [] if first is None else [first]
+        while len(events) < self.batch_size:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                first = None
+
+            if first is not None:
+                # Give concurrent logins a moment to join this commit
+                time.sleep(self.flush_interval)
+                self._write(self._drain(first))
+
+            self._maybe_apply_retention()
+
+    def _write(self, events):
+        if not events:
+            return
+        try:
+            db.save_login_events(events)
+        except Exception:
+            # Keep the events for the next attempt rather than losing them
+            for event in events:
+                self._queue.put(event)
+            time.sleep(self.flush_interval)
+
+    def _maybe_apply_retention(self):
+        now = time.monotonic()
+        if now - self._last_retention < self.retention_interval:
+            return
+        self._last_retention = now
+        try:
+            db.apply_login_retention(
+                LOGIN_RAW_RETENTION_DAYS, LOGIN_HOURLY_RETENTION_DAYS
+            )
+        except Exception:
+            pass
+
+    def flush(self):
+        """Write everything queued so far on the calling thread."""
+        while True:
+            events = self._drain()
+            if not events:
+                return
+            db.save_login_events(events)
+
+
+writer = LoginHistoryWriter()
+
+
+def record_login(username, role):
+    writer.record(username, role)
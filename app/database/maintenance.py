@@ -0,0 +1,57 @@
+"""Database maintenance commands.
+
+Run from the app/ directory:
+
+    python -m database.maintenance rebuild-stats
+    python -m database.maintenance prune-logins
+    python -m database.maintenance prune-metrics
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from config import (
+    LOGIN_HOURLY_RETENTION_DAYS,
+    LOGIN_RAW_RETENTION_DAYS,
+    METRICS_RETENTION_DAYS
+)
+from database import db
+
+
+def rebuild_stats(args):
+    db.rebuild_consultation_stats()
+    total = db.get_statistics()[0]
+    print(f"Rebuilt consultation rollups: {total} consultations, "
+          f"{len(db.get_doctor_counts())} doctors, "
+          f"{len(db.get_daily_counts(limit=-1))} days")
+
+
+def prune_logins(args):
+    events, hours = db.apply_login_retention(
+        LOGIN_RAW_RETENTION_DAYS, LOGIN_HOURLY_RETENTION_DAYS
+    )
+    print(f"Rolled up {events} login events and {hours} hourly buckets")
+
+
+def prune_metrics(args):
+    cutoff = datetime.now() - timedelta(days=METRICS_RETENTION_DAYS)
+    removed = db.prune_metric_rollups(cutoff.strftime(db.LOGIN_TIME_FORMAT))
+    print(f"Removed {removed} latency rollup rows older than "
+          f"{METRICS_RETENTION_DAYS} days")
+
+
+COMMANDS = {
+    "rebuild-stats": rebuild_stats,
+    "prune-logins": prune_logins,
+    "prune-metrics": prune_metrics,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database maintenance")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
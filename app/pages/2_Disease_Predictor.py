@@ -1,11 +1,12 @@
 import streamlit as st
-import joblib
-import pandas as pd
-import shap
-import matplotlib.pyplot as plt
 
 from utils.auth import check_auth
+from utils.explanation_chart import render_explanation
+from utils.metrics import set_page, span
 from utils.translator import translate_text
+from services.inference_worker import InferenceError, disease_symptoms, run_job
+
+set_page("disease_predictor")
 
 
 # =====================================================
@@ -21,17 +22,10 @@ st.title("🩺 Disease Prediction")
 
 
 # =====================================================
-# LOAD MODEL (Cached)
+# SYMPTOM LIST (the model itself is only loaded by whichever process
+# runs the jobs: the inference worker, or this one as a fallback)
 # =====================================================
-@st.cache_resource
-def load_model():
-    model = joblib.load("models/disease.pkl")
-    encoder = joblib.load("models/disease_label_encoder.pkl")
-    symptoms = joblib.load("models/symptom_columns.pkl")
-    return model, encoder, symptoms
-
-
-model, encoder, symptoms = load_model()
+symptoms = disease_symptoms()
 
 
 # =====================================================
@@ -59,26 +53,23 @@ if st.button("Predict Disease"):
         st.warning("Please select at least one symptom.")
         st.stop()
 
-    input_vector = [0] * len(symptoms)
-
-    for symptom in selected_symptoms:
-        index = symptoms.index(symptom)
-        input_vector[index] = 1
-
-    input_df = pd.DataFrame([input_vector], columns=symptoms)
-
-    probabilities = model.predict_proba(input_df)[0]
-    top_indices = probabilities.argsort()[-3:][::-1]
+    try:
+        with span("predict"):
+            top_indices, top_labels, top_probs = run_job(
+                "predict_disease", {"symptoms": selected_symptoms, "k": 3}
+            )
+    except (ValueError, InferenceError) as e:
+        st.error(str(e))
+        st.stop()
 
     st.subheader("🔍 Top 3 Possible Diseases")
 
-    for idx in top_indices:
-        disease_name = encoder.inverse_transform([idx])[0]
-        confidence = probabilities[idx] * 100
+    for disease_name, probability in zip(top_labels, top_probs):
+        confidence = probability * 100
         st.write(f"*{disease_name}* — {confidence:.2f}%")
 
     # Most likely
-    predicted_disease = encoder.inverse_transform([top_indices[0]])[0]
+    predicted_disease = top_labels[0]
     result_text = f"Most Likely Disease: {predicted_disease}"
 
     st.success(translate_text(result_text, language))
@@ -89,16 +80,54 @@ if st.button("Predict Disease"):
     st.subheader("🧠 Why This Prediction?")
 
     try:
-        explainer = shap.TreeExplainer(model)
-        shap_values = explainer(input_df)
-
-        fig = plt.figure()
-        shap.plots.waterfall(
-            shap_values[0, :, top_indices[0]],
-            show=False
+        with span("shap"):
+            explanation = run_job("explain", {
+                "model": "disease",
+                "symptoms": selected_symptoms,
+                "output": top_indices[0]
+            })
+
+        render_explanation(
+            explanation["values"],
+            explanation["base_value"],
+            explanation["data"],
+            explanation["features"],
+            title=predicted_disease
         )
 
-        st.pyplot(fig)
-
     except Exception:
-        st.info("SHAP explanation not available for this model.")
\ No newline at end of file
+        st.info("SHAP explanation not available for this model.")
+
+
+# =====================================================
+# BATCH TRIAGE (CSV Upload)
+# =====================================================
+st.divider()
+st.subheader("📋 Batch Triage")
+st.caption(
+    "Upload a CSV with one 0/1 column per symptom, "
+    "or a `symptoms` column of comma-separated symptom names."
+)
+
+batch_file = st.file_uploader("Upload Intake Batch (CSV)", type=["csv"])
+
+if batch_file is not None:
+
+    try:
+        with span("batch_predict"):
+            results_df = run_job(
+                "triage_disease", {"csv": batch_file.getvalue(), "k": 3}
+            )
+    except (ValueError, InferenceError) as e:
+        st.error(str(e))
+        st.stop()
+
+    st.write(f"Scored {len(results_df)} patients.")
+    st.dataframe(results_df, use_container_width=True, height=300)
+
+    st.download_button(
+        "📥 Download Triage Results",
+        data=results_df.to_csv(index=False).encode(),
+        file_name="triage_results.csv",
+        mime="text/csv"
+    )
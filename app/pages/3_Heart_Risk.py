@@ -1,11 +1,12 @@
 import streamlit as st
-import joblib
-import pandas as pd
-import shap
-import matplotlib.pyplot as plt
 
 from utils.auth import check_auth
+from utils.explanation_chart import render_explanation
+from utils.metrics import set_page, span
 from utils.translator import translate_text
+from services.inference_worker import InferenceError, run_job
+
+set_page("heart_risk")
 
 
 # =====================================================
@@ -23,24 +24,6 @@ st.markdown("AI-powered cardiovascular risk assessment system.")
 st.divider()
 
 
-# =====================================================
-# LOAD MODEL (Cached)
-# =====================================================
-@st.cache_resource
-def load_heart_model():
-    model = joblib.load("models/heart.pkl")
-    encoders = joblib.load("models/heart_label_encoders.pkl")
-    columns = joblib.load("models/heart_columns.pkl")
-    return model, encoders, columns
-
-
-try:
-    model, encoders, columns = load_heart_model()
-except Exception:
-    st.error("Model files not found. Please check your models folder.")
-    st.stop()
-
-
 # =====================================================
 # INPUT SECTION (Cleaner Layout)
 # =====================================================
@@ -84,19 +67,11 @@ if st.button("🔍 Predict Heart Risk", use_container_width=True):
         "ST_Slope": st_slope
     }
 
-    input_df = pd.DataFrame([input_data])
-
     try:
-        # Encode categorical features
-        for col in encoders:
-            input_df[col] = encoders[col].transform(input_df[col])
-
-        # Match training column order
-        input_df = input_df[columns]
-
         # Predict
-        prediction = model.predict(input_df)[0]
-        probability = model.predict_proba(input_df)[0][1] * 100
+        with span("predict"):
+            prediction, probability = run_job("predict_heart", {"row": input_data})
+        probability *= 100
 
         st.subheader("📊 Prediction Result")
 
@@ -113,20 +88,51 @@ if st.button("🔍 Predict Heart Risk", use_container_width=True):
         st.subheader("🧠 AI Explanation")
 
         try:
-            explainer = shap.TreeExplainer(model)
-            shap_values = explainer(input_df)
-
-            fig = plt.figure(figsize=(8, 5))
-
-            shap.plots.waterfall(
-                shap_values[0, :, 1],
-                show=False
+            with span("shap"):
+                explanation = run_job(
+                    "explain", {"model": "heart", "row": input_data}
+                )
+
+            render_explanation(
+                explanation["values"],
+                explanation["base_value"],
+                explanation["data"],
+                explanation["features"],
+                title="Heart disease risk"
             )
 
-            st.pyplot(fig)
-
         except Exception:
             st.info("SHAP explanation not available for this model type.")
 
     except Exception as e:
-        st.error("Prediction failed. Please check inputs or model compatibility.")
\ No newline at end of file
+        st.error("Prediction failed. Please check inputs or model compatibility.")
+
+
+# =====================================================
+# COHORT SCREENING (Roster Upload)
+# =====================================================
+st.divider()
+st.subheader("📋 Cohort Screening")
+st.caption("Upload a clinic roster with the same columns as heart.csv.")
+
+roster_file = st.file_uploader("Upload Roster (CSV)", type=["csv"])
+
+if roster_file is not None:
+
+    try:
+        with span("cohort_screening"):
+            total, high_risk, scored_csv = run_job(
+                "screen_heart", {"csv": roster_file.getvalue()}
+            )
+    except (KeyError, ValueError, InferenceError) as e:
+        st.error(f"Could not score roster: {e}")
+        st.stop()
+
+    st.write(f"Scored {total} patients — {high_risk} flagged as high risk.")
+
+    st.download_button(
+        "📥 Download Risk Scores",
+        data=scored_csv.encode(),
+        file_name="heart_risk_scores.csv",
+        mime="text/csv"
+    )
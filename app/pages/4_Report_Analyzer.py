@@ -1,11 +1,15 @@
 import streamlit as st
-import fitz
-import re
-import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
 from utils.auth import check_auth
-from utils.translator import translate_text
+from utils.metrics import set_page, span
+from utils.translator import TRANSLATOR_MODEL, translate_batch
+from config import SUMMARY_CHUNK_TOKENS, SUMMARY_TOKEN_BUDGET
+from services.nlp.lab_values import LAB_CATALOG_VERSION, extract_medical_values
+from services.nlp.pdf_extractor import extract_text
+from services.nlp.report_cache import content_digest, report_cache
+from services.nlp.summarizer import SUMMARIZER_MODEL, summarize_report
+
+set_page("report_analyzer")
 
 
 # =====================================================
@@ -23,68 +27,20 @@ st.title("📄 Medical Report Analyzer")
 # =====================================================
 # PDF TEXT EXTRACTION
 # =====================================================
-def extract_text_from_pdf(uploaded_file):
-    text = ""
-    try:
-        file_bytes = uploaded_file.read()
-        pdf = fitz.open(stream=file_bytes, filetype="pdf")
+def extract_text_from_pdf(file_buffer):
+    progress_bar = st.progress(0.0, text="Extracting text from report...")
 
-        for page in pdf:
-            text += page.get_text()
+    def show_progress(done, total):
+        progress_bar.progress(done / total, text=f"Extracted page {done} of {total}")
 
-        return text.strip()
+    try:
+        return extract_text(file_buffer, progress=show_progress)
 
     except Exception:
         return ""
 
-
-# =====================================================
-# LOAD SUMMARIZATION MODEL (Cached)
-# =====================================================
-@st.cache_resource
-def load_summarizer():
-    model_name = "google/flan-t5-base"
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-    return tokenizer, model
-
-
-# =====================================================
-# CLINICAL VALUE EXTRACTION
-# =====================================================
-def extract_medical_values(text):
-
-    findings = {}
-
-    # Blood Pressure
-    bp_match = re.search(r'(\d{2,3})/(\d{2,3})', text)
-    if bp_match:
-        systolic = int(bp_match.group(1))
-        diastolic = int(bp_match.group(2))
-        findings["Blood Pressure"] = f"{systolic}/{diastolic}"
-        findings["BP_Status"] = (
-            "High" if systolic > 140 or diastolic > 90 else "Normal"
-        )
-
-    # Cholesterol
-    chol_match = re.search(r'cholesterol.*?(\d+)', text, re.IGNORECASE)
-    if chol_match:
-        chol = int(chol_match.group(1))
-        findings["Cholesterol"] = f"{chol} mg/dL"
-        findings["Cholesterol_Status"] = (
-            "High" if chol > 200 else "Normal"
-        )
-
-    # Hemoglobin
-    hb_match = re.search(r'hemoglobin.*?(\d+)', text, re.IGNORECASE)
-    if hb_match:
-        hb = int(hb_match.group(1))
-        findings["Hemoglobin"] = f"{hb} g/dL"
-        findings["Hemoglobin_Status"] = (
-            "Low" if hb < 12 else "Normal"
-        )
-
-    return findings
+    finally:
+        progress_bar.empty()
 
 
 # =====================================================
@@ -97,13 +53,27 @@ uploaded_file = st.file_uploader(
 
 if uploaded_file:
 
-    st.info("Extracting text from report...")
+    # Results are cached by the report's content hash, so reruns (e.g. a
+    # language switch) only compute what is missing for this combination.
+    # getbuffer() is a view of the upload, not a copy of it.
+    file_buffer = uploaded_file.getbuffer()
+    digest = content_digest(file_buffer)
+    record = report_cache.load(digest)
+    changed = False
 
-    extracted_text = extract_text_from_pdf(uploaded_file)
+    if not record["text"]:
+        with span("pdf_extraction"):
+            extracted_text = extract_text_from_pdf(file_buffer)
 
-    if not extracted_text:
-        st.error("Could not extract text from PDF.")
-        st.stop()
+        # Nothing is cached for a failed extraction, so a retry runs again
+        if not extracted_text:
+            st.error("Could not extract text from PDF.")
+            st.stop()
+
+        record["text"] = extracted_text
+        changed = True
+
+    extracted_text = record["text"]
 
     # Display preview
     st.subheader("📑 Extracted Text (Preview)")
@@ -116,63 +86,83 @@ if uploaded_file:
     # =====================================================
     # SUMMARIZATION
     # =====================================================
-    st.info("Loading AI model...")
-    tokenizer, model = load_summarizer()
+    full_report = st.checkbox(
+        "Summarize the full report (long-document mode)",
+        value=True
+    )
 
-    st.info("Generating AI Summary...")
+    token_budget = SUMMARY_TOKEN_BUDGET if full_report else SUMMARY_CHUNK_TOKENS
+    summary_key = f"{SUMMARIZER_MODEL}:{token_budget}"
+    summary_text = record["summaries"].get(summary_key)
 
-    # Limit input length for model
-    cleaned_text = extracted_text[:2000]
+    if summary_text is None:
+        st.info("Generating AI Summary...")
 
-    input_prompt = f"Summarize this medical report clearly:\n{cleaned_text}"
+        try:
+            with span("summarization"):
+                summary_text = summarize_report(
+                    extracted_text,
+                    token_budget=token_budget
+                )
 
-    try:
-        inputs = tokenizer(
-            input_prompt,
-            return_tensors="pt",
-            truncation=True
-        )
+        except Exception:
+            st.error("Failed to generate summary.")
+            st.stop()
 
-        with torch.no_grad():
-            outputs = model.generate(
-                **inputs,
-                max_length=150
-            )
+        record["summaries"][summary_key] = summary_text
+        changed = True
 
-        summary_text = tokenizer.decode(
-            outputs[0],
-            skip_special_tokens=True
-        )
+    # =====================================================
+    # CLINICAL INSIGHTS
+    # =====================================================
+    findings = record["findings"].get(LAB_CATALOG_VERSION)
 
-        translated_summary = translate_text(summary_text, language)
+    if findings is None:
+        with span("lab_extraction"):
+            findings = extract_medical_values(extracted_text)
+        record["findings"] = {LAB_CATALOG_VERSION: findings}
+        changed = True
 
-        st.subheader("🧠 AI-Generated Summary")
-        st.success(translated_summary)
+    finding_lines = []
+    for key, value in findings.items():
+        if "Status" not in key:
 
-    except Exception:
-        st.error("Failed to generate summary.")
-        st.stop()
+            status_key = f"{key}_Status"
+            status = findings.get(status_key)
 
-    # =====================================================
-    # CLINICAL INSIGHTS
-    # =====================================================
-    st.subheader("📊 Extracted Clinical Insights")
+            # Readings in a unit we cannot convert carry no status
+            line = f"{key}: {value} — {status}" if status else f"{key}: {value}"
+            finding_lines.append((line, status))
 
-    findings = extract_medical_values(extracted_text)
+    # Translate everything shown on this render in one batch
+    texts = [summary_text] + [line for line, _ in finding_lines]
+    translation_key = (
+        f"{TRANSLATOR_MODEL}:{language}:{summary_key}:{LAB_CATALOG_VERSION}"
+    )
+    translated = record["translations"].get(translation_key)
+
+    if translated is None:
+        with span("translation"):
+            translated = translate_batch(texts, language)
+        if language != "English":
+            record["translations"][translation_key] = translated
+            changed = True
 
-    if findings:
-        for key, value in findings.items():
-            if "Status" not in key:
+    if changed:
+        report_cache.save(digest, record)
 
-                status_key = f"{key}_Status"
-                status = findings.get(status_key, "")
+    st.subheader("🧠 AI-Generated Summary")
+    st.success(translated[0])
 
-                display_text = f"{key}: {value} — {status}"
-                translated_display = translate_text(display_text, language)
+    st.subheader("📊 Extracted Clinical Insights")
 
-                if status in ["High", "Low"]:
-                    st.error(translated_display)
-                else:
-                    st.success(translated_display)
+    if finding_lines:
+        for (_, status), translated_display in zip(finding_lines, translated[1:]):
+            if status in ["High", "Low"]:
+                st.error(translated_display)
+            elif status is None:
+                st.info(translated_display)
+            else:
+                st.success(translated_display)
     else:
-        st.info("No key medical values detected.")
\ No newline at end of file
+        st.info("No key medical values detected.")
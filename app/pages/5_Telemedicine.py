@@ -1,11 +1,19 @@
 import streamlit as st
 import io
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import letter
 
 from utils.auth import check_auth, get_role
-from database.db import save_consultation, get_consultations_by_user
+from utils.metrics import set_page
+from database.db import save_consultation, get_consultations_page
+
+set_page("telemedicine")
+
+HISTORY_PAGE_SIZE = 20
+
+DOCTORS = [
+    "Dr. Sharma (Cardiologist)",
+    "Dr. Mehta (General Physician)",
+    "Dr. Rao (Neurologist)"
+]
 
 
 # =====================================================
@@ -32,14 +40,7 @@ with col1:
     name = st.text_input("Patient Name")
     age = st.number_input("Age", 1, 120, 25)
 
-    doctor = st.selectbox(
-        "Select Doctor",
-        [
-            "Dr. Sharma (Cardiologist)",
-            "Dr. Mehta (General Physician)",
-            "Dr. Rao (Neurologist)"
-        ]
-    )
+    doctor = st.selectbox("Select Doctor", DOCTORS)
 
 with col2:
     date = st.date_input("Select Date")
@@ -70,6 +71,11 @@ if st.button("Confirm Appointment"):
         st.success("✅ Appointment Confirmed Successfully!")
 
         # ================= PDF =================
+        # reportlab is only needed once an appointment is booked
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.lib.pagesizes import letter
+
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         elements = []
@@ -108,13 +114,37 @@ st.divider()
 
 if role == "doctor":
     st.subheader("👨‍⚕ All Consultations")
-
-    history = get_consultations_by_user(username, "doctor")
-
 else:
     st.subheader("📂 Your Consultation History")
 
-    history = get_consultations_by_user(username, "patient")
+# ---------------- FILTERS ----------------
+filter_col1, filter_col2, filter_col3 = st.columns(3)
+
+with filter_col1:
+    doctor_filter = st.selectbox("Filter by Doctor", ["All"] + DOCTORS)
+with filter_col2:
+    date_from = st.date_input("From Date", value=None)
+with filter_col3:
+    date_to = st.date_input("To Date", value=None)
+
+filters = (doctor_filter, date_from, date_to)
+
+# Cursor stack: one before_id per page visited; reset when filters change
+if st.session_state.get("history_filters") != filters:
+    st.session_state["history_filters"] = filters
+    st.session_state["history_cursors"] = [None]
+
+cursors = st.session_state["history_cursors"]
+
+history, next_cursor = get_consultations_page(
+    username,
+    role,
+    before_id=cursors[-1],
+    limit=HISTORY_PAGE_SIZE,
+    doctor=None if doctor_filter == "All" else doctor_filter,
+    date_from=date_from,
+    date_to=date_to
+)
 
 
 if history:
@@ -127,4 +157,20 @@ if history:
             st.write(f"Time: {record[6]}")
             st.write(f"Symptoms: {record[7]}")
 else:
-    st.info("No consultation records available.")
\ No newline at end of file
+    st.info("No consultation records available.")
+
+# ---------------- PAGINATION ----------------
+nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+
+with nav_col1:
+    if st.button("⬅ Newer", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+
+with nav_col2:
+    st.caption(f"Page {len(cursors)}")
+
+with nav_col3:
+    if st.button("Older ➡", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
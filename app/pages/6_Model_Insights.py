@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config import MODELS_DIR
+from utils.auth import check_auth, get_role
+from utils.explanation_chart import chart_spec
+from utils.metrics import set_page, span
+from services.prediction.global_explanations import load_explanation_index
+from services.prediction.model_bundle import model_artifact_path
+
+set_page("model_insights")
+
+
+# =====================================================
+# AUTH PROTECTION
+# =====================================================
+if not check_auth():
+    st.warning("Please login to access this page.")
+    st.stop()
+
+if get_role() != "doctor":
+    st.error("Doctor access only.")
+    st.stop()
+
+st.title("🔎 Model Insights")
+st.caption(
+    "What drives each prediction across the whole training set, read from "
+    "a precomputed SHAP index (no per-patient computation)."
+)
+
+
+def importance_frame(table, label_column):
+    # Bar length is mean |SHAP|; colour shows the average direction
+    return pd.DataFrame({
+        "feature": table[label_column],
+        "contribution": table["mean_abs_shap"],
+        "effect": np.where(table["mean_shap"] >= 0, "raises", "lowers"),
+    })
+
+
+def show_ranking(table, label_column, title):
+    st.vega_lite_chart(
+        importance_frame(table, label_column),
+        chart_spec(title, x_title="mean |SHAP value|"),
+        use_container_width=True
+    )
+    st.dataframe(table.round(4), use_container_width=True, hide_index=True)
+
+
+def load_index(name):
+    with span("index_load"):
+        index = load_explanation_index(name)
+
+    if index is None:
+        st.info(
+            "No explanation index found. Build it with "
+            "`cd app && python -m services.prediction.global_explanations`."
+        )
+        return None
+
+    if index.is_stale(model_artifact_path(MODELS_DIR, name)):
+        st.warning(
+            "The model has changed since this index was built; "
+            "rebuild it to refresh these rankings."
+        )
+    return index
+
+
+top_n = st.slider("Features to show", 5, 30, 10)
+
+disease_tab, heart_tab = st.tabs(["🩺 Disease", "🫀 Heart"])
+
+
+# =====================================================
+# DISEASE MODEL
+# =====================================================
+with disease_tab:
+
+    disease_index = load_index("disease")
+
+    if disease_index is not None:
+        st.caption(
+            f"Built from {disease_index.rows} training rows "
+            f"({len(disease_index.classes)} diseases)."
+        )
+
+        st.subheader("Which symptoms drive a disease?")
+        disease = st.selectbox("Disease", sorted(disease_index.classes))
+        show_ranking(
+            disease_index.top_features(disease, top_n), "feature", disease
+        )
+
+        st.subheader("Which diseases does a symptom point to?")
+        symptom = st.selectbox("Symptom", sorted(disease_index.features))
+        show_ranking(
+            disease_index.top_classes(symptom, top_n), "class", symptom
+        )
+
+
+# =====================================================
+# HEART MODEL
+# =====================================================
+with heart_tab:
+
+    heart_index = load_index("heart")
+
+    if heart_index is not None:
+        st.caption(f"Built from {heart_index.rows} rows of heart.csv.")
+
+        outcome = st.radio("Outcome", list(heart_index.classes), horizontal=True)
+        show_ranking(
+            heart_index.top_features(outcome, top_n), "feature", outcome
+        )
@@ -1,16 +1,23 @@
-import matplotlib
-matplotlib.use("Agg")
+from datetime import datetime, timedelta
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from database.db import (
+    LOGIN_TIME_FORMAT,
     get_statistics,
-    get_consultations,
-    get_login_history
+    get_doctor_counts,
+    get_daily_counts,
+    get_login_history_page,
+    get_login_counts_by_day,
+    get_metric_histograms,
+    get_metric_trend
 )
 from utils.auth import check_auth, get_role
+from utils.metrics import flush as flush_metrics, histogram_quantile, set_page
+from services.inference_worker import InferenceError, run_job, worker_enabled
+
+set_page("admin_dashboard")
 
 
 # =====================================================
@@ -52,25 +59,19 @@ st.divider()
 # =====================================================
 st.subheader("📈 Doctor Consultation Distribution")
 
-consultations = get_consultations()
-
-if consultations:
-
-    df = pd.DataFrame(
-        consultations,
-        columns=[
-            "id",
-            "patient_username",
-            "name",
-            "age",
-            "doctor",
-            "date",
-            "time",
-            "symptoms"
-        ]
-    )
+doctor_rows = get_doctor_counts()
+
+if doctor_rows:
 
-    doctor_counts = df["doctor"].value_counts()
+    # Imported here so the page opens without loading matplotlib
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    doctor_counts = pd.DataFrame(
+        doctor_rows,
+        columns=["doctor", "count"]
+    ).set_index("doctor")["count"]
 
     fig, ax = plt.subplots(figsize=(6, 4))
     doctor_counts.plot(kind="bar", ax=ax)
@@ -81,6 +82,16 @@ if consultations:
     plt.xticks(rotation=30)
 
     st.pyplot(fig)
+    plt.close(fig)
+
+    st.subheader("📅 Consultations per Day (last 90 days)")
+
+    daily_df = pd.DataFrame(
+        get_daily_counts(limit=90),
+        columns=["date", "count"]
+    ).set_index("date")
+
+    st.line_chart(daily_df)
 
 else:
     st.info("No consultation data available.")
@@ -93,7 +104,27 @@ st.divider()
 # =====================================================
 st.subheader("🔐 System Login History")
 
-login_data = get_login_history()
+LOGIN_PAGE_SIZE = 50
+
+login_counts = get_login_counts_by_day(days=90)
+
+if login_counts:
+    counts_df = pd.DataFrame(
+        login_counts,
+        columns=["Day", "Role", "Logins"]
+    ).pivot(index="Day", columns="Role", values="Logins").fillna(0)
+
+    st.bar_chart(counts_df)
+
+if "login_cursors" not in st.session_state:
+    st.session_state["login_cursors"] = [None]
+
+login_cursors = st.session_state["login_cursors"]
+
+login_data, next_login_cursor = get_login_history_page(
+    before_id=login_cursors[-1],
+    limit=LOGIN_PAGE_SIZE
+)
 
 if login_data:
 
@@ -104,5 +135,167 @@ if login_data:
 
     st.dataframe(login_df, use_container_width=True, height=300)
 
+    nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+
+    with nav_col1:
+        if st.button("⬅ Newer", disabled=len(login_cursors) == 1):
+            login_cursors.pop()
+            st.rerun()
+
+    with nav_col2:
+        st.caption(f"Page {len(login_cursors)}")
+
+    with nav_col3:
+        if st.button("Older ➡", disabled=next_login_cursor is None):
+            login_cursors.append(next_login_cursor)
+            st.rerun()
+
+else:
+    st.info("No login history available.")
+
+st.divider()
+
+
+# =====================================================
+# INFERENCE STATE
+# =====================================================
+# The caches and models live wherever inference runs: the inference
+# worker when one is up, otherwise this server process
+try:
+    inference_stats = run_job("stats", {})
+except InferenceError as e:
+    st.error(str(e))
+    st.stop()
+
+source = "the inference worker" if worker_enabled() else "this server process"
+
+
+# =====================================================
+# SHAP EXPLANATION CACHE
+# =====================================================
+st.subheader("🧠 SHAP Explanation Cache")
+
+cache_stats = inference_stats["explainer_cache"]
+
+if cache_stats:
+
+    cache_df = pd.DataFrame.from_dict(cache_stats, orient="index")
+    cache_df["hit_rate"] = (cache_df["hit_rate"] * 100).round(1)
+
+    st.dataframe(cache_df, use_container_width=True)
+
+else:
+    st.info(f"No explanations computed in {source} yet.")
+
+st.subheader("⚡ Disease Prediction Cache")
+
+prediction_stats = inference_stats["prediction_cache"]
+
+if prediction_stats:
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Cached Symptom Sets", prediction_stats["entries"])
+    col2.metric("Prewarmed", prediction_stats["prewarmed"])
+    col3.metric("Hit Rate", f"{prediction_stats['hit_rate'] * 100:.1f}%")
+    col4.metric("Evictions", prediction_stats["evictions"])
+
+else:
+    st.info(f"The disease model has not been loaded in {source} yet.")
+
+
+st.divider()
+
+
+# =====================================================
+# LOADED MODELS
+# =====================================================
+st.subheader(f"🧩 Transformer Models ({source})")
+
+model_df = pd.DataFrame(inference_stats["models"])
+
+if not model_df.empty:
+    st.metric(
+        "Resident Model Memory",
+        f"{inference_stats['model_bytes'] / 1024 ** 2:.1f} MB",
+        help=f"Budget: {inference_stats['model_budget_bytes'] / 1024 ** 2:.0f} MB"
+    )
+    st.dataframe(model_df, use_container_width=True)
+
+else:
+    st.info(f"No models registered in {source} yet.")
+
+
+st.divider()
+
+
+# =====================================================
+# STAGE LATENCY
+# =====================================================
+st.subheader("⏱️ Stage Latency")
+
+LATENCY_WINDOWS = {
+    "Last hour": (timedelta(hours=1), 5),
+    "Last 24 hours": (timedelta(days=1), 60),
+    "Last 7 days": (timedelta(days=7), 360),
+}
+
+col1, col2 = st.columns(2)
+window = col1.selectbox("Window", list(LATENCY_WINDOWS), index=1)
+percentile = col2.radio("Trend percentile", ["p50", "p95", "p99"],
+                        index=1, horizontal=True)
+
+# Include spans this server process has not written yet
+try:
+    flush_metrics()
+except Exception:
+    pass
+
+window_length, bucket_minutes = LATENCY_WINDOWS[window]
+since = (datetime.now() - window_length).strftime(LOGIN_TIME_FORMAT)
+
+# Histogram rows only; percentiles are read from them (within 10%)
+histogram_df = pd.DataFrame(
+    get_metric_histograms(since), columns=["page", "stage", "bin", "total"]
+)
+
+if not histogram_df.empty:
+
+    latency_rows = []
+    for (page, stage), group in histogram_df.groupby(["page", "stage"]):
+        histogram = list(zip(group["bin"], group["total"]))
+        latency_rows.append({
+            "page": page,
+            "stage": stage,
+            "count": int(group["total"].sum()),
+            "p50_ms": histogram_quantile(histogram, 0.50),
+            "p95_ms": histogram_quantile(histogram, 0.95),
+            "p99_ms": histogram_quantile(histogram, 0.99),
+        })
+    latency_df = pd.DataFrame(latency_rows).set_index(["page", "stage"]).round(2)
+
+    st.dataframe(latency_df, use_container_width=True)
+
+    selected_page = st.selectbox("Page", sorted(histogram_df["page"].unique()))
+
+    trend_df = pd.DataFrame(
+        get_metric_trend(since, selected_page, bucket_minutes),
+        columns=["bucket", "stage", "bin", "total"]
+    )
+    quantile = int(percentile[1:]) / 100
+    trend = pd.DataFrame([
+        {
+            "bucket": bucket,
+            "stage": stage,
+            "latency_ms": histogram_quantile(
+                list(zip(group["bin"], group["total"])), quantile
+            ),
+        }
+        for (bucket, stage), group in trend_df.groupby(["bucket", "stage"])
+    ])
+    trend["bucket"] = pd.to_datetime(trend["bucket"])
+
+    st.caption(f"{percentile} latency (ms) per stage")
+    st.line_chart(trend.pivot(index="bucket", columns="stage", values="latency_ms"))
+
 else:
-    st.info("No login history available.")
\ No newline at end of file
+    st.info("No timing spans recorded in this window yet.")
@@ -0,0 +1,494 @@
+"""Local inference worker that owns the models for every server process.
+
+    cd app && INFERENCE_WORKER_ADDRESS=127.0.0.1:6100 \
+        INFERENCE_WORKER_AUTHKEY=$(python -c "import secrets; print(secrets.token_hex(32))") \
+        python -m services.inference_worker
+
+Give the Streamlit processes the same address and key. Pages submit jobs with ``run_job(kind, payload)``. When
+``INFERENCE_WORKER_ADDRESS`` is set the job is sent to the worker, which
+groups jobs that arrive within ``INFERENCE_BATCH_WINDOW_MS`` into one
+micro-batch per kind. Without a worker (or while it is unreachable) the
+same handler runs in-process, so single-user setups need nothing extra.
+"""
+import argparse
+import functools
+import io
+import os
+import queue
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import defaultdict
+from multiprocessing.connection import (
+    AuthenticationError,
+    Connection,
+    Listener,
+    answer_challenge,
+    deliver_challenge
+)
+
+from config import (
+    INFERENCE_BATCH_WINDOW_MS,
+    INFERENCE_CONNECT_TIMEOUT_MS,
+    INFERENCE_MAX_BATCH,
+    INFERENCE_REPLY_TIMEOUT_SECONDS,
+    INFERENCE_RETRY_SECONDS,
+    INFERENCE_WORKER_ADDRESS,
+    INFERENCE_WORKER_AUTHKEY,
+    MODELS_DIR
+)
+
+LISTEN_BACKLOG = 64
+MIN_AUTHKEY_BYTES = 16
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+# ==================================================
+# SHARED PREDICTORS
+# ==================================================
+
+def disease_predictor():
+    # Reloaded together with its prediction cache when the model changes
+    from services.prediction.prediction_cache import get_prediction_cache
+    return get_prediction_cache().predictor
+
+
+@functools.lru_cache(maxsize=None)
+def heart_predictor():
+    from services.prediction.heart_service import HeartPredictor
+    return HeartPredictor.from_artifacts()
+
+
+@functools.lru_cache(maxsize=None)
+def disease_symptoms():
+    """Symptom names for the input form, without loading the model."""
+    import joblib
+    return list(joblib.load(os.path.join(MODELS_DIR, "symptom_columns.pkl")))
+
+
+# ==================================================
+# BATCH HANDLERS (list of payloads -> list of results)
+# ==================================================
+
+def _summarize(payloads):
+    from services.nlp.summarizer import load_summarizer, summarize_many
+
+    tokenizer, model = load_summarizer()
+    results = [None] * len(payloads)
+
+    by_budget = defaultdict(list)
+    for i, payload in enumerate(payloads):
+        by_budget[payload["token_budget"]].append(i)
+
+    for token_budget, indices in by_budget.items():
+        summaries = summarize_many(
+            [payloads[i]["text"] for i in indices],
+            tokenizer, model,
+            token_budget=token_budget
+        )
+        for i, summary in zip(indices, summaries):
+            results[i] = summary
+
+    return results
+
+
+def _translate(payloads):
+    from utils.translator import generate_translations
+
+    # opus-mt-en-hi has a single target, so every job shares one decode
+    unique = list(dict.fromkeys(
+        text for payload in payloads for text in payload["texts"]
+    ))
+    translated = dict(zip(unique, generate_translations(unique)))
+    return [[translated[text] for text in payload["texts"]]
+            for payload in payloads]
+
+
+def _predict_disease(payloads):
+    from services.prediction.prediction_cache import get_prediction_cache
+
+    cache = get_prediction_cache()
+    k = max(payload["k"] for payload in payloads)
+
+    indices, labels, probs = cache.top_k(
+        cache.predictor.encode([payload["symptoms"] for payload in payloads]),
+        k
+    )
+
+    return [
+        (indices[i][:payload["k"]].tolist(),
+         labels[i][:payload["k"]].tolist(),
+         probs[i][:payload["k"]].tolist())
+        for i, payload in enumerate(payloads)
+    ]
+
+
+def _predict_heart(payloads):
+    import pandas as pd
+
+    predictor = heart_predictor()
+    predictions, probabilities = predictor.score(
+        pd.DataFrame([payload["row"] for payload in payloads])
+    )
+    return [
+        (int(prediction), float(probability))
+        for prediction, probability in zip(predictions, probabilities)
+    ]
+
+
+def _explain(payloads):
+    import pandas as pd
+    from services.prediction.explainer_cache import get_explainer_cache
+
+    results = []
+    for payload in payloads:
+        if payload["model"] == "disease":
+            predictor = disease_predictor()
+            input_df = predictor.to_frame(predictor.encode([payload["symptoms"]]))
+            output = payload["output"]
+        else:
+            predictor = heart_predictor()
+            input_df = predictor.to_frame(
+                predictor.encode(pd.DataFrame([payload["row"]]))
+            )
+            output = predictor.positive_column
+
+        explanation = get_explainer_cache(
+            payload["model"], predictor.model
+        ).explain(input_df)[:, output]
+        results.append({
+            "values": explanation.values,
+            "base_value": explanation.base_values,
+            "data": explanation.data,
+            "features": list(input_df.columns),
+        })
+    return results
+
+
+def _triage_disease(payloads):
+    import pandas as pd
+    from services.prediction.prediction_cache import get_prediction_cache
+
+    cache = get_prediction_cache()
+    results = []
+    for payload in payloads:
+        matrix = cache.predictor.encode_frame(pd.read_csv(io.BytesIO(payload["csv"])))
+        # Repeated symptom sets are scored once via the prediction cache
+        _, labels, probs = cache.top_k(matrix, k=payload["k"])
+        results.append(cache.predictor.results_frame(labels, probs))
+    return results
+
+
+def _screen_heart(payloads):
+    predictor = heart_predictor()
+    results = []
+    for payload in payloads:
+        output = io.StringIO()
+        total, high_risk = predictor.score_cohort(io.BytesIO(payload["csv"]), output)
+        results.append((total, high_risk, output.getvalue()))
+    return results
+
+
+def _stats(payloads):
+    # Cache and model state of the process that runs the jobs, for the
+    # admin dashboard
+    from services.model_registry import registry
+    from services.prediction.explainer_cache import explainer_cache_stats
+    from services.prediction.prediction_cache import prediction_cache_stats
+
+    snapshot = {
+        "explainer_cache": explainer_cache_stats(),
+        "prediction_cache": prediction_cache_stats(),
+        "models": registry.status(),
+        "model_bytes": registry.total_bytes(),
+        "model_budget_bytes": registry.memory_budget_bytes,
+    }
+    return [snapshot] * len(payloads)
+
+
+HANDLERS = {
+    "summarize": _summarize,
+    "translate": _translate,
+    "predict_disease": _predict_disease,
+    "predict_heart": _predict_heart,
+    "explain": _explain,
+    "triage_disease": _triage_disease,
+    "screen_heart": _screen_heart,
+    "stats": _stats,
+}
+
+
+# ==================================================
+# WORKER PROCESS
+# ==================================================
+
+class _Job:
+    __slots__ = ("kind", "payload", "reply", "done")
+
+    def __init__(self, kind, payload):
+        self.kind = kind
+        self.payload = payload
+        self.reply = None
+        self.done = threading.Event()
+
+
+def _run_alone(kind, payload):
+    try:
+        return ("ok", HANDLERS[kind]([payload])[0])
+    except Exception as e:
+        return ("error", f"{kind} failed: {e!r}")
+
+
+class InferenceWorker:
+    """Accepts jobs from many connections and runs them in micro-batches.
+
+    One batcher thread owns the models, so concurrent users queue for the
+    CPU instead of contending for it, and the weights are loaded once.
+    """
+
+    def __init__(self, address, authkey=INFERENCE_WORKER_AUTHKEY,
+                 batch_window_ms=INFERENCE_BATCH_WINDOW_MS,
+                 max_batch=INFERENCE_MAX_BATCH):
+        if len(authkey) < MIN_AUTHKEY_BYTES:
+            raise ValueError(
+                f"The inference worker needs an authkey of at least "
+                f"{MIN_AUTHKEY_BYTES} bytes (set INFERENCE_WORKER_AUTHKEY)"
+            )
+        self.address = parse_address(address)
+        self.authkey = authkey
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self._jobs = queue.Queue()
+        self.batches = 0
+        self.jobs_served = 0
+
+    def serve_forever(self):
+        threading.Thread(
+            target=self._batch_loop,
+            name="inference-batcher",
+            daemon=True
+        ).start()
+
+        # No authkey on the listener: accept() would run the handshake on
+        # this thread, where one silent client blocks everyone behind it.
+        # Each connection thread authenticates its own client instead.
+        with Listener(self.address, backlog=LISTEN_BACKLOG) as listener:
+            print(f"Inference worker listening on {self.address[0]}:{self.address[1]}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except OSError:
+                    continue
+                threading.Thread(
+                    target=self._serve_connection,
+                    args=(conn,),
+                    daemon=True
+                ).start()
+
+    def _serve_connection(self, conn):
+        with conn:
+            try:
+                _authenticate(conn, self.authkey, server=True)
+            except (AuthenticationError, EOFError, OSError):
+                # wrong authkey, or no handshake within the deadline
+                return
+
+            while True:
+                try:
+                    kind, payload = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                job = _Job(kind, payload)
+                self._jobs.put(job)
+                job.done.wait()
+
+                try:
+                    conn.send(job.reply)
+                except OSError:
+                    return
+
+    def _collect(self):
+        batch = [self._jobs.get()]
+        deadline = time.monotonic() + self.batch_window
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._jobs.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _batch_loop(self):
+        while True:
+            by_kind = defaultdict(list)
+            for job in self._collect():
+                by_kind[job.kind].append(job)
+
+            for kind, jobs in by_kind.items():
+                try:
+                    handler = HANDLERS[kind]
+                    results = handler([job.payload for job in jobs])
+                    replies = [("ok", result) for result in results]
+                except Exception as e:
+                    if len(jobs) == 1:
+                        replies = [("error", f"{kind} failed: {e!r}")]
+                    else:
+                        # One bad job must not fail the rest of its batch
+                        replies = [_run_alone(kind, job.payload) for job in jobs]
+
+                for job, reply in zip(jobs, replies):
+                    job.reply = reply
+                    job.done.set()
+
+                self.batches += 1
+                self.jobs_served += len(jobs)
+
+
+# ==================================================
+# CLIENT (with in-process fallback)
+# ==================================================
+
+class InferenceError(RuntimeError):
+    pass
+
+
+_connections = queue.LifoQueue()
+_unavailable_until = 0.0
+
+
+def _set_recv_timeout(sock, seconds):
+    # Applies to the blocking reads Connection does on the raw descriptor;
+    # an expired read fails with OSError. Zero means no timeout.
+    if sys.platform == "win32":
+        value = struct.pack("I", int(seconds * 1000))
+    else:
+        value = struct.pack("ll", int(seconds), int(seconds % 1 * 1_000_000))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, value)
+
+
+def _authenticate(conn, authkey, server):
+    """Run the authkey handshake on ``conn`` with a deadline on every read.
+
+    The deadline is lifted afterwards: the worker then waits for jobs
+    indefinitely, and clients wait for replies with poll().
+    """
+    with socket.fromfd(conn.fileno(), socket.AF_INET, socket.SOCK_STREAM) as sock:
+        _set_recv_timeout(sock, INFERENCE_CONNECT_TIMEOUT_MS / 1000)
+        if server:
+            deliver_challenge(conn, authkey)
+            answer_challenge(conn, authkey)
+        else:
+            answer_challenge(conn, authkey)
+            deliver_challenge(conn, authkey)
+        _set_recv_timeout(sock, 0)
+
+
+def _connect():
+    """multiprocessing.connection.Client with a deadline on the handshake."""
+    sock = socket.create_connection(
+        parse_address(INFERENCE_WORKER_ADDRESS),
+        timeout=INFERENCE_CONNECT_TIMEOUT_MS / 1000
+    )
+    sock.settimeout(None)
+    conn = Connection(sock.detach())
+
+    try:
+        _authenticate(conn, INFERENCE_WORKER_AUTHKEY, server=False)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def _borrow_connection():
+    try:
+        return _connections.get_nowait()
+    except queue.Empty:
+        return _connect()
+
+
+def _remote(kind, payload):
+    conn = _borrow_connection()
+    try:
+        conn.send((kind, payload))
+        if not conn.poll(INFERENCE_REPLY_TIMEOUT_SECONDS):
+            raise TimeoutError(f"no {kind} reply within {INFERENCE_REPLY_TIMEOUT_SECONDS} s")
+        reply = conn.recv()
+    except BaseException:
+        # Never reuse a connection that may still receive a late reply
+        conn.close()
+        raise
+    _connections.put(conn)
+    return reply
+
+
+def worker_enabled():
+    return (
+        bool(INFERENCE_WORKER_ADDRESS)
+        and bool(INFERENCE_WORKER_AUTHKEY)
+        and time.monotonic() >= _unavailable_until
+    )
+
+
+def run_job(kind, payload):
+    """Run one job on the worker if there is one, otherwise in-process.
+
+    Models are only loaded in this process on the in-process path.
+    """
+    global _unavailable_until
+
+    if worker_enabled():
+        try:
+            status, result = _remote(kind, payload)
+        except (OSError, EOFError):
+            # Down, stuck or too slow (TimeoutError is an OSError). Don't
+            # wait on it again for every call until the retry window passes.
+            _unavailable_until = time.monotonic() + INFERENCE_RETRY_SECONDS
+        else:
+            if status == "ok":
+                return result
+            raise InferenceError(result)
+
+    return HANDLERS[kind]([payload])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local inference worker")
+    parser.add_argument("--address", default=INFERENCE_WORKER_ADDRESS or "127.0.0.1:6100")
+    parser.add_argument("--batch-window-ms", type=int, default=INFERENCE_BATCH_WINDOW_MS)
+    parser.add_argument("--max-batch", type=int, default=INFERENCE_MAX_BATCH)
+    args = parser.parse_args()
+
+    if len(INFERENCE_WORKER_AUTHKEY) < MIN_AUTHKEY_BYTES:
+        sys.exit(
+            f"Set INFERENCE_WORKER_AUTHKEY to a random secret of at least "
+            f"{MIN_AUTHKEY_BYTES} bytes, e.g. "
+            f'python -c "import secrets; print(secrets.token_hex(32))"'
+        )
+
+    # Load the disease model and prewarm its prediction cache before serving
+    try:
+        disease_predictor()
+    except FileNotFoundError as e:
+        print(f"Disease model not loaded: {e}")
+
+    InferenceWorker(
+        args.address,
+        batch_window_ms=args.batch_window_ms,
+        max_batch=args.max_batch
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import gc
+import threading
+import time
+
+from config import (
+    CPU_FAST_MODELS,
+    MODEL_IDLE_TTL_SECONDS,
+    MODEL_MEMORY_BUDGET_MB,
+    TORCH_INTER_OP_THREADS,
+    TORCH_INTRA_OP_THREADS
+)
+
+
+def resident_bytes(value):
+    """Parameter and buffer bytes of every torch module inside ``value``."""
+    if isinstance(value, (tuple, list)):
+        return sum(resident_bytes(item) for item in value)
+
+    if hasattr(value, "parameters") and hasattr(value, "buffers"):
+        tensors = [*value.parameters(), *value.buffers()]
+        # Dynamically quantized Linear layers keep packed int8 weights
+        # outside parameters()
+        for module in value.modules():
+            if hasattr(module, "_weight_bias"):
+                tensors.extend(t for t in module._weight_bias() if t is not None)
+        return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+    return 0
+
+
+# ==================================================
+# FAST CPU MODE
+# ==================================================
+
+_threads_configured = False
+_threads_lock = threading.Lock()
+
+
+def configure_torch_threads(intra_op=TORCH_INTRA_OP_THREADS,
+                            inter_op=TORCH_INTER_OP_THREADS):
+    """Apply configured torch thread counts once per process."""
+    global _threads_configured
+
+    import torch
+
+    with _threads_lock:
+        if _threads_configured:
+            return
+        _threads_configured = True
+
+        if intra_op > 0:
+            torch.set_num_threads(intra_op)
+        if inter_op > 0:
+            try:
+                torch.set_num_interop_threads(inter_op)
+            except RuntimeError:
+                # Only allowed before the first inter-op parallel work
+                pass
+
+
+def fast_cpu_enabled(model_name):
+    return "all" in CPU_FAST_MODELS or model_name in CPU_FAST_MODELS
+
+
+def quantize_linear(model):
+    """Dynamic int8 quantization of every ``nn.Linear`` (CPU only)."""
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+
+    return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def seq2seq_loader(model_name, fast=None):
+    """Loader returning ``(tokenizer, model)`` for a Hugging Face checkpoint.
+
+    ``fast`` defaults to whether ``model_name`` is listed in
+    ``CPU_FAST_MODELS``.
+    """
+    def load():
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+        configure_torch_threads()
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        model.eval()
+
+        if fast_cpu_enabled(model_name) if fast is None else fast:
+            model = quantize_linear(model)
+
+        return tokenizer, model
+
+    return load
+
+
+class _Entry:
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.value = None
+        self.bytes = 0
+        self.last_used = 0.0
+        self.loads = 0
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Lazily loaded, shared models with an LRU memory budget and idle TTL."""
+
+    def __init__(self, memory_budget_bytes, idle_ttl_seconds):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.idle_ttl_seconds = idle_ttl_seconds
+
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def register(self, name, loader, replace=False):
+        """Add a lazily loaded model; ``replace`` swaps an existing loader."""
+        with self._lock:
+            if name not in self._entries or replace:
+                self._entries[name] = _Entry(loader)
+
+    def get(self, name):
+        entry = self._entries[name]
+
+        with entry.lock:
+            if entry.value is None:
+                entry.value = entry.loader()
+                entry.bytes = resident_bytes(entry.value)
+                entry.loads += 1
+            entry.last_used = time.monotonic()
+            value = entry.value
+
+        self._enforce_budget(keep=name)
+        self._start_reaper()
+        return value
+
+    def unload(self, name):
+        entry = self._entries[name]
+        with entry.lock:
+            entry.value = None
+            entry.bytes = 0
+        gc.collect()
+
+    # ==================================================
+    # EVICTION
+    # ==================================================
+
+    def _loaded(self):
+        return [
+            (name, entry) for name, entry in list(self._entries.items())
+            if entry.value is not None
+        ]
+
+    def total_bytes(self):
+        return sum(entry.bytes for _, entry in self._loaded())
+
+    def _enforce_budget(self, keep):
+        while self.total_bytes() > self.memory_budget_bytes:
+            candidates = [
+                (entry.last_used, name)
+                for name, entry in self._loaded() if name != keep
+            ]
+            if not candidates:
+                return
+            self.unload(min(candidates)[1])
+
+    def evict_idle(self):
+        now = time.monotonic()
+        for name, entry in self._loaded():
+            if now - entry.last_used > self.idle_ttl_seconds:
+                self.unload(name)
+
+    def _start_reaper(self):
+        if self._reaper is not None or self.idle_ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            if self._reaper is not None:
+                return
+
+            interval = max(1.0, min(self.idle_ttl_seconds / 2, 60.0))
+
+            def reap():
+                while True:
+                    time.sleep(interval)
+                    self.evict_idle()
+
+            self._reaper = threading.Thread(
+                target=reap, name="model-registry-reaper", daemon=True
+            )
+            self._reaper.start()
+
+    # ==================================================
+    # REPORTING
+    # ==================================================
+
+    def status(self):
+        now = time.monotonic()
+        return [
+            {
+                "model": name,
+                "loaded": entry.value is not None,
+                "resident_mb": round(entry.bytes / 1024 ** 2, 1),
+                "idle_seconds": (
+                    round(now - entry.last_used) if entry.last_used else None
+                ),
+                "loads": entry.loads,
+            }
+            for name, entry in list(self._entries.items())
+        ]
+
+
+registry = ModelRegistry(
+    memory_budget_bytes=MODEL_MEMORY_BUDGET_MB * 1024 ** 2,
+    idle_ttl_seconds=MODEL_IDLE_TTL_SECONDS
+)
@@ -0,0 +1,396 @@
+import re
+from collections import namedtuple
+
+# Bump when the catalog or matching rules change; cached findings are keyed
+# by it.
+LAB_CATALOG_VERSION = "4"
+
+Analyte = namedtuple("Analyte", ["name", "synonyms", "unit", "low", "high"])
+
+LabValue = namedtuple(
+    "LabValue", ["analyte", "value", "unit", "status", "low", "high", "value2"]
+)
+
+
+# ==================================================
+# REFERENCE-RANGE CATALOG (adult reference ranges)
+# ==================================================
+# ``None`` means the range is open on that side.
+
+CATALOG = [
+    # Vitals
+    Analyte("Blood Pressure", ["blood pressure", "bp"], "mmHg", 90, 140),
+    Analyte("Heart Rate", ["heart rate", "pulse rate", "pulse"], "bpm", 60, 100),
+    Analyte("SpO2", ["spo2", "oxygen saturation"], "%", 95, 100),
+
+    # Hematology
+    Analyte("Hemoglobin", ["hemoglobin", "haemoglobin", "hgb", "hb"], "g/dL", 12.0, 17.5),
+    Analyte("Hematocrit", ["hematocrit", "haematocrit", "hct", "pcv"], "%", 36, 52),
+    Analyte("RBC Count", ["red blood cell count", "rbc count", "rbc"], "10^6/uL", 4.2, 5.9),
+    Analyte("WBC Count", ["white blood cell count", "total leukocyte count",
+                          "wbc count", "tlc", "wbc"], "10^3/uL", 4.0, 11.0),
+    Analyte("Platelet Count", ["platelet count", "platelets", "plt"], "10^3/uL", 150, 450),
+    Analyte("MCV", ["mean corpuscular volume", "mcv"], "fL", 80, 100),
+    Analyte("MCH", ["mean corpuscular hemoglobin", "mch"], "pg", 27, 33),
+    Analyte("MCHC", ["mean corpuscular hemoglobin concentration", "mchc"],
+            "g/dL", 32, 36),
+    Analyte("RDW", ["red cell distribution width", "rdw"], "%", 11.5, 14.5),
+    Analyte("Neutrophils", ["neutrophils"], "%", 40, 75),
+    Analyte("Lymphocytes", ["lymphocytes"], "%", 20, 45),
+    Analyte("Monocytes", ["monocytes"], "%", 2, 10),
+    Analyte("Eosinophils", ["eosinophils"], "%", 1, 6),
+    Analyte("Basophils", ["basophils"], "%", 0, 2),
+    Analyte("ESR", ["erythrocyte sedimentation rate", "esr"], "mm/hr", 0, 20),
+
+    # Lipid profile
+    Analyte("Cholesterol", ["total cholesterol", "serum cholesterol", "cholesterol"],
+            "mg/dL", None, 200),
+    Analyte("LDL Cholesterol", ["ldl cholesterol", "ldl-c", "ldl"], "mg/dL", None, 100),
+    Analyte("HDL Cholesterol", ["hdl cholesterol", "hdl-c", "hdl"], "mg/dL", 40, None),
+    Analyte("VLDL Cholesterol", ["vldl cholesterol", "vldl"], "mg/dL", 5, 40),
+    Analyte("Triglycerides", ["triglycerides", "triglyceride"], "mg/dL", None, 150),
+
+    # Glucose
+    Analyte("Fasting Glucose", ["fasting blood sugar", "fasting blood glucose",
+                                "fasting plasma glucose", "fasting glucose", "fbs"],
+            "mg/dL", 70, 100),
+    Analyte("Random Glucose", ["random blood sugar", "random blood glucose",
+                               "random glucose", "rbs"], "mg/dL", 70, 140),
+    Analyte("Postprandial Glucose", ["post prandial blood sugar", "postprandial glucose",
+                                     "ppbs"], "mg/dL", 70, 140),
+    Analyte("HbA1c", ["glycated hemoglobin", "hba1c", "a1c"], "%", 4.0, 5.7),
+
+    # Renal function
+    Analyte("Blood Urea Nitrogen", ["blood urea nitrogen", "bun"], "mg/dL", 7, 20),
+    Analyte("Urea", ["blood urea", "serum urea", "urea"], "mg/dL", 15, 45),
+    Analyte("Creatinine", ["serum creatinine", "creatinine"], "mg/dL", 0.6, 1.3),
+    Analyte("Uric Acid", ["serum uric acid", "uric acid"], "mg/dL", 3.5, 7.2),
+    Analyte("eGFR", ["egfr"], "mL/min/1.73m2", 90, None),
+
+    # Electrolytes and minerals
+    Analyte("Sodium", ["serum sodium", "sodium"], "mmol/L", 135, 145),
+    Analyte("Potassium", ["serum potassium", "potassium"], "mmol/L", 3.5, 5.1),
+    Analyte("Chloride", ["serum chloride", "chloride"], "mmol/L", 98, 107),
+    Analyte("Bicarbonate", ["bicarbonate", "hco3"], "mmol/L", 22, 29),
+    Analyte("Calcium", ["serum calcium", "calcium"], "mg/dL", 8.5, 10.5),
+    Analyte("Phosphorus", ["phosphorus", "phosphate"], "mg/dL", 2.5, 4.5),
+    Analyte("Magnesium", ["serum magnesium", "magnesium"], "mg/dL", 1.7, 2.2),
+
+    # Liver function
+    Analyte("Total Bilirubin", ["total bilirubin", "serum bilirubin", "bilirubin"],
+            "mg/dL", 0.1, 1.2),
+    Analyte("Direct Bilirubin", ["direct bilirubin", "conjugated bilirubin"],
+            "mg/dL", None, 0.3),
+    Analyte("ALT", ["alanine aminotransferase", "sgpt", "alt"], "U/L", 7, 56),
+    Analyte("AST", ["aspartate aminotransferase", "sgot", "ast"], "U/L", 10, 40),
+    Analyte("Alkaline Phosphatase", ["alkaline phosphatase", "alp"], "U/L", 44, 147),
+    Analyte("GGT", ["gamma-glutamyl transferase", "gamma gt", "ggt"], "U/L", 9, 48),
+    Analyte("Total Protein", ["total protein", "serum protein"], "g/dL", 6.0, 8.3),
+    Analyte("Albumin", ["serum albumin", "albumin"], "g/dL", 3.5, 5.0),
+    Analyte("Globulin", ["globulin"], "g/dL", 2.0, 3.5),
+
+    # Thyroid
+    Analyte("TSH", ["thyroid stimulating hormone", "tsh"], "mIU/L", 0.4, 4.0),
+    Analyte("Free T4", ["free t4", "ft4"], "ng/dL", 0.8, 1.8),
+    Analyte("Free T3", ["free t3", "ft3"], "pg/mL", 2.3, 4.2),
+    Analyte("Total T4", ["total t4", "t4"], "ug/dL", 5.0, 12.0),
+    Analyte("Total T3", ["total t3", "t3"], "ng/dL", 80, 200),
+
+    # Cardiac, inflammation, iron and vitamins
+    Analyte("Troponin I", ["troponin i", "troponin"], "ng/mL", None, 0.04),
+    Analyte("CRP", ["c-reactive protein", "crp"], "mg/L", None, 10),
+    Analyte("Ferritin", ["serum ferritin", "ferritin"], "ng/mL", 20, 250),
+    Analyte("Iron", ["serum iron", "iron"], "ug/dL", 60, 170),
+    Analyte("Vitamin D", ["25-oh vitamin d", "vitamin d3", "vitamin d"], "ng/mL", 30, 100),
+    Analyte("Vitamin B12", ["vitamin b12", "cobalamin", "b12"], "pg/mL", 200, 900),
+    Analyte("INR", ["inr"], "", 0.8, 1.2),
+]
+
+# Diastolic limits for the second blood-pressure reading
+DIASTOLIC_LOW = 60
+DIASTOLIC_HIGH = 90
+
+UNITS = [
+    "mg/dL", "g/dL", "g/L", "mg/L", "mmol/L", "umol/L", "µmol/L", "nmol/L",
+    "pmol/L", "mEq/L", "U/L", "IU/L", "%", "fL", "pg", "pg/mL", "ng/mL",
+    "ng/dL", "ng/L", "ug/dL", "mcg/dL", "µg/dL", "ug/L", "µg/L", "mIU/L",
+    "uIU/mL", "µIU/mL", "mm/hr", "bpm", "mmHg", "10^3/uL", "10^6/uL",
+    "x10^3/uL", "x10^6/uL", "10^9/L", "x10^9/L", "10^12/L", "x10^12/L",
+    "cells/uL", "cells/mcL", "/cumm", "mL/min/1.73m2", "mL/min",
+]
+
+
+# ==================================================
+# UNIT CONVERSION
+# ==================================================
+# Reference ranges are in the catalog unit, so a reading in any other unit
+# is converted before it is judged. Spellings of the same unit share one
+# canonical name; everything else needs a per-analyte factor.
+
+UNIT_ALIASES = {
+    "x10^3/uL": "10^3/uL",
+    "10^9/L": "10^3/uL",
+    "x10^9/L": "10^3/uL",
+    "x10^6/uL": "10^6/uL",
+    "10^12/L": "10^6/uL",
+    "x10^12/L": "10^6/uL",
+    "cells/mcL": "cells/uL",
+    "/cumm": "cells/uL",
+    "µmol/L": "umol/L",
+    "mcg/dL": "ug/dL",
+    "µg/dL": "ug/dL",
+    "µg/L": "ug/L",
+    "uIU/mL": "mIU/L",
+    "µIU/mL": "mIU/L",
+    "IU/L": "U/L",
+}
+
+_GLUCOSE = {"mmol/L": 18.016}
+_CHOLESTEROL = {"mmol/L": 38.67}
+_PROTEIN = {"g/L": 0.1}
+_BILIRUBIN = {"umol/L": 1 / 17.1}
+
+# value in the catalog unit = value in the report's unit * factor
+CONVERSIONS = {
+    "Hemoglobin": {"g/L": 0.1, "mmol/L": 1.611},
+    "MCHC": {"g/L": 0.1},
+    "RBC Count": {"cells/uL": 1e-6},
+    "WBC Count": {"cells/uL": 1e-3},
+    "Platelet Count": {"cells/uL": 1e-3},
+    "Cholesterol": _CHOLESTEROL,
+    "LDL Cholesterol": _CHOLESTEROL,
+    "HDL Cholesterol": _CHOLESTEROL,
+    "VLDL Cholesterol": _CHOLESTEROL,
+    "Triglycerides": {"mmol/L": 88.57},
+    "Fasting Glucose": _GLUCOSE,
+    "Random Glucose": _GLUCOSE,
+    "Postprandial Glucose": _GLUCOSE,
+    "Blood Urea Nitrogen": {"mmol/L": 2.801},
+    "Urea": {"mmol/L": 6.006},
+    "Creatinine": {"umol/L": 1 / 88.42},
+    "Uric Acid": {"umol/L": 1 / 59.48, "mmol/L": 16.81},
+    "eGFR": {"mL/min": 1.0},
+    "Sodium": {"mEq/L": 1.0},
+    "Potassium": {"mEq/L": 1.0},
+    "Chloride": {"mEq/L": 1.0},
+    "Bicarbonate": {"mEq/L": 1.0},
+    "Calcium": {"mmol/L": 4.008, "mEq/L": 2.004},
+    "Phosphorus": {"mmol/L": 3.097},
+    "Magnesium": {"mmol/L": 2.431, "mEq/L": 1.215},
+    "Total Bilirubin": _BILIRUBIN,
+    "Direct Bilirubin": _BILIRUBIN,
+    "Total Protein": _PROTEIN,
+    "Albumin": _PROTEIN,
+    "Globulin": _PROTEIN,
+    "Free T4": {"pmol/L": 1 / 12.87},
+    "Free T3": {"pmol/L": 1 / 1.536},
+    "Total T4": {"nmol/L": 1 / 12.87},
+    "Total T3": {"nmol/L": 65.1},
+    "Troponin I": {"ng/L": 1e-3, "ug/L": 1.0},
+    "CRP": {"mg/dL": 10.0},
+    "Ferritin": {"ug/L": 1.0},
+    "Iron": {"umol/L": 5.585},
+    "Vitamin D": {"nmol/L": 1 / 2.496},
+    "Vitamin B12": {"pmol/L": 1.355, "ng/L": 1.0},
+}
+
+_CANONICAL_UNITS = {
+    unit.lower(): UNIT_ALIASES.get(unit, unit)
+    for unit in UNITS + list(UNIT_ALIASES.values())
+}
+
+
+def unit_factor(analyte, unit):
+    """Factor from ``unit`` to the analyte's catalog unit, or None if unknown."""
+    unit = _CANONICAL_UNITS.get(unit.lower())
+    if unit is None:
+        return None
+    if unit == _CANONICAL_UNITS.get(analyte.unit.lower(), analyte.unit):
+        return 1.0
+    return CONVERSIONS.get(analyte.name, {}).get(unit)
+
+
+# ==================================================
+# COMPILED SINGLE-PASS PATTERN
+# ==================================================
+
+def _alternation(words):
+    # Longest first so "mg/dL" is not cut short by a shorter prefix
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+def _trie_pattern(words):
+    """Compile words into a prefix-factored regex.
+
+    ``re`` tries alternatives one by one, so a flat list of ~150 synonyms
+    costs ~150 attempts per text position; a trie costs one per letter.
+    Optional tails are tried before the shorter word, so "hba1c" still
+    wins over "hb" and "blood urea nitrogen" over "blood urea".
+    """
+    root = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [
+            re.escape(char) + emit(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if "" in node else body
+
+    return emit(root)
+
+
+_SYNONYMS = {
+    synonym.lower(): analyte
+    for analyte in CATALOG
+    for synonym in analyte.synonyms
+}
+
+# "7,500" and lakh-grouped "2,50,000" are one number, not 7 or 2
+# followed by junk
+_NUMBER = r"(?:\d{1,3}(?:,\d{3})+|\d{1,2}(?:,\d{2})+,\d{3}|\d+)(?:\.\d+)?"
+
+# The name-to-value gap may not run into another sentence or clause
+# ("pending. Age 67") or a reference to something else ("see page 2")
+_GAP_STOP = r"[.;:]\s+[^\s\d]|\b(?:page|age|see)\b"
+
+# Anything unit-like we have no name for ("K/uL", "mmol/mol"), so the
+# reading is not silently assumed to be in the catalog unit. The
+# denominator must start with a letter: "/2024" is the rest of a date.
+_OTHER_UNIT = r"[^\s,;:()/]*/[A-Za-zµ%][^\s,;:()]*"
+
+# A date where the value would start ("12/03/2024", "2024-03-12") is not
+# a reading, and neither is a bare year ("diagnosed in 2019")
+_DATE = r"\d{1,4}[/.-]\d{1,2}[/.-]\d{2,4}(?!\d)"
+_YEAR = re.compile(r"(?:19|20)\d{2}")
+
+# Every alternative is anchored on a literal name or digits, and the gap
+# between name and value is a bounded run without digits or newlines
+# whose stop check looks at most one word ahead, so each starting
+# position does constant work: linear in the text.
+LAB_PATTERN = re.compile(
+    rf"""
+    (?<!\w)(?P<name>{_trie_pattern(_SYNONYMS)})(?!\w)
+    (?:(?!{_GAP_STOP})[^\d\n]){{0,40}}
+    (?!{_DATE})(?P<value>{_NUMBER})
+    (?:\s*/\s*(?P<value2>{_NUMBER}))?
+    (?:\s*(?:(?P<unit>{_alternation(UNITS)})(?!\w)|(?P<other_unit>{_OTHER_UNIT})))?
+    |
+    (?<![\d/])(?P<systolic>\d{{2,3}})\s*/\s*(?P<diastolic>\d{{2,3}})\s*mm\s*hg
+    """,
+    re.IGNORECASE | re.VERBOSE
+)
+
+_BLOOD_PRESSURE = next(a for a in CATALOG if a.name == "Blood Pressure")
+
+
+def _parse_number(text):
+    return float(text.replace(",", ""))
+
+
+def _status(value, low, high):
+    if low is not None and value < low:
+        return "Low"
+    if high is not None and value > high:
+        return "High"
+    return "Normal"
+
+
+def _blood_pressure(systolic, diastolic):
+    status = _status(systolic, _BLOOD_PRESSURE.low, _BLOOD_PRESSURE.high)
+    if diastolic is not None:
+        diastolic_status = _status(diastolic, DIASTOLIC_LOW, DIASTOLIC_HIGH)
+        if "High" in (status, diastolic_status):
+            status = "High"
+        elif "Low" in (status, diastolic_status):
+            status = "Low"
+
+    return LabValue(
+        _BLOOD_PRESSURE.name, systolic, "mmHg", status,
+        _BLOOD_PRESSURE.low, _BLOOD_PRESSURE.high, diastolic
+    )
+
+
+def extract_lab_values(text):
+    """Scan ``text`` once and return the first reading of each analyte."""
+    results = {}
+
+    for match in LAB_PATTERN.finditer(text):
+        if match.group("systolic"):
+            if _BLOOD_PRESSURE.name not in results:
+                results[_BLOOD_PRESSURE.name] = _blood_pressure(
+                    float(match.group("systolic")),
+                    float(match.group("diastolic"))
+                )
+            continue
+
+        analyte = _SYNONYMS[match.group("name").lower()]
+        if analyte.name in results:
+            continue
+
+        unit = match.group("unit") or match.group("other_unit")
+        if unit is None and _YEAR.fullmatch(match.group("value")):
+            continue
+
+        value = _parse_number(match.group("value"))
+        value2 = match.group("value2")
+
+        if analyte is _BLOOD_PRESSURE:
+            results[analyte.name] = _blood_pressure(
+                value, _parse_number(value2) if value2 else None
+            )
+            continue
+
+        factor = 1.0 if unit is None else unit_factor(analyte, unit)
+
+        if factor is None:
+            # No conversion to the reference range's unit: report as written
+            results[analyte.name] = LabValue(
+                analyte.name, value, unit, None, None, None, None
+            )
+            continue
+
+        if factor != 1.0:
+            value = float(f"{value * factor:.3g}")
+
+        results[analyte.name] = LabValue(
+            analyte.name,
+            value,
+            analyte.unit,
+            _status(value, analyte.low, analyte.high),
+            analyte.low,
+            analyte.high,
+            None
+        )
+
+    return list(results.values())
+
+
+def _format_number(value):
+    return f"{value:g}"
+
+
+def extract_medical_values(text):
+    """Findings in the Report Analyzer's ``{name: value, name_Status: status}`` form."""
+    findings = {}
+
+    for lab in extract_lab_values(text):
+        if lab.value2 is not None:
+            value = f"{_format_number(lab.value)}/{_format_number(lab.value2)}"
+        else:
+            value = _format_number(lab.value)
+
+        findings[lab.analyte] = f"{value} {lab.unit}".strip()
+        if lab.status is not None:
+            findings[f"{lab.analyte}_Status"] = lab.status
+
+    return findings
@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz  # PyMuPDF
+
+from config import PDF_PARALLEL_PAGE_THRESHOLD, PDF_WORKERS
+
+
+def as_buffer(source):
+    """Bytes-like view of an upload without copying it where possible."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer()
+    return source.read()
+
+
+def open_document(source):
+    if isinstance(source, (str, os.PathLike)):
+        return fitz.open(source)
+    return fitz.open(stream=as_buffer(source), filetype="pdf")
+
+
+def _extract_serial(doc, progress):
+    pages = []
+    for number, page in enumerate(doc, start=1):
+        pages.append(page.get_text())
+        if progress:
+            progress(number, doc.page_count)
+    return pages
+
+
+# ==================================================
+# PARALLEL EXTRACTION
+# ==================================================
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the server process may already run torch/BLAS threads,
+            # which do not survive fork safely
+            _pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _discard_pool(pool):
+    # A crashed worker leaves the executor broken for good; the next
+    # extraction starts a fresh one
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_range(path, start, stop):
+    with fitz.open(path) as doc:
+        return start, [doc[i].get_text() for i in range(start, stop)]
+
+
+def _extract_parallel(source, page_count, progress):
+    # Workers open the document from one temporary file instead of each
+    # receiving a pickled copy of the upload.
+    tmp_path = None
+    if isinstance(source, (str, os.PathLike)):
+        path = source
+    else:
+        fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            f.write(as_buffer(source))
+        path = tmp_path
+
+    try:
+        step = max(1, -(-page_count // (PDF_WORKERS * 4)))
+        pool = _get_pool()
+        pages = [None] * page_count
+        done = 0
+        try:
+            futures = [
+                pool.submit(_extract_range, path, start, min(start + step, page_count))
+                for start in range(0, page_count, step)
+            ]
+            for future in as_completed(futures):
+                start, texts = future.result()
+                pages[start:start + len(texts)] = texts
+                done += len(texts)
+                if progress:
+                    progress(done, page_count)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+
+        return pages
+    finally:
+        if tmp_path:
+            os.remove(tmp_path)
+
+
+def extract_text(source, progress=None,
+                 parallel_threshold=PDF_PARALLEL_PAGE_THRESHOLD):
+    """Full document text, joined once.
+
+    Documents with more than ``parallel_threshold`` pages are split into
+    page ranges across a process pool. ``progress(done, total)`` is called
+    as pages complete.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        source = as_buffer(source)
+
+    # The document opened to count pages is the one the serial path reads
+    with open_document(source) as doc:
+        page_count = doc.page_count
+        pages = None
+
+        if page_count > parallel_threshold and PDF_WORKERS > 1:
+            try:
+                pages = _extract_parallel(source, page_count, progress)
+            except BrokenProcessPool:
+                # Finish this document here; the pool is rebuilt next time
+                pass
+
+        if pages is None:
+            pages = _extract_serial(doc, progress)
+
+    return "".join(pages).strip()
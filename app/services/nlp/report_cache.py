@@ -0,0 +1,149 @@
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from config import (
+    REPORT_CACHE_DIR,
+    REPORT_CACHE_DISK_ENTRIES,
+    REPORT_CACHE_MAX_AGE_DAYS,
+    REPORT_CACHE_SIZE
+)
+
+PRUNE_INTERVAL_SECONDS = 60
+
+
+def content_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def empty_record():
+    return {
+        "text": None,
+        "findings": {},
+        "summaries": {},
+        "translations": {},
+    }
+
+
+class ReportCache:
+    """Pipeline results per uploaded report, keyed by a hash of its bytes.
+
+    Records live in an in-memory LRU backed by one JSON file per report,
+    so results survive restarts and are shared between server processes.
+    Files are dropped after ``max_age_days`` and beyond the
+    ``disk_entries`` most recently used; ``disk_entries=0`` disables the
+    disk tier. Findings, summaries and translations are stored under keys
+    that include the extractor version, model and language that produced
+    them. Callers get and hand over copies, never the cached dict itself.
+    """
+
+    def __init__(self, directory=REPORT_CACHE_DIR, max_entries=REPORT_CACHE_SIZE,
+                 disk_entries=REPORT_CACHE_DISK_ENTRIES,
+                 max_age_days=REPORT_CACHE_MAX_AGE_DAYS):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.disk_entries = disk_entries
+        self.max_age = max_age_days * 86400
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def _path(self, digest):
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def load(self, digest):
+        with self._lock:
+            record = self._memory.get(digest)
+            if record is not None:
+                self._memory.move_to_end(digest)
+                return copy.deepcopy(record)
+
+        record = self._read(digest) or empty_record()
+
+        # Records written before findings were versioned
+        if not isinstance(record["findings"], dict):
+            record["findings"] = {}
+
+        self._remember(digest, record)
+        return copy.deepcopy(record)
+
+    def _read(self, digest):
+        if not self.disk_entries:
+            return None
+
+        path = self._path(digest)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                record = {**empty_record(), **json.load(f)}
+            # Recently used files are the last to be pruned
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return record
+
+    def save(self, digest, record):
+        record = copy.deepcopy(record)
+        self._remember(digest, record)
+
+        if not self.disk_entries:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(digest))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        if time.monotonic() - self._last_prune > PRUNE_INTERVAL_SECONDS:
+            self._last_prune = time.monotonic()
+            self.prune()
+
+    def prune(self):
+        """Delete expired files and all but the most recently used ones."""
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith(".json")]
+        except OSError:
+            return 0
+
+        files = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                files.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        files.sort(reverse=True)
+
+        cutoff = time.time() - self.max_age
+        removed = 0
+        for rank, (mtime, path) in enumerate(files):
+            if rank >= self.disk_entries or mtime < cutoff:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def _remember(self, digest, record):
+        with self._lock:
+            self._memory[digest] = record
+            self._memory.move_to_end(digest)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+
+report_cache = ReportCache()
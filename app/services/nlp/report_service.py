@@ -1,19 +1,24 @@
-import fitz  # PyMuPDF
-from transformers import pipeline
+from services.model_registry import registry, seq2seq_loader
+from services.nlp.pdf_extractor import extract_text
+from services.nlp.summarizer import summarize_long_text
 
-# Load summarization model once
-summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+BART_MODEL = "facebook/bart-large-cnn"
+
+# Loaded through the shared registry on first summary
+registry.register(BART_MODEL, seq2seq_loader(BART_MODEL))
 
 def extract_text_from_pdf(uploaded_file):
-    text = ""
-    pdf = fitz.open(stream=uploaded_file.read(), filetype="pdf")
-    for page in pdf:
-        text += page.get_text()
-    return text
+    return extract_text(uploaded_file)
 
 def generate_summary(text):
-    if len(text) > 2000:
-        text = text[:2000]  # limit for performance
+    tokenizer, model = registry.get(BART_MODEL)
+
+    # BART is a plain summarizer, so no instruction prompt is needed
+    return summarize_long_text(
+        text,
+        tokenizer,
+        model,
+        chunk_prompt="",
+        reduce_prompt=""
+    )
 
-    summary = summarizer(text, max_length=150, min_length=40, do_sample=False)
-    return summary[0]['summary_text']
@@ -0,0 +1,136 @@
+from config import (
+    SUMMARY_BATCH_SIZE,
+    SUMMARY_CHUNK_TOKENS,
+    SUMMARY_MAX_LENGTH,
+    SUMMARY_TOKEN_BUDGET
+)
+from services.inference_worker import run_job
+from services.model_registry import registry, seq2seq_loader
+
+SUMMARIZER_MODEL = "google/flan-t5-base"
+
+CHUNK_PROMPT = "Summarize this section of a medical report clearly:\n"
+REDUCE_PROMPT = "Summarize this medical report clearly:\n"
+
+
+registry.register(SUMMARIZER_MODEL, seq2seq_loader(SUMMARIZER_MODEL))
+
+
+def load_summarizer():
+    return registry.get(SUMMARIZER_MODEL)
+
+
+# ==================================================
+# CHUNKING
+# ==================================================
+
+def chunk_text(text, tokenizer, chunk_tokens=SUMMARY_CHUNK_TOKENS,
+               token_budget=SUMMARY_TOKEN_BUDGET):
+    """Split ``text`` into pieces of at most ``chunk_tokens`` tokens.
+
+    Only the first ``token_budget`` tokens of the document are kept.
+    """
+    token_ids = tokenizer(
+        text,
+        add_special_tokens=False,
+        return_attention_mask=False,
+        verbose=False
+    )["input_ids"][:token_budget]
+
+    return [
+        tokenizer.decode(token_ids[start:start + chunk_tokens],
+                         skip_special_tokens=True)
+        for start in range(0, len(token_ids), chunk_tokens)
+    ]
+
+
+# ==================================================
+# BATCHED GENERATION
+# ==================================================
+
+def generate_batch(texts, tokenizer, model, batch_size=SUMMARY_BATCH_SIZE,
+                   max_length=SUMMARY_MAX_LENGTH):
+    import torch
+
+    summaries = []
+
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(
+            texts[start:start + batch_size],
+            return_tensors="pt",
+            padding=True,
+            truncation=True
+        )
+        with torch.inference_mode():
+            outputs = model.generate(**inputs, max_length=max_length)
+        summaries.extend(
+            tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        )
+
+    return summaries
+
+
+def summarize_many(texts, tokenizer, model,
+                   chunk_tokens=SUMMARY_CHUNK_TOKENS,
+                   batch_size=SUMMARY_BATCH_SIZE,
+                   token_budget=SUMMARY_TOKEN_BUDGET,
+                   max_length=SUMMARY_MAX_LENGTH,
+                   chunk_prompt=CHUNK_PROMPT,
+                   reduce_prompt=REDUCE_PROMPT):
+    """Map-reduce summaries of documents longer than the model context.
+
+    Chunks of every document are summarized together in padded batches,
+    then each document's chunk summaries are summarized again until they
+    fit in a single final pass.
+    """
+    docs = [
+        chunk_text(text, tokenizer, chunk_tokens, token_budget)
+        for text in texts
+    ]
+    active = [i for i, chunks in enumerate(docs) if chunks]
+
+    while True:
+        pending = [i for i in active if len(docs[i]) > 1]
+        if not pending:
+            break
+
+        flat = [(i, chunk) for i in pending for chunk in docs[i]]
+        partial = generate_batch(
+            [chunk_prompt + chunk for _, chunk in flat],
+            tokenizer, model, batch_size, max_length
+        )
+
+        grouped = {i: [] for i in pending}
+        for (i, _), summary in zip(flat, partial):
+            grouped[i].append(summary)
+
+        for i, summaries in grouped.items():
+            reduced = chunk_text(
+                "\n".join(summaries), tokenizer, chunk_tokens, token_budget
+            )
+            if len(reduced) >= len(docs[i]):
+                # max_length too close to chunk_tokens to make progress
+                reduced = reduced[:1]
+            docs[i] = reduced
+
+    # Chunk summaries can all decode to nothing
+    active = [i for i in active if docs[i]]
+
+    results = [""] * len(texts)
+    final = generate_batch(
+        [reduce_prompt + docs[i][0] for i in active],
+        tokenizer, model, batch_size, max_length
+    )
+    for i, summary in zip(active, final):
+        results[i] = summary
+
+    return results
+
+
+def summarize_long_text(text, tokenizer, model, **kwargs):
+    return summarize_many([text], tokenizer, model, **kwargs)[0]
+
+
+def summarize_report(text, token_budget=SUMMARY_TOKEN_BUDGET):
+    """Summarize one report, on the inference worker when one is running."""
+    return run_job("summarize", {"text": text, "token_budget": token_budget})
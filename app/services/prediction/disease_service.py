@@ -0,0 +1,193 @@
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from config import COMPILED_TREE_MAX_ROWS, MODELS_DIR
+from services.prediction.model_bundle import bundle_path, label_encoder, open_bundle
+from services.prediction.tree_compiler import compile_model
+
+SYMPTOM_SEPARATOR_PATTERN = r"[;,]"
+
+
+class DiseasePredictor:
+    """Vectorized disease scoring over batches of symptom sets."""
+
+    def __init__(self, model, encoder, symptoms, compiled=None, load_model=None):
+        # ``model`` may be None when ``load_model`` can produce it on demand
+        self._model = model
+        self._load_model = load_model
+        self._model_lock = threading.Lock()
+        self.encoder = encoder
+        self.symptoms = list(symptoms)
+
+        # symptom -> column position, built once instead of list.index()
+        self.symptom_index = {
+            symptom: i for i, symptom in enumerate(self.symptoms)
+        }
+
+        # Array-based tree evaluation; None falls back to sklearn
+        self.compiled = compiled if compiled is not None else compile_model(model)
+
+        # predict_proba column j -> disease name
+        encoded_classes = getattr(
+            model if model is not None else self.compiled, "classes_", None
+        )
+        labels = np.asarray(encoder.classes_)
+        if encoded_classes is not None and np.issubdtype(
+            np.asarray(encoded_classes).dtype, np.integer
+        ):
+            self.class_labels = labels[np.asarray(encoded_classes)]
+        else:
+            self.class_labels = labels
+
+    @property
+    def model(self):
+        # Bundles unpickle the sklearn estimator only when something needs
+        # it (SHAP, large batches); compiled scoring reads the shared arrays
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    @classmethod
+    def from_bundle(cls, path):
+        bundle = open_bundle(path, kind="disease")
+        return cls(
+            None,
+            label_encoder(bundle.meta["labels"]),
+            bundle.meta["symptoms"],
+            compiled=bundle.forest(),
+            load_model=bundle.load_model
+        )
+
+    @classmethod
+    def from_artifacts(cls, models_dir=MODELS_DIR):
+        """Load ``disease.bundle`` when it exists, otherwise the joblib pickles."""
+        path = bundle_path(models_dir, "disease")
+        if os.path.exists(path):
+            return cls.from_bundle(path)
+
+        model = joblib.load(os.path.join(models_dir, "disease.pkl"))
+        encoder = joblib.load(
+            os.path.join(models_dir, "disease_label_encoder.pkl")
+        )
+        symptoms = joblib.load(os.path.join(models_dir, "symptom_columns.pkl"))
+        return cls(model, encoder, symptoms)
+
+    # ==================================================
+    # ENCODING
+    # ==================================================
+
+    def encode(self, symptom_sets, sparse_output=False):
+        """Turn an iterable of symptom collections into one 0/1 matrix."""
+        rows = []
+        cols = []
+        unknown = set()
+
+        n_rows = 0
+        for row, symptom_set in enumerate(symptom_sets):
+            n_rows += 1
+            for symptom in symptom_set:
+                col = self.symptom_index.get(symptom)
+                if col is None:
+                    unknown.add(symptom)
+                    continue
+                rows.append(row)
+                cols.append(col)
+
+        if unknown:
+            raise ValueError(
+                f"Unknown symptoms: {', '.join(sorted(map(str, unknown)))}"
+            )
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        shape = (n_rows, len(self.symptoms))
+
+        if sparse_output:
+            data = np.ones(len(rows), dtype=np.float32)
+            matrix = sparse.csr_matrix((data, (rows, cols)), shape=shape)
+            matrix.data[:] = 1.0  # collapse duplicate symptoms
+            return matrix
+
+        matrix = np.zeros(shape, dtype=np.float32)
+        matrix[rows, cols] = 1.0
+        return matrix
+
+    def encode_frame(self, df):
+        """Encode an uploaded intake table.
+
+        Accepts either one 0/1 column per symptom (the Training.csv layout)
+        or a single ``symptoms`` column of separated symptom names.
+        """
+        if "symptoms" in df.columns:
+            split = df["symptoms"].fillna("").astype(str).str.split(
+                SYMPTOM_SEPARATOR_PATTERN
+            )
+            symptom_sets = (
+                [s.strip() for s in values if s.strip()] for values in split
+            )
+            return self.encode(symptom_sets)
+
+        if not any(symptom in df.columns for symptom in self.symptoms):
+            raise ValueError("No symptom columns found in uploaded file.")
+
+        return (
+            df.reindex(columns=self.symptoms, fill_value=0)
+            .fillna(0)
+            .to_numpy(dtype=np.float32)
+        )
+
+    def to_frame(self, matrix):
+        if sparse.issparse(matrix):
+            matrix = matrix.toarray()
+        return pd.DataFrame(matrix, columns=self.symptoms, copy=False)
+
+    # ==================================================
+    # SCORING
+    # ==================================================
+
+    def predict_proba(self, matrix):
+        if self.compiled is not None and matrix.shape[0] <= COMPILED_TREE_MAX_ROWS:
+            if sparse.issparse(matrix):
+                matrix = matrix.toarray()
+            return self.compiled.predict_proba(matrix)
+
+        # Keep feature names when the model was fitted on a DataFrame so
+        # sklearn does not warn on every call.
+        if not sparse.issparse(matrix) and hasattr(self.model, "feature_names_in_"):
+            matrix = self.to_frame(matrix)
+        return self.model.predict_proba(matrix)
+
+    def top_k(self, probabilities, k=3):
+        """Return (column indices, disease names, probabilities) per row."""
+        probabilities = np.atleast_2d(probabilities)
+        k = min(k, probabilities.shape[1])
+
+        partition = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+        part_probs = np.take_along_axis(probabilities, partition, axis=1)
+        order = np.argsort(-part_probs, axis=1, kind="stable")
+
+        indices = np.take_along_axis(partition, order, axis=1)
+        top_probs = np.take_along_axis(part_probs, order, axis=1)
+        labels = self.class_labels[indices]
+
+        return indices, labels, top_probs
+
+    def predict_top_k(self, symptom_sets, k=3):
+        matrix = self.encode(symptom_sets)
+        return self.top_k(self.predict_proba(matrix), k)
+
+    def results_frame(self, labels, probabilities):
+        columns = {}
+        for rank in range(labels.shape[1]):
+            columns[f"disease_{rank + 1}"] = labels[:, rank]
+            columns[f"confidence_{rank + 1}"] = np.round(
+                probabilities[:, rank] * 100, 2
+            )
+        return pd.DataFrame(columns)
@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from config import SHAP_CACHE_MAX_BYTES, SHAP_CACHE_MAX_ENTRIES
+
+
+def _explanation_nbytes(explanation):
+    total = 0
+    for attr in ("values", "base_values", "data"):
+        value = getattr(explanation, attr, None)
+        if value is not None:
+            total += np.asarray(value).nbytes
+    return total
+
+
+class ExplainerCache:
+    """One TreeExplainer per model plus an LRU memo of row explanations.
+
+    Entries are keyed by the canonical float64 bytes of the input row and
+    evicted when either the entry count or the byte budget is exceeded.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_entries=SHAP_CACHE_MAX_ENTRIES,
+        max_bytes=SHAP_CACHE_MAX_BYTES
+    ):
+        self.model = model
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._explainer = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+
+    @property
+    def explainer(self):
+        if self._explainer is None:
+            import shap
+            self._explainer = shap.TreeExplainer(self.model)
+        return self._explainer
+
+    @staticmethod
+    def make_key(row):
+        return np.ascontiguousarray(row, dtype=np.float64).tobytes()
+
+    def explain(self, input_df):
+        """Return the SHAP explanation for the first row of ``input_df``."""
+        key = self.make_key(np.asarray(input_df)[0])
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        explanation = self.explainer(input_df[:1])[0]
+        self._store(key, explanation)
+        return explanation
+
+    def _store(self, key, explanation):
+        size = _explanation_nbytes(explanation)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+
+            self._entries[key] = (explanation, size)
+            self.current_bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or self.current_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# ==================================================
+# PROCESS-WIDE REGISTRY
+# ==================================================
+
+_caches = {}
+_registry_lock = threading.Lock()
+
+
+def get_explainer_cache(name, model):
+    """Return the cache for ``name``, rebuilding it if the model was reloaded."""
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None or cache.model is not model:
+            cache = ExplainerCache(model)
+            _caches[name] = cache
+        return cache
+
+
+def explainer_cache_stats():
+    with _registry_lock:
+        caches = dict(_caches)
+    return {name: cache.stats() for name, cache in caches.items()}
@@ -0,0 +1,274 @@
+"""Offline global explanation index for the disease and heart models.
+
+    cd app && python -m services.prediction.global_explanations [--only disease heart]
+
+Explains every distinct row of Training.csv / heart.csv with SHAP once and
+stores, per class, the mean |SHAP| and mean signed SHAP of each feature
+over the rows of that class. The result is a small .npz next to the model,
+so pages answer "which features drive class X" without running SHAP.
+"""
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import DATASETS_DIR, MODELS_DIR
+from services.prediction.model_bundle import model_artifact_path
+from services.prediction.prediction_cache import artifact_signature
+
+INDEX_FILES = {
+    "disease": "disease_explanations.npz",
+    "heart": "heart_explanations.npz",
+}
+HEART_CLASS_LABELS = {0: "No heart disease", 1: "Heart disease"}
+
+EXPLAIN_CHUNK_ROWS = 256
+
+
+class GlobalExplanationIndex:
+    """Per-class mean |SHAP| of every feature, with precomputed rankings."""
+
+    def __init__(self, features, classes, mean_abs, mean, support,
+                 rows=0, model_signature=(0, 0)):
+        self.features = np.asarray(features, dtype=str)
+        self.classes = np.asarray(classes, dtype=str)
+        self.mean_abs = np.asarray(mean_abs, dtype=np.float64)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.support = np.asarray(support, dtype=np.float64)
+        self.rows = int(rows)
+        self.model_signature = tuple(int(v) for v in model_signature)
+
+        # Features of each class ordered by mean |SHAP|, largest first
+        self.ranking = np.argsort(-self.mean_abs, axis=1, kind="stable")
+
+        self._class_index = {label: i for i, label in enumerate(self.classes)}
+        self._feature_index = {name: i for i, name in enumerate(self.features)}
+
+    # ==================================================
+    # QUERIES
+    # ==================================================
+
+    def top_features(self, label, n=10):
+        """Features that drive ``label`` most across its training rows."""
+        c = self._class_index[label]
+        order = self.ranking[c, :n]
+        return pd.DataFrame({
+            "feature": self.features[order],
+            "mean_abs_shap": self.mean_abs[c, order],
+            "mean_shap": self.mean[c, order],
+        })
+
+    def top_classes(self, feature, n=10):
+        """Classes whose predictions ``feature`` moves the most."""
+        f = self._feature_index[feature]
+        order = np.argsort(-self.mean_abs[:, f], kind="stable")[:n]
+        return pd.DataFrame({
+            "class": self.classes[order],
+            "mean_abs_shap": self.mean_abs[order, f],
+            "mean_shap": self.mean[order, f],
+        })
+
+    def is_stale(self, model_path):
+        """True when the model on disk is not the one this index was built from."""
+        try:
+            return artifact_signature(model_path) != self.model_signature
+        except FileNotFoundError:
+            return True
+
+    # ==================================================
+    # STORAGE
+    # ==================================================
+
+    def save(self, path):
+        # Write next to the target and swap in, so readers never see half a file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                features=self.features,
+                classes=self.classes,
+                mean_abs=self.mean_abs.astype(np.float32),
+                mean=self.mean.astype(np.float32),
+                support=self.support,
+                rows=np.int64(self.rows),
+                model_signature=np.asarray(self.model_signature, dtype=np.int64),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["features"],
+                data["classes"],
+                data["mean_abs"],
+                data["mean"],
+                data["support"],
+                rows=data["rows"],
+                model_signature=data["model_signature"],
+            )
+
+
+# ==================================================
+# BUILDING
+# ==================================================
+
+def _class_values(explainer, matrix):
+    """SHAP values as (rows, features, classes)."""
+    values = np.asarray(explainer(matrix, check_additivity=False).values)
+    if values.ndim == 2:
+        # Single-output models explain the positive class only
+        values = np.stack([-values, values], axis=2)
+    return values
+
+
+def build_index(model, matrix, output_columns, features, classes,
+                chunk_rows=EXPLAIN_CHUNK_ROWS):
+    """Aggregate SHAP values of each row's own class over the dataset.
+
+    ``output_columns[i]`` is the predict_proba column of row ``i``'s true
+    class. Duplicate rows are explained once and weighted by their count.
+    """
+    import shap
+
+    matrix = np.asarray(matrix, dtype=np.float64)
+    output_columns = np.asarray(output_columns, dtype=np.int64)
+
+    keyed = np.column_stack([matrix, output_columns])
+    unique, counts = np.unique(keyed, axis=0, return_counts=True)
+    unique_matrix = unique[:, :-1]
+    unique_columns = unique[:, -1].astype(np.int64)
+
+    n_classes, n_features = len(classes), len(features)
+    sum_abs = np.zeros((n_classes, n_features))
+    sum_signed = np.zeros((n_classes, n_features))
+    support = np.zeros(n_classes)
+
+    explainer = shap.TreeExplainer(model)
+
+    for start in range(0, len(unique_matrix), chunk_rows):
+        stop = start + chunk_rows
+        values = _class_values(explainer, unique_matrix[start:stop])
+        columns = unique_columns[start:stop]
+        weights = counts[start:stop, None].astype(np.float64)
+
+        own = values[np.arange(len(columns)), :, columns]
+        np.add.at(sum_abs, columns, weights * np.abs(own))
+        np.add.at(sum_signed, columns, weights * own)
+        np.add.at(support, columns, counts[start:stop])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_abs = np.nan_to_num(sum_abs / support[:, None])
+        mean = np.nan_to_num(sum_signed / support[:, None])
+
+    return GlobalExplanationIndex(
+        features, classes, mean_abs, mean, support, rows=len(matrix)
+    )
+
+
+def build_disease_index(models_dir=MODELS_DIR, datasets_dir=DATASETS_DIR):
+    from services.prediction.disease_service import DiseasePredictor
+
+    predictor = DiseasePredictor.from_artifacts(models_dir)
+    df = pd.read_csv(os.path.join(datasets_dir, "Training.csv"))
+
+    column_of = {label: j for j, label in enumerate(predictor.class_labels)}
+    index = build_index(
+        predictor.model,
+        predictor.encode_frame(df),
+        df["prognosis"].map(column_of).to_numpy(),
+        predictor.symptoms,
+        predictor.class_labels,
+    )
+    index.model_signature = artifact_signature(
+        model_artifact_path(models_dir, "disease")
+    )
+    return index
+
+
+def build_heart_index(models_dir=MODELS_DIR, datasets_dir=DATASETS_DIR):
+    from services.prediction.heart_service import HeartPredictor
+
+    predictor = HeartPredictor.from_artifacts(models_dir)
+    df = pd.read_csv(os.path.join(datasets_dir, "heart.csv"))
+
+    model_classes = list(predictor.classes_)
+    index = build_index(
+        predictor.model,
+        predictor.encode(df),
+        df["HeartDisease"].map(model_classes.index).to_numpy(),
+        predictor.columns,
+        [HEART_CLASS_LABELS.get(c, str(c)) for c in model_classes],
+    )
+    index.model_signature = artifact_signature(
+        model_artifact_path(models_dir, "heart")
+    )
+    return index
+
+
+BUILDERS = {
+    "disease": build_disease_index,
+    "heart": build_heart_index,
+}
+
+
+# ==================================================
+# PROCESS-WIDE LOADING
+# ==================================================
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def load_explanation_index(name, models_dir=MODELS_DIR):
+    """Return the saved index for ``name``, or None if it was never built.
+
+    Reloaded when the file on disk changes.
+    """
+    path = os.path.join(models_dir, INDEX_FILES[name])
+    try:
+        signature = artifact_signature(path)
+    except FileNotFoundError:
+        return None
+
+    with _loaded_lock:
+        cached = _loaded.get(path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, GlobalExplanationIndex.load(path))
+            _loaded[path] = cached
+        return cached[1]
+
+
+# ==================================================
+# COMMAND LINE
+# ==================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the global SHAP explanation index next to the models"
+    )
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--datasets-dir", default=DATASETS_DIR)
+    parser.add_argument("--only", nargs="+", choices=list(BUILDERS),
+                        default=list(BUILDERS))
+    args = parser.parse_args()
+
+    for name in args.only:
+        start = time.perf_counter()
+        index = BUILDERS[name](args.models_dir, args.datasets_dir)
+        path = os.path.join(args.models_dir, INDEX_FILES[name])
+        index.save(path)
+
+        print(
+            f"{name}: {index.rows} rows, {len(index.classes)} classes x "
+            f"{len(index.features)} features in "
+            f"{time.perf_counter() - start:.1f} s -> {path} "
+            f"({os.path.getsize(path) / 1024:.0f} KiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
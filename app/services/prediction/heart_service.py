@@ -0,0 +1,180 @@
+import argparse
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from config import COMPILED_TREE_MAX_ROWS, MODELS_DIR
+from services.prediction.model_bundle import bundle_path, label_encoder, open_bundle
+from services.prediction.tree_compiler import compile_model
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+RISK_COLUMN = "risk_prediction"
+PROBABILITY_COLUMN = "risk_probability"
+
+
+class HeartPredictor:
+    """Heart risk scoring with precompiled categorical lookup tables."""
+
+    def __init__(self, model, encoders, columns, compiled=None, load_model=None):
+        # ``model`` may be None when ``load_model`` can produce it on demand
+        self._model = model
+        self._load_model = load_model
+        self._model_lock = threading.Lock()
+        self.encoders = encoders
+        self.columns = list(columns)
+
+        # Hash-indexed category tables; positions match LabelEncoder codes
+        # because LabelEncoder.classes_ is sorted.
+        self.category_lookup = {
+            col: pd.Index(encoder.classes_) for col, encoder in encoders.items()
+        }
+
+        # Array-based tree evaluation; None falls back to sklearn
+        self.compiled = compiled if compiled is not None else compile_model(model)
+
+        self.classes_ = np.asarray(
+            (model if model is not None else self.compiled).classes_
+        )
+        self.positive_column = int(np.flatnonzero(self.classes_ == 1)[0])
+
+    @property
+    def model(self):
+        # Bundles unpickle the sklearn estimator only when something needs
+        # it (SHAP, large batches); compiled scoring reads the shared arrays
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    @classmethod
+    def from_bundle(cls, path):
+        bundle = open_bundle(path, kind="heart")
+        encoders = {
+            col: label_encoder(classes)
+            for col, classes in bundle.meta["categories"].items()
+        }
+        return cls(
+            None,
+            encoders,
+            bundle.meta["columns"],
+            compiled=bundle.forest(),
+            load_model=bundle.load_model
+        )
+
+    @classmethod
+    def from_artifacts(cls, models_dir=MODELS_DIR):
+        """Load ``heart.bundle`` when it exists, otherwise the joblib pickles."""
+        path = bundle_path(models_dir, "heart")
+        if os.path.exists(path):
+            return cls.from_bundle(path)
+
+        model = joblib.load(os.path.join(models_dir, "heart.pkl"))
+        encoders = joblib.load(os.path.join(models_dir, "heart_label_encoders.pkl"))
+        columns = joblib.load(os.path.join(models_dir, "heart_columns.pkl"))
+        return cls(model, encoders, columns)
+
+    # ==================================================
+    # ENCODING
+    # ==================================================
+
+    def encode(self, df):
+        """Return the model input matrix for ``df`` in training column order."""
+        matrix = np.empty((len(df), len(self.columns)), dtype=np.float64)
+
+        for position, col in enumerate(self.columns):
+            values = df[col]
+            lookup = self.category_lookup.get(col)
+
+            if lookup is None:
+                matrix[:, position] = values.to_numpy(dtype=np.float64)
+                continue
+
+            codes = lookup.get_indexer(values.astype(str))
+            if (codes < 0).any():
+                unknown = sorted(set(values[codes < 0].astype(str)))
+                raise ValueError(f"Unknown {col} values: {', '.join(unknown)}")
+            matrix[:, position] = codes
+
+        return matrix
+
+    def to_frame(self, matrix):
+        return pd.DataFrame(matrix, columns=self.columns, copy=False)
+
+    # ==================================================
+    # SCORING
+    # ==================================================
+
+    def predict_proba(self, matrix):
+        if self.compiled is not None and len(matrix) <= COMPILED_TREE_MAX_ROWS:
+            return self.compiled.predict_proba(matrix)
+
+        if hasattr(self.model, "feature_names_in_"):
+            matrix = self.to_frame(matrix)
+        return self.model.predict_proba(matrix)
+
+    def score_encoded(self, matrix):
+        """Return (predictions, positive-class probabilities)."""
+        probabilities = self.predict_proba(np.asarray(matrix))
+        predictions = self.classes_[probabilities.argmax(axis=1)]
+        return predictions, probabilities[:, self.positive_column]
+
+    def score(self, df):
+        return self.score_encoded(self.encode(df))
+
+    def score_cohort(self, source, destination, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Stream a roster CSV through the model chunk by chunk.
+
+        Every input column is passed through and the risk prediction and
+        probability are appended. Returns (rows scored, high risk rows).
+        """
+        total = 0
+        high_risk = 0
+
+        reader = pd.read_csv(source, chunksize=chunk_size)
+
+        for chunk_number, chunk in enumerate(reader):
+            predictions, probabilities = self.score(chunk)
+
+            chunk[RISK_COLUMN] = predictions
+            chunk[PROBABILITY_COLUMN] = np.round(probabilities, 4)
+
+            chunk.to_csv(
+                destination,
+                mode="w" if chunk_number == 0 else "a",
+                header=chunk_number == 0,
+                index=False
+            )
+
+            total += len(chunk)
+            high_risk += int((predictions == 1).sum())
+
+        return total, high_risk
+
+
+# ==================================================
+# COMMAND LINE
+# ==================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score a clinic roster shaped like heart.csv"
+    )
+    parser.add_argument("roster", help="input CSV path")
+    parser.add_argument("output", help="output CSV path")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    predictor = HeartPredictor.from_artifacts()
+    total, high_risk = predictor.score_cohort(
+        args.roster, args.output, chunk_size=args.chunk_size
+    )
+    print(f"Scored {total} patients, {high_risk} high risk -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
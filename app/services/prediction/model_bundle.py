@@ -0,0 +1,360 @@
+"""Versioned single-file model bundles that are opened with mmap.
+
+    cd app && python -m services.prediction.model_bundle build [--only disease heart]
+    cd app && python -m services.prediction.model_bundle inspect ../models/disease.bundle
+
+Layout (all integers little-endian)::
+
+    b"CLINBNDL" | uint32 version | uint32 header length | JSON header
+    padding to 64 bytes, then each array and the pickled estimator,
+    each starting on a 64-byte boundary
+
+The header records the bundle kind, its metadata (labels, columns,
+categories) and the dtype, shape and offset of every array. The compiled
+forest arrays are stored raw, so ``open_bundle`` returns read-only views
+of one shared mapping and every process on a node reads the same page
+cache pages. The sklearn estimator is kept as a joblib blob and only
+unpickled when something needs it (SHAP, very large batches).
+"""
+import argparse
+import io
+import json
+import os
+import struct
+import sys
+from datetime import datetime
+
+import joblib
+import numpy as np
+
+from config import MODELS_DIR
+from services.prediction.tree_compiler import CompiledForest
+
+BUNDLE_MAGIC = b"CLINBNDL"
+BUNDLE_VERSION = 1
+BUNDLE_SUFFIX = ".bundle"
+ALIGNMENT = 64
+
+_PREFIX = struct.Struct("<8sII")
+
+# Metadata keys each kind must carry
+SCHEMAS = {
+    "disease": ("labels", "symptoms"),
+    "heart": ("columns", "categories"),
+}
+
+# Metadata key listing the model's input features, per kind
+FEATURE_KEYS = {
+    "disease": "symptoms",
+    "heart": "columns",
+}
+
+# Expected dtype kind per forest array
+ARRAY_KINDS = {
+    "feature": "i",
+    "threshold": "f",
+    "left": "i",
+    "right": "i",
+    "missing_left": "b",
+    "is_leaf": "b",
+    "value": "f",
+    "roots": "i",
+}
+
+
+class BundleError(ValueError):
+    pass
+
+
+def bundle_path(models_dir, name):
+    return os.path.join(models_dir, f"{name}{BUNDLE_SUFFIX}")
+
+
+def model_artifact_path(models_dir, name):
+    """The file a predictor loads for ``name``: its bundle if built, else the pickle."""
+    path = bundle_path(models_dir, name)
+    if os.path.exists(path):
+        return path
+    return os.path.join(models_dir, f"{name}.pkl")
+
+
+def label_encoder(classes):
+    """A fitted LabelEncoder for ``classes`` without refitting on data."""
+    from sklearn.preprocessing import LabelEncoder
+
+    encoder = LabelEncoder()
+    encoder.classes_ = np.asarray(classes)
+    return encoder
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+# ==================================================
+# WRITING
+# ==================================================
+
+def write_bundle(path, kind, model, meta, compiled=None):
+    """Write ``model`` and its ``meta`` as a bundle, replacing ``path`` atomically."""
+    missing = [key for key in SCHEMAS[kind] if key not in meta]
+    if missing:
+        raise BundleError(f"{kind} bundle metadata is missing {', '.join(missing)}")
+
+    if compiled is None:
+        try:
+            compiled = CompiledForest.from_sklearn(model)
+        except (TypeError, AttributeError) as e:
+            raise BundleError(f"Cannot bundle {type(model).__name__}: {e}") from e
+
+    blobs = []
+    arrays = {}
+    offset = 0
+    for name, array in compiled.arrays().items():
+        array = np.ascontiguousarray(array)
+        offset = _align(offset)
+        arrays[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        blobs.append((offset, array.tobytes()))
+        offset += array.nbytes
+
+    model_buffer = io.BytesIO()
+    joblib.dump(model, model_buffer)
+    model_bytes = model_buffer.getvalue()
+    offset = _align(offset)
+    blobs.append((offset, model_bytes))
+
+    header = json.dumps({
+        "kind": kind,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "meta": {
+            **meta,
+            "classes": compiled.classes_.tolist(),
+            "max_depth": compiled.max_depth,
+        },
+        "arrays": arrays,
+        "model": {"offset": offset, "length": len(model_bytes)},
+    }).encode()
+
+    data_start = _align(_PREFIX.size + len(header))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(header)))
+        f.write(header)
+        for blob_offset, blob in blobs:
+            f.seek(data_start + blob_offset)
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return path
+
+
+# ==================================================
+# READING
+# ==================================================
+
+class ModelBundle:
+    """An opened bundle: metadata plus zero-copy views into the mapping."""
+
+    def __init__(self, path, kind, meta, arrays, buffer, model_range):
+        self.path = path
+        self.kind = kind
+        self.meta = meta
+        self.arrays = arrays
+        self._buffer = buffer
+        self._model_range = model_range
+
+    @property
+    def model_range(self):
+        """(start, stop) byte offsets of the pickled estimator in the file."""
+        return self._model_range
+
+    def forest(self):
+        return CompiledForest.from_arrays(
+            self.arrays, self.meta["classes"], self.meta["max_depth"]
+        )
+
+    def load_model(self):
+        """Unpickle the sklearn estimator (a private copy per process)."""
+        start, stop = self._model_range
+        return joblib.load(io.BytesIO(self._buffer[start:stop].tobytes()))
+
+
+def _read_header(path, buffer):
+    if len(buffer) < _PREFIX.size:
+        raise BundleError(f"{path} is too small to be a model bundle")
+
+    magic, version, header_length = _PREFIX.unpack(bytes(buffer[:_PREFIX.size]))
+    if magic != BUNDLE_MAGIC:
+        raise BundleError(f"{path} is not a model bundle")
+    if version != BUNDLE_VERSION:
+        raise BundleError(
+            f"{path} is bundle version {version}; this build reads "
+            f"version {BUNDLE_VERSION}. Rebuild it with model_bundle build."
+        )
+
+    header_end = _PREFIX.size + header_length
+    if header_end > len(buffer):
+        raise BundleError(f"{path} is truncated")
+    try:
+        header = json.loads(bytes(buffer[_PREFIX.size:header_end]))
+    except ValueError as e:
+        raise BundleError(f"{path} has a corrupt header: {e}") from e
+
+    return header, _align(header_end)
+
+
+def _view(path, buffer, data_start, name, spec):
+    dtype = np.dtype(spec["dtype"])
+    if dtype.kind != ARRAY_KINDS[name] or dtype.hasobject:
+        raise BundleError(f"{path}: array {name} has unexpected dtype {dtype}")
+
+    shape = tuple(spec["shape"])
+    start = data_start + spec["offset"]
+    stop = start + dtype.itemsize * int(np.prod(shape))
+    if start % ALIGNMENT or stop > len(buffer):
+        raise BundleError(f"{path}: array {name} lies outside the file")
+
+    return buffer[start:stop].view(dtype).reshape(shape)
+
+
+def _validate_forest(path, kind, arrays, meta):
+    n_nodes = len(arrays["feature"])
+
+    for name in ("threshold", "left", "right", "missing_left", "is_leaf"):
+        if arrays[name].shape != (n_nodes,):
+            raise BundleError(f"{path}: array {name} does not match the node count")
+    if arrays["value"].shape != (n_nodes, len(meta["classes"])):
+        raise BundleError(f"{path}: array value does not match the class count")
+
+    for name in ("left", "right", "roots"):
+        values = arrays[name]
+        if len(values) and (values.min() < 0 or values.max() >= n_nodes):
+            raise BundleError(f"{path}: array {name} points outside the forest")
+
+    # Traversal indexes input columns with these; leaves are never read
+    n_features = len(meta[FEATURE_KEYS[kind]])
+    split_features = arrays["feature"][~arrays["is_leaf"]]
+    if len(split_features) and (
+        split_features.min() < 0 or split_features.max() >= n_features
+    ):
+        raise BundleError(
+            f"{path}: array feature refers to columns outside the "
+            f"{n_features} {kind} features"
+        )
+
+
+def open_bundle(path, kind=None):
+    """Map ``path`` read-only and validate its version, kind and schema."""
+    try:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    except ValueError as e:
+        # numpy refuses to map an empty file
+        raise BundleError(f"{path} is empty") from e
+
+    header, data_start = _read_header(path, buffer)
+
+    bundle_kind = header.get("kind")
+    if bundle_kind not in SCHEMAS:
+        raise BundleError(f"{path} has unknown kind {bundle_kind!r}")
+    if kind is not None and bundle_kind != kind:
+        raise BundleError(f"{path} is a {bundle_kind} bundle, expected {kind}")
+
+    meta = header.get("meta", {})
+    missing = [key for key in SCHEMAS[bundle_kind] + ("classes", "max_depth")
+               if key not in meta]
+    specs = header.get("arrays", {})
+    missing += [name for name in ARRAY_KINDS if name not in specs]
+    if missing or "model" not in header:
+        raise BundleError(
+            f"{path} is missing {', '.join(missing) or 'the model blob'}"
+        )
+
+    arrays = {
+        name: _view(path, buffer, data_start, name, specs[name])
+        for name in ARRAY_KINDS
+    }
+    _validate_forest(path, bundle_kind, arrays, meta)
+
+    model_start = data_start + header["model"]["offset"]
+    model_stop = model_start + header["model"]["length"]
+    if model_stop > len(buffer):
+        raise BundleError(f"{path}: model blob lies outside the file")
+
+    return ModelBundle(
+        path, bundle_kind, meta, arrays, buffer, (model_start, model_stop)
+    )
+
+
+# ==================================================
+# COMMAND LINE
+# ==================================================
+
+def build_from_pickles(name, models_dir=MODELS_DIR):
+    """Bundle the existing joblib artifacts for ``name``."""
+    model = joblib.load(os.path.join(models_dir, f"{name}.pkl"))
+
+    if name == "disease":
+        encoder = joblib.load(os.path.join(models_dir, "disease_label_encoder.pkl"))
+        meta = {
+            "labels": np.asarray(encoder.classes_).tolist(),
+            "symptoms": list(joblib.load(
+                os.path.join(models_dir, "symptom_columns.pkl")
+            )),
+        }
+    else:
+        encoders = joblib.load(os.path.join(models_dir, "heart_label_encoders.pkl"))
+        meta = {
+            "columns": list(joblib.load(
+                os.path.join(models_dir, "heart_columns.pkl")
+            )),
+            "categories": {
+                col: np.asarray(encoder.classes_).tolist()
+                for col, encoder in encoders.items()
+            },
+        }
+
+    return write_bundle(bundle_path(models_dir, name), name, model, meta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect model bundles")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="bundle the joblib artifacts")
+    build.add_argument("--models-dir", default=MODELS_DIR)
+    build.add_argument("--only", nargs="+", choices=list(SCHEMAS),
+                       default=list(SCHEMAS))
+
+    inspect = commands.add_parser("inspect", help="validate and describe a bundle")
+    inspect.add_argument("path")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for name in args.only:
+            path = build_from_pickles(name, args.models_dir)
+            print(f"{name}: {os.path.getsize(path) / 1e6:.1f} MB -> {path}")
+        return
+
+    try:
+        bundle = open_bundle(args.path)
+    except BundleError as e:
+        sys.exit(str(e))
+
+    print(f"{bundle.path}: {bundle.kind} bundle, version {BUNDLE_VERSION}")
+    print(f"  classes: {len(bundle.meta['classes'])}, "
+          f"trees: {len(bundle.arrays['roots'])}, "
+          f"nodes: {len(bundle.arrays['feature'])}")
+    for name, array in bundle.arrays.items():
+        print(f"  {name:<13} {str(array.dtype):<8} {str(array.shape):<16} "
+              f"{array.nbytes / 1e6:8.2f} MB")
+    start, stop = bundle.model_range
+    print(f"  {'model':<13} {'joblib':<8} {'':<16} {(stop - start) / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from config import (
+    COMPILED_TREE_MAX_ROWS,
+    DATASETS_DIR,
+    MODELS_DIR,
+    PREDICTION_CACHE_SIZE,
+    PREDICTION_CACHE_TOP_K
+)
+from services.prediction.disease_service import DiseasePredictor
+from services.prediction.model_bundle import model_artifact_path
+
+TRAINING_FILE = "Training.csv"
+
+
+def artifact_signature(path):
+    """Cheap change marker for a model file: (mtime_ns, size)."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PredictionCache:
+    """Top-k disease predictions per symptom set.
+
+    Keys are the symptom vector packed into bits, so every way of selecting
+    the same symptoms maps to one entry. Each entry holds the top ``k``
+    classes given at construction (PREDICTION_CACHE_TOP_K) and is sliced for
+    smaller requests; larger requests are scored directly, bypassing it.
+    """
+
+    def __init__(self, predictor, signature=None,
+                 max_entries=PREDICTION_CACHE_SIZE, k=PREDICTION_CACHE_TOP_K):
+        self.predictor = predictor
+        self.signature = signature
+        self.max_entries = max_entries
+        self.k = k
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prewarmed = 0
+
+    def top_k(self, matrix, k=3):
+        """Drop-in for ``predictor.top_k(predictor.predict_proba(matrix), k)``."""
+        if k > self.k:
+            # Entries are too short to answer this
+            return self.predictor.top_k(self.predictor.predict_proba(matrix), k)
+
+        if sparse.issparse(matrix):
+            matrix = matrix.toarray()
+        present = np.asarray(matrix) != 0
+
+        packed = np.packbits(present, axis=1)
+        keys = [row.tobytes() for row in packed]
+        results = [None] * len(keys)
+        missing = OrderedDict()
+
+        with self._lock:
+            for position, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results[position] = entry
+                else:
+                    missing.setdefault(key, []).append(position)
+            self.misses += sum(map(len, missing.values()))
+
+        if missing:
+            # Score each distinct symptom set once
+            rows = [positions[0] for positions in missing.values()]
+            scored = self._score(present[rows])
+            self._store(zip(missing, scored))
+            for positions, entry in zip(missing.values(), scored):
+                for position in positions:
+                    results[position] = entry
+
+        if not results:
+            empty = np.empty((0, k))
+            return empty.astype(np.intp), empty.astype(object), empty
+
+        indices = np.stack([entry[0][:k] for entry in results])
+        probs = np.stack([entry[1][:k] for entry in results])
+        return indices, self.predictor.class_labels[indices], probs
+
+    def _score(self, present):
+        proba = self.predictor.predict_proba(present.astype(np.float32))
+        indices, _, probs = self.predictor.top_k(proba, self.k)
+        return list(zip(indices, probs))
+
+    def _store(self, items):
+        with self._lock:
+            for key, entry in items:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def prewarm(self, training_csv):
+        """Score every distinct symptom set in the training data once."""
+        df = pd.read_csv(training_csv)
+        present = self.predictor.encode_frame(df) != 0
+        unique = np.unique(np.packbits(present, axis=1), axis=0)
+        unique = np.unpackbits(unique, axis=1, count=present.shape[1]).astype(bool)
+
+        # Compiled-tree sized chunks, so prewarming a bundle-loaded predictor
+        # does not unpickle its sklearn estimator
+        scored = []
+        for start in range(0, len(unique), COMPILED_TREE_MAX_ROWS):
+            scored.extend(self._score(unique[start:start + COMPILED_TREE_MAX_ROWS]))
+        keys = [row.tobytes() for row in np.packbits(unique, axis=1)]
+        self._store(zip(keys, scored))
+        self.prewarmed = len(keys)
+        return self.prewarmed
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "prewarmed": self.prewarmed,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# ==================================================
+# PROCESS-WIDE INSTANCE
+# ==================================================
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def get_prediction_cache(models_dir=MODELS_DIR, datasets_dir=DATASETS_DIR):
+    """Return the cache for the current disease model.
+
+    When the disease model (its bundle, or ``disease.pkl``) changes on disk
+    the model is reloaded and a fresh, prewarmed cache replaces the old one.
+    """
+    global _current
+
+    signature = artifact_signature(model_artifact_path(models_dir, "disease"))
+
+    with _current_lock:
+        if _current is None or _current.signature != signature:
+            cache = PredictionCache(
+                DiseasePredictor.from_artifacts(models_dir),
+                signature=signature
+            )
+            training_csv = os.path.join(datasets_dir, TRAINING_FILE)
+            if os.path.exists(training_csv):
+                cache.prewarm(training_csv)
+            _current = cache
+
+        return _current
+
+
+def prediction_cache_stats():
+    with _current_lock:
+        cache = _current
+    return cache.stats() if cache is not None else None
@@ -0,0 +1,309 @@
+"""Train the disease and heart models and write the models/ artifacts.
+
+    cd app && python -m services.prediction.training [--only disease heart] [--n-iter 12]
+
+Each model is a random forest chosen by a randomized hyperparameter search
+with stratified cross-validation across all cores. Identical rows (most of
+Training.csv) are collapsed into one row weighted by its count, so the
+folds score distinct symptom patterns instead of copies of the training
+rows. Artifacts are replaced atomically, the model bundle last, so a
+running app that reloads on the model's signature never sees a mixed set.
+"""
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from config import DATASETS_DIR, MODELS_DIR
+from services.prediction.model_bundle import bundle_path, write_bundle
+
+PARAM_DISTRIBUTIONS = {
+    "n_estimators": [50, 100, 200, 300],
+    "max_depth": [None, 8, 16, 32],
+    "min_samples_leaf": [1, 2, 4],
+    "max_features": ["sqrt", "log2"],
+}
+LATENCY_ROWS = 200
+
+
+# ==================================================
+# HELPERS
+# ==================================================
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def deduplicate(X, y):
+    """Collapse identical (features, label) rows; returns X, y, weights."""
+    frame = X.copy()
+    frame["__label__"] = np.asarray(y)
+    counts = frame.groupby(list(frame.columns), sort=False).size()
+
+    unique = counts.index.to_frame(index=False)
+    weights = counts.to_numpy(dtype=np.float64)
+    return (
+        unique.drop(columns="__label__").astype(X.dtypes.to_dict()),
+        unique["__label__"].to_numpy(),
+        weights,
+    )
+
+
+def search(X, y, weights, folds, n_iter, seed):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import RandomizedSearchCV, StratifiedKFold
+
+    searcher = RandomizedSearchCV(
+        RandomForestClassifier(random_state=seed),
+        PARAM_DISTRIBUTIONS,
+        n_iter=n_iter,
+        cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed),
+        scoring="accuracy",
+        n_jobs=-1,
+        random_state=seed,
+    )
+    searcher.fit(X, y, sample_weight=weights)
+    return searcher
+
+
+def measure_latency(predict_proba, matrix):
+    """Median single-row and full-batch predict_proba time in ms."""
+    singles = []
+    for i in range(min(LATENCY_ROWS, len(matrix))):
+        row = matrix[i:i + 1]
+        start = time.perf_counter()
+        predict_proba(row)
+        singles.append((time.perf_counter() - start) * 1000)
+
+    batches = []
+    for _ in range(3):
+        start = time.perf_counter()
+        predict_proba(matrix)
+        batches.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "single_row_ms": statistics.median(singles),
+        "batch_rows": len(matrix),
+        "batch_ms": statistics.median(batches),
+    }
+
+
+def atomic_dump(obj, path):
+    tmp_path = f"{path}.tmp"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def atomic_write_json(data, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def write_artifacts(models_dir, name, predictor, artifacts, bundle_meta, metadata):
+    """Write side artifacts, the pickled model, the bundle, then the metadata."""
+    os.makedirs(models_dir, exist_ok=True)
+
+    for filename, obj in artifacts.items():
+        atomic_dump(obj, os.path.join(models_dir, filename))
+
+    model_path = os.path.join(models_dir, f"{name}.pkl")
+    atomic_dump(predictor.model, model_path)
+
+    # Predictors load the bundle when it exists, so it goes last
+    bundle = write_bundle(
+        bundle_path(models_dir, name), name, predictor.model, bundle_meta,
+        compiled=predictor.compiled
+    )
+
+    metadata["model"]["size_bytes"] = os.path.getsize(model_path)
+    metadata["model"]["bundle_bytes"] = os.path.getsize(bundle)
+    atomic_write_json(
+        metadata, os.path.join(models_dir, f"{name}_metadata.json")
+    )
+    return model_path
+
+
+def base_metadata(name, dataset_path, rows, unique_rows, searcher):
+    import sklearn
+
+    return {
+        "name": name,
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "sklearn_version": sklearn.__version__,
+        "dataset": {
+            "file": os.path.basename(dataset_path),
+            "sha256": file_sha256(dataset_path),
+            "rows": rows,
+            "unique_rows": unique_rows,
+        },
+        "model": {
+            "type": type(searcher.best_estimator_).__name__,
+            "params": searcher.best_params_,
+        },
+        "cv": {
+            "folds": searcher.n_splits_,
+            "candidates": len(searcher.cv_results_["params"]),
+            "accuracy": float(searcher.best_score_),
+            "accuracy_std": float(
+                searcher.cv_results_["std_test_score"][searcher.best_index_]
+            ),
+        },
+    }
+
+
+# ==================================================
+# MODELS
+# ==================================================
+
+def train_disease(models_dir=MODELS_DIR, datasets_dir=DATASETS_DIR,
+                  folds=5, n_iter=12, seed=0):
+    from sklearn.preprocessing import LabelEncoder
+
+    from services.prediction.disease_service import DiseasePredictor
+
+    dataset_path = os.path.join(datasets_dir, "Training.csv")
+    df = pd.read_csv(dataset_path)
+
+    symptoms = [col for col in df.columns if col != "prognosis"]
+    encoder = LabelEncoder().fit(df["prognosis"])
+
+    X = df[symptoms].astype(np.float32)
+    y = encoder.transform(df["prognosis"])
+    X_unique, y_unique, weights = deduplicate(X, y)
+
+    searcher = search(X_unique, y_unique, weights, folds, n_iter, seed)
+    model = searcher.best_estimator_
+
+    predictor = DiseasePredictor(model, encoder, symptoms)
+    matrix = X.to_numpy()
+
+    metadata = base_metadata("disease", dataset_path, len(df), len(X_unique), searcher)
+    metadata["train_accuracy"] = float(
+        (predictor.predict_proba(matrix).argmax(axis=1) == y).mean()
+    )
+    metadata["latency"] = measure_latency(predictor.predict_proba, matrix)
+
+    path = write_artifacts(models_dir, "disease", predictor, {
+        "disease_label_encoder.pkl": encoder,
+        "symptom_columns.pkl": symptoms,
+    }, {
+        "labels": encoder.classes_.tolist(),
+        "symptoms": symptoms,
+    }, metadata)
+    return path, metadata
+
+
+def train_heart(models_dir=MODELS_DIR, datasets_dir=DATASETS_DIR,
+                folds=5, n_iter=12, seed=0):
+    from sklearn.preprocessing import LabelEncoder
+
+    from services.prediction.heart_service import HeartPredictor
+
+    dataset_path = os.path.join(datasets_dir, "heart.csv")
+    df = pd.read_csv(dataset_path)
+
+    columns = [col for col in df.columns if col != "HeartDisease"]
+    encoders = {
+        col: LabelEncoder().fit(df[col].astype(str))
+        for col in columns
+        if not pd.api.types.is_numeric_dtype(df[col])
+    }
+
+    X = df[columns].copy()
+    for col, encoder in encoders.items():
+        X[col] = encoder.transform(X[col].astype(str))
+    y = df["HeartDisease"].to_numpy()
+    X_unique, y_unique, weights = deduplicate(X, y)
+
+    searcher = search(X_unique, y_unique, weights, folds, n_iter, seed)
+    model = searcher.best_estimator_
+
+    predictor = HeartPredictor(model, encoders, columns)
+    matrix = predictor.encode(df)
+
+    metadata = base_metadata("heart", dataset_path, len(df), len(X_unique), searcher)
+    metadata["train_accuracy"] = float(
+        (predictor.score_encoded(matrix)[0] == y).mean()
+    )
+    metadata["latency"] = measure_latency(predictor.predict_proba, matrix)
+
+    path = write_artifacts(models_dir, "heart", predictor, {
+        "heart_label_encoders.pkl": encoders,
+        "heart_columns.pkl": columns,
+    }, {
+        "columns": columns,
+        "categories": {
+            col: encoder.classes_.tolist() for col, encoder in encoders.items()
+        },
+    }, metadata)
+    return path, metadata
+
+
+TRAINERS = {
+    "disease": train_disease,
+    "heart": train_heart,
+}
+
+
+# ==================================================
+# COMMAND LINE
+# ==================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train the prediction models and write the models/ artifacts"
+    )
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--datasets-dir", default=DATASETS_DIR)
+    parser.add_argument("--only", nargs="+", choices=list(TRAINERS),
+                        default=list(TRAINERS))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--n-iter", type=int, default=12,
+                        help="hyperparameter candidates per model")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--explain", action="store_true",
+                        help="rebuild the global explanation index afterwards")
+    args = parser.parse_args()
+
+    for name in args.only:
+        start = time.perf_counter()
+        path, metadata = TRAINERS[name](
+            args.models_dir, args.datasets_dir,
+            folds=args.folds, n_iter=args.n_iter, seed=args.seed
+        )
+        cv, latency = metadata["cv"], metadata["latency"]
+        print(
+            f"{name}: {metadata['dataset']['unique_rows']}/"
+            f"{metadata['dataset']['rows']} unique rows, "
+            f"cv accuracy {cv['accuracy']:.4f} ± {cv['accuracy_std']:.4f}, "
+            f"{metadata['model']['size_bytes'] / 1e6:.1f} MB, "
+            f"{latency['single_row_ms']:.2f} ms/row, "
+            f"{time.perf_counter() - start:.0f} s -> {path}"
+        )
+        print(f"  params: {metadata['model']['params']}")
+
+        if args.explain:
+            from services.prediction.global_explanations import (
+                BUILDERS,
+                INDEX_FILES
+            )
+            BUILDERS[name](args.models_dir, args.datasets_dir).save(
+                os.path.join(args.models_dir, INDEX_FILES[name])
+            )
+
+
+if __name__ == "__main__":
+    main()
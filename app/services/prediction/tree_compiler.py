@@ -0,0 +1,158 @@
+import numpy as np
+
+LEAF = -1  # sklearn's TREE_LEAF
+
+
+class CompiledForest:
+    """A fitted sklearn tree ensemble flattened into contiguous arrays.
+
+    All trees share one node table, so a batch of rows walks every tree at
+    once with a handful of NumPy operations per depth level instead of one
+    Python call per estimator. Probabilities match sklearn bit for bit:
+    inputs are compared as float32, each tree's leaf distribution is taken
+    exactly as ``tree_.value`` holds it (what ``DecisionTreeClassifier.
+    predict_proba`` returns), and trees are summed in estimator order
+    before dividing by their count.
+    """
+
+    def __init__(self, trees, classes):
+        self.classes_ = np.asarray(classes)
+        self.n_trees = len(trees)
+
+        features = []
+        thresholds = []
+        lefts = []
+        rights = []
+        missing_left = []
+        values = []
+        roots = []
+        offset = 0
+        max_depth = 0
+
+        for tree in trees:
+            n = tree.node_count
+            left = tree.children_left.astype(np.int64)
+            right = tree.children_right.astype(np.int64)
+            leaf = left == LEAF
+            own = np.arange(n, dtype=np.int64)
+
+            # Leaves point at themselves so traversal can run a fixed
+            # number of steps without masking finished rows.
+            lefts.append(np.where(leaf, own, left) + offset)
+            rights.append(np.where(leaf, own, right) + offset)
+            features.append(np.where(leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(tree.threshold.astype(np.float64))
+            missing_left.append(
+                np.asarray(getattr(tree, "missing_go_to_left",
+                                   np.zeros(n, dtype=np.uint8)), dtype=bool)
+            )
+
+            # Classifier trees already store leaf fractions, and sklearn's
+            # predict_proba returns them as stored
+            values.append(
+                tree.value[:, 0, :len(self.classes_)].astype(np.float64)
+            )
+
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        self.feature = np.concatenate(features)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts)
+        self.right = np.concatenate(rights)
+        self.missing_left = np.concatenate(missing_left)
+        self.is_leaf = self.left == np.arange(offset)
+        self.value = np.concatenate(values)
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.max_depth = max_depth
+
+    # Everything traversal reads; together with classes_ and max_depth this
+    # is all a model bundle needs to store
+    ARRAYS = ("feature", "threshold", "left", "right", "missing_left",
+              "is_leaf", "value", "roots")
+
+    def arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    @classmethod
+    def from_arrays(cls, arrays, classes, max_depth):
+        """Rebuild from ``arrays()`` output without copying (e.g. mmap views)."""
+        forest = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            setattr(forest, name, arrays[name])
+        forest.classes_ = np.asarray(classes)
+        forest.n_trees = len(forest.roots)
+        forest.max_depth = int(max_depth)
+        return forest
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Compile a fitted forest or single decision tree classifier."""
+        estimators = getattr(model, "estimators_", None)
+        if estimators is None:
+            estimators = [model]
+
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise TypeError("Only single-output classifiers can be compiled")
+
+        trees = []
+        for estimator in np.ravel(estimators):
+            tree = getattr(estimator, "tree_", None)
+            if tree is None or not hasattr(estimator, "classes_"):
+                raise TypeError(
+                    f"Cannot compile {type(estimator).__name__} estimators"
+                )
+            trees.append(tree)
+
+        return cls(trees, model.classes_)
+
+    def apply(self, X):
+        """Leaf node index per (row, tree)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+
+        # One flat slot per (row, tree); only slots not yet at a leaf are
+        # advanced, so deep trees cost nothing for rows that exit early.
+        node = np.tile(self.roots, len(X))
+        row = np.repeat(np.arange(len(X)), self.n_trees)
+        active = np.arange(node.size)
+        has_nan = np.isnan(X).any()
+
+        while active.size:
+            current = node[active]
+            moving = ~self.is_leaf[current]
+            active = active[moving]
+            current = current[moving]
+
+            x = X[row[active], self.feature[current]]
+            go_left = x <= self.threshold[current]
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_left[current]
+            node[active] = np.where(go_left, self.left[current],
+                                    self.right[current])
+
+        return node.reshape(len(X), self.n_trees)
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        proba = np.zeros((len(leaves), len(self.classes_)), dtype=np.float64)
+
+        # Add trees one at a time in estimator order, like sklearn's
+        # accumulation, so the floating-point sums are identical.
+        for tree in range(self.n_trees):
+            proba += self.value[leaves[:, tree]]
+
+        return proba / self.n_trees
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def compile_model(model):
+    """Return a CompiledForest for ``model``, or None if it is not supported."""
+    try:
+        return CompiledForest.from_sklearn(model)
+    except (TypeError, AttributeError):
+        return None
@@ -1,14 +1,40 @@
 import streamlit as st
 import bcrypt
-from database.db import get_user, create_user, save_login_history
+from concurrent.futures import ThreadPoolExecutor
+
+from config import AUTH_WORKERS, BCRYPT_ROUNDS
+from database.db import get_user, create_user, update_user_password
+from database.login_writer import record_login
+
+# bcrypt releases the GIL, so a small pool bounds how many hashes run at
+# once without tying script threads to CPU-heavy work.
+_executor = ThreadPoolExecutor(
+    max_workers=AUTH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+
+
+def _hash(password):
+    return bcrypt.hashpw(
+        password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    ).decode()
+
+
+def _check(password, hashed_password):
+    return bcrypt.checkpw(password.encode(), hashed_password.encode())
 
 
 def hash_password(password):
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    return _executor.submit(_hash, password).result()
 
 
 def verify_password(password, hashed_password):
-    return bcrypt.checkpw(password.encode(), hashed_password.encode())
+    return _executor.submit(_check, password, hashed_password).result()
+
+
+def hash_rounds(hashed_password):
+    # $2b$<cost>$<salt+hash>
+    return int(hashed_password.split("$")[2])
 
 
 def register_user(username, password, role):
@@ -16,18 +42,34 @@ def register_user(username, password, role):
     create_user(username, hashed, role)
 
 
-def login_user(username, password, selected_role):
+def authenticate(username, password, selected_role):
+    """Return ``(username, role)`` for valid credentials, else None.
+
+    Hashes made with an older work factor are upgraded on success.
+    """
     user = get_user(username)
 
     if user:
         _, db_username, db_password, db_role = user
 
         if db_role == selected_role and verify_password(password, db_password):
-            st.session_state["authenticated"] = True
-            st.session_state["username"] = db_username
-            st.session_state["role"] = db_role
-            save_login_history(db_username, db_role)
-            return True
+            if hash_rounds(db_password) != BCRYPT_ROUNDS:
+                update_user_password(db_username, hash_password(password))
+            return db_username, db_role
+
+    return None
+
+
+def login_user(username, password, selected_role):
+    result = authenticate(username, password, selected_role)
+
+    if result:
+        db_username, db_role = result
+        st.session_state["authenticated"] = True
+        st.session_state["username"] = db_username
+        st.session_state["role"] = db_role
+        record_login(db_username, db_role)
+        return True
 
     return False
 
@@ -41,4 +83,4 @@ def check_auth():
 
 
 def get_role():
-    return st.session_state.get("role")
\ No newline at end of file
+    return st.session_state.get("role")
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config import EXPLANATION_TOP_N
+
+# Same colours shap.plots.waterfall uses
+RAISES_COLOR = "#ff0051"
+LOWERS_COLOR = "#008bfb"
+
+
+def _format_value(value):
+    try:
+        return f"{float(value):g}"
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def contributions_frame(values, data, feature_names, top_n=EXPLANATION_TOP_N):
+    """Top-``top_n`` SHAP contributions by magnitude, plus one row summing the rest."""
+    values = np.asarray(values, dtype=np.float64)
+    order = np.argsort(-np.abs(values), kind="stable")
+    shown, rest = order[:top_n], order[top_n:]
+
+    labels = [f"{feature_names[i]} = {_format_value(data[i])}" for i in shown]
+    contributions = values[shown].tolist()
+
+    if len(rest):
+        labels.append(f"{len(rest)} other features")
+        contributions.append(float(values[rest].sum()))
+
+    frame = pd.DataFrame({"feature": labels, "contribution": contributions})
+    frame["effect"] = np.where(frame["contribution"] >= 0, "raises", "lowers")
+    return frame
+
+
+def chart_spec(title=None, x_title="SHAP value"):
+    """Vega-Lite spec for a frame with feature, contribution and effect columns."""
+    spec = {
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            # Keep the frame's order (largest magnitude first)
+            "y": {"field": "feature", "type": "nominal", "sort": None, "title": None},
+            "x": {"field": "contribution", "type": "quantitative",
+                  "title": x_title},
+            "color": {
+                "field": "effect",
+                "type": "nominal",
+                "scale": {"domain": ["raises", "lowers"],
+                          "range": [RAISES_COLOR, LOWERS_COLOR]},
+                "legend": None,
+            },
+        },
+    }
+    if title:
+        spec["title"] = title
+    return spec
+
+
+def render_explanation(values, base_value, data, feature_names,
+                       top_n=EXPLANATION_TOP_N, title=None):
+    """Draw one row's SHAP values as a bar chart of the top contributions.
+
+    Rendered by the browser through Vega-Lite, so no matplotlib figure is
+    created on the server.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    base_value = float(np.asarray(base_value).reshape(-1)[0])
+
+    st.caption(
+        f"Baseline E[f(x)] = {base_value:.3f} → "
+        f"this patient f(x) = {base_value + values.sum():.3f}"
+    )
+    st.vega_lite_chart(
+        contributions_frame(values, data, feature_names, top_n),
+        chart_spec(title),
+        use_container_width=True
+    )
@@ -0,0 +1,195 @@
+import atexit
+import functools
+import math
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+
+from config import (
+    METRICS_BUFFER_SIZE,
+    METRICS_ENABLED,
+    METRICS_FLUSH_INTERVAL_MS,
+    METRICS_RETENTION_DAYS
+)
+
+# Recording a span is a perf_counter pair and a deque append; the database
+# write happens later on the flusher thread. When the flusher falls behind,
+# the oldest spans are dropped instead of growing without bound.
+_buffer = deque(maxlen=METRICS_BUFFER_SIZE)
+_context = threading.local()
+_flusher = None
+_flusher_lock = threading.Lock()
+
+BACKGROUND_PAGE = "background"
+
+# Spans are stored as per-bucket latency histograms, so the dashboard
+# reads a few summary rows instead of every span. Bins grow by
+# 10%, which bounds the error of a percentile read from them.
+ROLLUP_MINUTES = 5
+HISTOGRAM_MIN_MS = 0.01
+HISTOGRAM_GROWTH = 1.1
+
+
+def set_page(page):
+    """Attribute spans recorded on this script thread to ``page``."""
+    _context.page = page
+
+
+def current_page():
+    return getattr(_context, "page", BACKGROUND_PAGE)
+
+
+def record(stage, duration_ms, page=None):
+    if not METRICS_ENABLED:
+        return
+    _buffer.append((time.time(), page or current_page(), stage, duration_ms))
+    if _flusher is None:
+        _start_flusher()
+
+
+class span:
+    """Time a block: ``with span("summarization"): ...``."""
+
+    __slots__ = ("stage", "page", "start")
+
+    def __init__(self, stage, page=None):
+        self.stage = stage
+        self.page = page
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.stage, (time.perf_counter() - self.start) * 1000, self.page)
+        return False
+
+
+def timed(stage):
+    """Decorator form of ``span``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(stage, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
+
+
+# ==================================================
+# HISTOGRAMS
+# ==================================================
+
+def latency_bin(duration_ms):
+    """Histogram bin of ``duration_ms``; bin ``b`` holds values up to ``bin_upper_ms(b)``."""
+    if duration_ms <= HISTOGRAM_MIN_MS:
+        return 0
+    return math.ceil(
+        math.log(duration_ms / HISTOGRAM_MIN_MS) / math.log(HISTOGRAM_GROWTH)
+    )
+
+
+def bin_upper_ms(latency_bin):
+    return HISTOGRAM_MIN_MS * HISTOGRAM_GROWTH ** latency_bin
+
+
+def rollup_bucket(recorded_at):
+    """``recorded_at`` ("YYYY-MM-DD HH:MM:SS") floored to its rollup bucket."""
+    minute = int(recorded_at[14:16]) // ROLLUP_MINUTES * ROLLUP_MINUTES
+    return f"{recorded_at[:14]}{minute:02d}"
+
+
+def rollup(spans):
+    """``(bucket, page, stage, bin, total)`` rows for formatted spans."""
+    counts = Counter(
+        (rollup_bucket(recorded_at), page, stage, latency_bin(duration_ms))
+        for recorded_at, page, stage, duration_ms in spans
+    )
+    return [key + (total,) for key, total in counts.items()]
+
+
+def histogram_quantile(histogram, q):
+    """Quantile ``q`` of ``(bin, total)`` pairs sorted by bin, as a bin's upper edge."""
+    count = sum(total for _, total in histogram)
+    rank = q * count
+    seen = 0
+    for latency_bin, total in histogram:
+        seen += total
+        if seen >= rank:
+            return bin_upper_ms(latency_bin)
+    return None
+
+
+# ==================================================
+# BACKGROUND FLUSH
+# ==================================================
+
+def _drain():
+    spans = []
+    while True:
+        try:
+            spans.append(_buffer.popleft())
+        except IndexError:
+            return spans
+
+
+def flush():
+    """Add every buffered span to the histogram rollups in one transaction."""
+    # Imported here because database.db itself records spans
+    from database import db
+
+    spans = _drain()
+    if not spans:
+        return 0
+
+    try:
+        db.save_metric_rollups(rollup([
+            (datetime.fromtimestamp(ts).strftime(db.LOGIN_TIME_FORMAT),
+             page, stage, duration_ms)
+            for ts, page, stage, duration_ms in spans
+        ]))
+    except Exception:
+        # Put them back for the next attempt (oldest still drop first)
+        _buffer.extendleft(reversed(spans))
+        raise
+    return len(spans)
+
+
+def _flush_at_exit():
+    try:
+        flush()
+    except Exception:
+        pass
+
+
+def _run():
+    from database import db
+
+    last_prune = 0.0
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL_MS / 1000)
+        try:
+            flush()
+            if time.monotonic() - last_prune > 3600:
+                last_prune = time.monotonic()
+                cutoff = datetime.now() - timedelta(days=METRICS_RETENTION_DAYS)
+                db.prune_metric_rollups(cutoff.strftime(db.LOGIN_TIME_FORMAT))
+        except Exception:
+            # Metrics must never take the app down; try again next interval
+            pass
+
+
+def _start_flusher():
+    global _flusher
+
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(
+                target=_run, name="metrics-flusher", daemon=True
+            )
+            _flusher.start()
+            atexit.register(_flush_at_exit)
@@ -1,22 +1,106 @@
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-import streamlit as st
-import torch
+import threading
+from collections import OrderedDict
+
+from config import TRANSLATION_BATCH_SIZE, TRANSLATION_CACHE_SIZE
+from database.db import get_cached_translations, save_translations
+from services.inference_worker import run_job
+from services.model_registry import registry, seq2seq_loader
+
+TRANSLATOR_MODEL = "Helsinki-NLP/opus-mt-en-hi"
+
+registry.register(TRANSLATOR_MODEL, seq2seq_loader(TRANSLATOR_MODEL))
+
 
-@st.cache_resource
 def load_translator():
-    model_name = "Helsinki-NLP/opus-mt-en-hi"
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-    return tokenizer, model
+    return registry.get(TRANSLATOR_MODEL)
 
-def translate_text(text, language):
-    if language == "English":
-        return text
+
+# =====================================================
+# IN-PROCESS LRU (backed by the translations table)
+# =====================================================
+_memory_cache = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _memory_get(key):
+    with _memory_lock:
+        value = _memory_cache.get(key)
+        if value is not None:
+            _memory_cache.move_to_end(key)
+        return value
+
+
+def _memory_put(key, value):
+    with _memory_lock:
+        _memory_cache[key] = value
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > TRANSLATION_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def generate_translations(texts):
+    """Translate with the local model in padded batches (no caching)."""
+    import torch
 
     tokenizer, model = load_translator()
+    translated = []
 
-    inputs = tokenizer(text, return_tensors="pt", truncation=True)
-    outputs = model.generate(**inputs, max_length=512)
-    translated = tokenizer.decode(outputs[0], skip_special_tokens=True)
+    for start in range(0, len(texts), TRANSLATION_BATCH_SIZE):
+        batch = texts[start:start + TRANSLATION_BATCH_SIZE]
+        inputs = tokenizer(
+            batch,
+            return_tensors="pt",
+            padding=True,
+            truncation=True
+        )
+        with torch.inference_mode():
+            outputs = model.generate(**inputs, max_length=512)
+        translated.extend(
+            tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        )
 
     return translated
+
+
+def translate_batch(texts, language):
+    """Translate every string for one render with as few decodes as possible.
+
+    Identical strings are translated once. Lookups go through the in-process
+    LRU, then the SQLite table, and only the remaining misses reach the model
+    as padded batches, on the inference worker when one is running.
+    """
+    if language == "English":
+        return list(texts)
+
+    results = {}
+    pending = []
+
+    for text in dict.fromkeys(texts):
+        cached = _memory_get((text, language))
+        if cached is not None:
+            results[text] = cached
+        else:
+            pending.append(text)
+
+    if pending:
+        stored = get_cached_translations(pending, language)
+        for text, translated in stored.items():
+            results[text] = translated
+            _memory_put((text, language), translated)
+        pending = [text for text in pending if text not in stored]
+
+    if pending:
+        generated = dict(zip(
+            pending,
+            run_job("translate", {"texts": pending, "language": language})
+        ))
+        save_translations(generated, language)
+        for text, translated in generated.items():
+            results[text] = translated
+            _memory_put((text, language), translated)
+
+    return [results[text] for text in texts]
+
+
+def translate_text(text, language):
+    return translate_batch([text], language)[0]
@@ -0,0 +1,65 @@
+"""Concurrent login throughput: inline bcrypt vs. the bounded worker pool.
+
+    BCRYPT_ROUNDS=12 python benchmarks/auth_throughput.py [--logins 64] [--clients 16]
+
+Each client thread plays a Streamlit script thread calling authenticate().
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import bcrypt  # noqa: E402
+
+from database import db  # noqa: E402
+from utils import auth  # noqa: E402
+
+
+def inline_authenticate(username, password, role):
+    user = db.get_user(username)
+    if user and user[3] == role and bcrypt.checkpw(
+        password.encode(), user[2].encode()
+    ):
+        return user[1], user[3]
+    return None
+
+
+def run(fn, logins, clients):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(
+            lambda i: fn(f"user{i % 8}", "secret", "patient"), range(logins)
+        ))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return logins / elapsed, elapsed / logins * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_NAME = os.path.join(tmp, "bench.db")
+        for i in range(8):
+            auth.register_user(f"user{i}", "secret", "patient")
+
+        print(f"bcrypt rounds={auth.BCRYPT_ROUNDS} workers={auth.AUTH_WORKERS} "
+              f"clients={args.clients} logins={args.logins}")
+        print(f"{'mode':<10}{'logins/s':>10}{'ms/login':>10}")
+        for name, fn in [("inline", inline_authenticate),
+                         ("pooled", auth.authenticate)]:
+            rate, latency = run(fn, args.logins, args.clients)
+            print(f"{name:<10}{rate:>10.1f}{latency:>10.1f}")
+
+        db.close_connections()
+
+
+if __name__ == "__main__":
+    main()
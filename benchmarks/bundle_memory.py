@@ -0,0 +1,148 @@
+"""Resident memory of N predictor processes: joblib pickles vs. mmap bundles.
+
+    python benchmarks/bundle_memory.py [--processes 1 4 8]
+
+Each child process imports the app, then loads the disease and heart
+predictors either from the joblib pickles (private copies) or from the
+model bundles (one shared mapping), and scores every row of Training.csv
+and heart.csv. All children of a run are alive when memory is sampled, so
+PSS charges shared pages fractionally to each of them. Reported numbers
+are the growth caused by loading and scoring, summed over the processes.
+Linux only (reads /proc/self/smaps_rollup).
+"""
+import argparse
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tempfile
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+MODES = ["pickle", "bundle"]
+FIELDS = ["Rss", "Pss", "Shared_Clean", "Private_Clean", "Private_Dirty"]
+CHUNK_ROWS = 256
+
+
+def memory_kb():
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in FIELDS:
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def load_predictors(mode, models_dir):
+    import joblib
+    from services.prediction.disease_service import DiseasePredictor
+    from services.prediction.heart_service import HeartPredictor
+    from services.prediction.model_bundle import bundle_path
+
+    if mode == "bundle":
+        return (
+            DiseasePredictor.from_bundle(bundle_path(models_dir, "disease")),
+            HeartPredictor.from_bundle(bundle_path(models_dir, "heart")),
+        )
+
+    def load(name):
+        return joblib.load(os.path.join(models_dir, name))
+
+    return (
+        DiseasePredictor(load("disease.pkl"), load("disease_label_encoder.pkl"),
+                         load("symptom_columns.pkl")),
+        HeartPredictor(load("heart.pkl"), load("heart_label_encoders.pkl"),
+                       load("heart_columns.pkl")),
+    )
+
+
+def child(mode, models_dir, barrier, results):
+    sys.path.insert(0, APP_DIR)
+
+    # Everything except the models themselves
+    import sklearn.preprocessing  # noqa: F401
+    import services.prediction.disease_service  # noqa: F401
+    import services.prediction.heart_service  # noqa: F401
+
+    training = fixtures.load_training()
+    heart = fixtures.load_heart()
+
+    barrier.wait()
+    before = memory_kb()
+    barrier.wait()
+
+    disease, heart_predictor = load_predictors(mode, models_dir)
+    symptoms = disease.encode_frame(training)
+    heart_matrix = heart_predictor.encode(heart)
+    # Request-sized batches, as the pages and the inference worker send them
+    for start in range(0, len(symptoms), CHUNK_ROWS):
+        disease.predict_proba(symptoms[start:start + CHUNK_ROWS])
+    for start in range(0, len(heart_matrix), CHUNK_ROWS):
+        heart_predictor.predict_proba(heart_matrix[start:start + CHUNK_ROWS])
+
+    barrier.wait()
+    after = memory_kb()
+    barrier.wait()
+
+    results.put({key: after[key] - before[key] for key in FIELDS})
+
+
+def run(mode, processes, models_dir):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(processes)
+    results = ctx.Queue()
+
+    children = [
+        ctx.Process(target=child, args=(mode, models_dir, barrier, results))
+        for _ in range(processes)
+    ]
+    for process in children:
+        process.start()
+    deltas = [results.get() for _ in children]
+    for process in children:
+        process.join()
+
+    return {key: sum(delta[key] for delta in deltas) / 1024 for key in FIELDS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("Needs Linux /proc/self/smaps_rollup")
+
+    from services.prediction.model_bundle import build_from_pickles
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        source = fixtures.prediction_models(
+            os.path.join(tempfile.gettempdir(), "bench-models")
+        )
+        for name in os.listdir(source):
+            if name.endswith(".pkl"):
+                shutil.copy(os.path.join(source, name), models_dir)
+        for name in ("disease", "heart"):
+            build_from_pickles(name, models_dir)
+
+        print("Growth from loading both models and scoring both datasets, "
+              "summed over processes (MB)\n")
+        print(f"{'mode':<8} {'procs':>5} {'RSS':>9} {'PSS':>9} "
+              f"{'shared':>9} {'private':>9}")
+
+        for processes in args.processes:
+            for mode in MODES:
+                total = run(mode, processes, models_dir)
+                private = total["Private_Clean"] + total["Private_Dirty"]
+                print(f"{mode:<8} {processes:>5} {total['Rss']:>9.1f} "
+                      f"{total['Pss']:>9.1f} {total['Shared_Clean']:>9.1f} "
+                      f"{private:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
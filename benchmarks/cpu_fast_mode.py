@@ -0,0 +1,96 @@
+"""Fast CPU mode (dynamic int8) vs. fp32: generation latency and output agreement.
+
+    python benchmarks/cpu_fast_mode.py [--model google/flan-t5-base] [--threads 4]
+
+Run per model, then list the ones worth enabling in CPU_FAST_MODELS.
+Agreement is the share of identical outputs and the mean token-level
+similarity of the int8 output to the fp32 output.
+"""
+import argparse
+import copy
+import difflib
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.model_registry import (  # noqa: E402
+    configure_torch_threads,
+    quantize_linear,
+    resident_bytes,
+    seq2seq_loader
+)
+from services.nlp.summarizer import SUMMARIZER_MODEL, generate_batch  # noqa: E402
+from utils.translator import TRANSLATOR_MODEL  # noqa: E402
+
+SAMPLES = [
+    "Hemoglobin is 10.2 g/dL, below the reference range of 13.5 to 17.5.",
+    "The patient reports chest pain on exertion and shortness of breath.",
+    "Fasting glucose was 142 mg/dL and HbA1c 7.1 percent.",
+    "Blood pressure 150/95 mmHg; advised low-salt diet and follow-up.",
+    "No acute findings on chest X-ray. Lungs are clear.",
+    "Serum creatinine 1.8 mg/dL suggests reduced kidney function.",
+    "Total cholesterol 260 mg/dL with LDL of 170 mg/dL.",
+    "Take the prescribed medicine twice a day after meals.",
+]
+
+
+def similarity(a, b):
+    return difflib.SequenceMatcher(None, a.split(), b.split()).ratio()
+
+
+def timed(texts, tokenizer, model, batch_size, max_length, repeat):
+    outputs = generate_batch(texts, tokenizer, model, batch_size, max_length)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        generate_batch(texts, tokenizer, model, batch_size, max_length)
+        times.append(time.perf_counter() - start)
+    return outputs, statistics.median(times) * 1000
+
+
+def bench(name, texts, args):
+    tokenizer, fp32 = seq2seq_loader(name, fast=False)()
+    int8 = quantize_linear(copy.deepcopy(fp32))
+
+    fp32_out, fp32_ms = timed(texts, tokenizer, fp32, args.batch_size,
+                              args.max_length, args.repeat)
+    int8_out, int8_ms = timed(texts, tokenizer, int8, args.batch_size,
+                              args.max_length, args.repeat)
+
+    exact = sum(a == b for a, b in zip(fp32_out, int8_out)) / len(texts)
+    mean_sim = statistics.mean(
+        similarity(a, b) for a, b in zip(fp32_out, int8_out)
+    )
+
+    print(f"\n{name}  ({len(texts)} texts, batch {args.batch_size})")
+    print(f"{'mode':<6}{'MB':>8}{'ms/run':>10}")
+    print(f"{'fp32':<6}{resident_bytes(fp32) / 2**20:>8.1f}{fp32_ms:>10.1f}")
+    print(f"{'int8':<6}{resident_bytes(int8) / 2**20:>8.1f}{int8_ms:>10.1f}")
+    print(f"speedup {fp32_ms / int8_ms:.2f}x  exact match {exact:.0%}  "
+          f"token similarity {mean_sim:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", action="append",
+                        help="checkpoint name or path (repeatable)")
+    parser.add_argument("--texts", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--max-length", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=0,
+                        help="intra-op threads (0 = torch default)")
+    args = parser.parse_args()
+
+    configure_torch_threads(intra_op=args.threads, inter_op=0)
+
+    texts = [SAMPLES[i % len(SAMPLES)] for i in range(args.texts)]
+    for name in args.model or [SUMMARIZER_MODEL, TRANSLATOR_MODEL]:
+        bench(name, texts, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Per-call overhead of database/db.py: pooled layer vs. the previous
+connect-and-init-on-every-call pattern.
+
+    python benchmarks/db_overhead.py [--calls 2000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from database import db  # noqa: E402
+
+
+# ==================================================
+# PREVIOUS PATTERN (inlined for comparison)
+# ==================================================
+
+def legacy_init_user_table(path):
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL
+        )
+        """)
+        conn.commit()
+
+
+def legacy_init_db(path):
+    with sqlite3.connect(path) as conn:
+        c = conn.cursor()
+        c.execute("""
+            SELECT name FROM sqlite_master
+            WHERE type='table' AND name='consultations';
+        """)
+        if c.fetchone():
+            c.execute("PRAGMA table_info(consultations);")
+            c.fetchall()
+        conn.commit()
+
+
+def legacy_get_user(path, username):
+    legacy_init_user_table(path)
+    with sqlite3.connect(path) as conn:
+        c = conn.cursor()
+        c.execute("SELECT * FROM users WHERE username = ?", (username,))
+        return c.fetchone()
+
+
+def legacy_save_consultation(path, *row):
+    legacy_init_db(path)
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+        INSERT INTO consultations
+        (patient_username, name, age, doctor, date, time, symptoms)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, row)
+        conn.commit()
+
+
+# ==================================================
+# TIMING
+# ==================================================
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pooled.db")
+        db.DB_NAME = path
+        db.create_user("bench", "hash", "doctor")
+
+        # Legacy calls get their own rollback-journal database
+        legacy_path = os.path.join(tmp, "legacy.db")
+        with sqlite3.connect(legacy_path) as conn:
+            db._migrate_v1(conn.cursor())
+            conn.execute("INSERT INTO users (username, password, role) "
+                         "VALUES ('bench', 'hash', 'doctor')")
+
+        row = ("bench", "Patient", 40, "Dr. Rao (Neurologist)",
+               "2024-01-01", "10:00:00", "headache")
+
+        results = [
+            ("get_user", "legacy",
+             per_call_us(lambda: legacy_get_user(legacy_path, "bench"), args.calls)),
+            ("get_user", "pooled",
+             per_call_us(lambda: db.get_user("bench"), args.calls)),
+            ("save_consultation", "legacy",
+             per_call_us(lambda: legacy_save_consultation(legacy_path, *row), args.calls)),
+            ("save_consultation", "pooled",
+             per_call_us(lambda: db.save_consultation(*row), args.calls)),
+        ]
+
+        db.close_connections()
+
+    print(f"{'call':<20}{'mode':<10}{'us/call':>10}")
+    for name, mode, micros in results:
+        print(f"{name:<20}{mode:<10}{micros:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
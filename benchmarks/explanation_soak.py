@@ -0,0 +1,128 @@
+"""Soak test for the SHAP explanation renderer.
+
+    python benchmarks/explanation_soak.py [--predictions 10000] [--legacy 500]
+
+Explains and renders ``--predictions`` distinct heart-risk patients the way
+the predictor pages do and samples RSS as it goes. Exits 1 if resident
+memory grows by more than ``--max-growth-mb`` after the warmup sample.
+``--legacy N`` first runs N predictions through the old matplotlib
+waterfall path for comparison.
+"""
+import argparse
+import gc
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import fixtures  # noqa: E402
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        # Peak rather than current RSS, but still shows unbounded growth
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def legacy_render(contributions):
+    # What the pages did before: a new figure per prediction, never closed
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import shap
+    import streamlit as st
+
+    fig = plt.figure(figsize=(8, 5))
+    shap.plots.waterfall(contributions, show=False)
+    st.pyplot(fig)
+
+
+def native_render(contributions, columns):
+    from utils.explanation_chart import render_explanation
+
+    render_explanation(
+        contributions.values,
+        contributions.base_values,
+        contributions.data,
+        columns,
+        title="Heart disease risk"
+    )
+
+
+def soak(name, render, predictor, cache, rows, sample_every):
+    columns = list(predictor.columns)
+    samples = []
+    start = time.perf_counter()
+
+    for i in range(len(rows)):
+        input_df = predictor.to_frame(predictor.encode(rows.iloc[i:i + 1]))
+        contributions = cache.explain(input_df)[:, 1]
+        render(contributions, columns)
+
+        if (i + 1) % sample_every == 0 or i + 1 == len(rows):
+            gc.collect()
+            samples.append((i + 1, rss_mb()))
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{name}: {len(rows)} predictions, "
+          f"{elapsed / len(rows) * 1000:.2f} ms each")
+    for count, rss in samples:
+        print(f"  {count:>7}  {rss:8.1f} MB")
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--predictions", type=int, default=10_000)
+    parser.add_argument("--legacy", type=int, default=0,
+                        help="predictions to run through the matplotlib path first")
+    parser.add_argument("--sample-every", type=int, default=1000)
+    parser.add_argument("--max-growth-mb", type=float, default=20.0)
+    args = parser.parse_args()
+
+    # st.* calls outside `streamlit run` are no-ops that warn on every call
+    logging.disable(logging.WARNING)
+
+    import config
+    config.MODELS_DIR = fixtures.prediction_models(
+        os.path.join(tempfile.gettempdir(), "bench-models")
+    )
+
+    from services.prediction.explainer_cache import ExplainerCache
+    from services.prediction.heart_service import HeartPredictor
+
+    predictor = HeartPredictor.from_artifacts(config.MODELS_DIR)
+    cache = ExplainerCache(predictor.model)
+    heart = fixtures.load_heart()
+
+    if args.legacy:
+        rows = fixtures.synthetic_heart(heart, args.legacy, seed=1)
+        legacy = soak("matplotlib waterfall (legacy)",
+                      lambda contributions, columns: legacy_render(contributions),
+                      predictor, cache, rows, max(1, args.legacy // 5))
+        print(f"  growth: {legacy[-1][1] - legacy[0][1]:+.1f} MB")
+        cache.clear()
+
+    rows = fixtures.synthetic_heart(heart, args.predictions, seed=0)
+    samples = soak("vega-lite renderer", native_render,
+                   predictor, cache, rows, args.sample_every)
+
+    growth = samples[-1][1] - samples[0][1]
+    print(f"  growth after first sample: {growth:+.1f} MB "
+          f"(limit {args.max_growth_mb:.0f} MB)")
+    if growth > args.max_growth_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Offline fixtures for the benchmark suite: synthetic patients, generated
+PDFs, and small locally built models.
+
+Everything is derived from training/datasets and the encoders committed in
+models/, so the suite needs no network access and no trained artifacts.
+"""
+import os
+import random
+import shutil
+
+import joblib
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATASETS_DIR = os.path.join(ROOT, "training", "datasets")
+MODELS_DIR = os.path.join(ROOT, "models")
+
+ARTIFACTS = [
+    "disease_label_encoder.pkl",
+    "symptom_columns.pkl",
+    "heart_columns.pkl",
+    "heart_label_encoders.pkl",
+]
+
+REPORT_PROSE = (
+    "Patient reviewed in clinic with no acute distress. Advised diet and "
+    "exercise and a follow up visit in four weeks. "
+)
+
+
+def load_training():
+    return pd.read_csv(os.path.join(DATASETS_DIR, "Training.csv"))
+
+
+def load_heart():
+    return pd.read_csv(os.path.join(DATASETS_DIR, "heart.csv"))
+
+
+# ==================================================
+# SYNTHETIC PATIENTS
+# ==================================================
+
+def synthetic_symptoms(training, n, seed=0, flip=0.01):
+    """``n`` symptom rows sampled from Training.csv with a few bits flipped."""
+    rng = np.random.default_rng(seed)
+    symptoms = training.drop(columns=["prognosis"])
+    rows = symptoms.to_numpy(dtype=np.float32)[rng.integers(0, len(symptoms), n)]
+    flips = rng.random(rows.shape) < flip
+    rows[flips] = 1.0 - rows[flips]
+    return pd.DataFrame(rows, columns=symptoms.columns)
+
+
+def synthetic_heart(heart, n, seed=0):
+    """``n`` heart.csv-shaped rows with jittered numeric measurements."""
+    rng = np.random.default_rng(seed)
+    df = heart.drop(columns=["HeartDisease"]).iloc[
+        rng.integers(0, len(heart), n)
+    ].reset_index(drop=True)
+
+    for col, spread in [("Age", 3), ("RestingBP", 8), ("Cholesterol", 20),
+                        ("MaxHR", 10)]:
+        df[col] = (df[col] + rng.integers(-spread, spread + 1, n)).clip(lower=0)
+    df["Oldpeak"] = (df["Oldpeak"] + rng.normal(0, 0.2, n)).round(1)
+    return df
+
+
+def synthetic_report(size, seed=0):
+    """Report text of about ``size`` characters mixing prose and lab lines."""
+    from services.nlp.lab_values import CATALOG
+
+    rng = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.3:
+            analyte = rng.choice(CATALOG)
+            low = analyte.low or 0
+            high = analyte.high or low * 2 or 100
+            value = round(rng.uniform(low * 0.8, high * 1.2), 1)
+            line = f"{rng.choice(analyte.synonyms).title()}: {value} {analyte.unit}"
+        else:
+            line = REPORT_PROSE * rng.randint(1, 3)
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def make_pdf(path, pages, seed=0):
+    """Write a ``pages``-page report PDF and return its path."""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(
+            fitz.Rect(40, 40, page.rect.width - 40, page.rect.height - 40),
+            synthetic_report(2500, seed=seed + number),
+            fontsize=9
+        )
+    doc.save(path)
+    doc.close()
+    return path
+
+
+# ==================================================
+# MODELS
+# ==================================================
+
+def prediction_models(directory, n_estimators=50):
+    """A models directory with disease.pkl and heart.pkl.
+
+    Uses the real artifacts when models/ has them, otherwise trains small
+    random forests on the datasets next to copies of the committed encoders.
+    """
+    if all(os.path.exists(os.path.join(MODELS_DIR, name))
+           for name in ("disease.pkl", "heart.pkl")):
+        return MODELS_DIR
+
+    from sklearn.ensemble import RandomForestClassifier
+
+    os.makedirs(directory, exist_ok=True)
+    for name in ARTIFACTS:
+        shutil.copy(os.path.join(MODELS_DIR, name), directory)
+
+    disease_path = os.path.join(directory, "disease.pkl")
+    if not os.path.exists(disease_path):
+        training = load_training()
+        encoder = joblib.load(os.path.join(MODELS_DIR, "disease_label_encoder.pkl"))
+        model = RandomForestClassifier(n_estimators=n_estimators, random_state=0)
+        model.fit(training.drop(columns=["prognosis"]),
+                  encoder.transform(training["prognosis"]))
+        joblib.dump(model, disease_path)
+
+    heart_path = os.path.join(directory, "heart.pkl")
+    if not os.path.exists(heart_path):
+        heart = load_heart()
+        encoders = joblib.load(os.path.join(MODELS_DIR, "heart_label_encoders.pkl"))
+        columns = joblib.load(os.path.join(MODELS_DIR, "heart_columns.pkl"))
+        X = heart[columns].copy()
+        for col, encoder in encoders.items():
+            X[col] = encoder.transform(X[col])
+        model = RandomForestClassifier(n_estimators=n_estimators, random_state=0)
+        model.fit(X, heart["HeartDisease"])
+        joblib.dump(model, heart_path)
+
+    return directory
+
+
+def tiny_seq2seq(directory):
+    """A randomly initialised two-layer T5 with a word-level vocabulary.
+
+    Output text is meaningless, but tokenization, batching, padding and
+    generation follow the same code paths as flan-t5 and opus-mt.
+    """
+    if os.path.exists(os.path.join(directory, "config.json")):
+        return directory
+
+    from tokenizers import Tokenizer, models, pre_tokenizers, trainers
+    from transformers import (
+        PreTrainedTokenizerFast,
+        T5Config,
+        T5ForConditionalGeneration
+    )
+
+    symptoms = load_training().columns.drop("prognosis")
+    corpus = [
+        " ".join(symptom.replace("_", " ") for symptom in symptoms),
+        synthetic_report(20000),
+    ]
+
+    tokenizer = Tokenizer(models.WordLevel(unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.train_from_iterator(corpus, trainers.WordLevelTrainer(
+        special_tokens=["<pad>", "</s>", "<unk>"]
+    ))
+    fast = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        pad_token="<pad>",
+        eos_token="</s>",
+        unk_token="<unk>",
+        model_max_length=512
+    )
+
+    import torch
+    torch.manual_seed(0)
+    model = T5ForConditionalGeneration(T5Config(
+        vocab_size=len(fast), d_model=64, d_ff=128, num_layers=2,
+        num_heads=2, d_kv=32, decoder_start_token_id=0,
+        pad_token_id=0, eos_token_id=1
+    ))
+
+    fast.save_pretrained(directory)
+    model.save_pretrained(directory)
+    return directory
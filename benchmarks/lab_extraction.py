@@ -0,0 +1,129 @@
+"""Lab-value extraction: single-pass catalog pattern vs. the previous
+three-search extractor, over large synthetic reports.
+
+    python benchmarks/lab_extraction.py [--sizes 100000 1000000 10000000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.nlp.lab_values import CATALOG, extract_lab_values  # noqa: E402
+
+
+# (report text, expected {analyte: (value, unit, status)}); each must be
+# extracted exactly, with no other analytes
+REGRESSION_CASES = [
+    ("WBC 7500 /cumm", {"WBC Count": (7.5, "10^3/uL", "Normal")}),
+    ("WBC count: 7,500 /cumm", {"WBC Count": (7.5, "10^3/uL", "Normal")}),
+    ("Platelet count 250000 cells/uL",
+     {"Platelet Count": (250.0, "10^3/uL", "Normal")}),
+    ("Hemoglobin 135 g/L", {"Hemoglobin": (13.5, "g/dL", "Normal")}),
+    ("Creatinine 88 umol/L", {"Creatinine": (0.995, "mg/dL", "Normal")}),
+    ("WBC 7.5 K/uL", {"WBC Count": (7.5, "K/uL", None)}),
+    ("Cholesterol test pending. Age 67", {}),
+    ("Hemoglobin is low, see page 2", {}),
+    ("Iron deficiency anemia diagnosed in 2019", {}),
+    ("Cholesterol checked on 12/03/2024", {}),
+    ("Mean corpuscular hemoglobin concentration (MCHC) 33 g/dL",
+     {"MCHC": (33.0, "g/dL", "Normal")}),
+]
+
+
+def check_regressions():
+    """Names of the regression cases the extractor gets wrong."""
+    failures = []
+    for text, expected in REGRESSION_CASES:
+        found = {
+            lab.analyte: (lab.value, lab.unit, lab.status)
+            for lab in extract_lab_values(text)
+        }
+        if found != expected:
+            failures.append(f"{text!r}: expected {expected}, got {found}")
+    return failures
+
+
+def legacy_extract(text):
+    # The Report Analyzer's original extractor, kept for comparison
+    findings = {}
+    bp_match = re.search(r'(\d{2,3})/(\d{2,3})', text)
+    if bp_match:
+        findings["Blood Pressure"] = bp_match.group(0)
+    chol_match = re.search(r'cholesterol.*?(\d+)', text, re.IGNORECASE)
+    if chol_match:
+        findings["Cholesterol"] = int(chol_match.group(1))
+    hb_match = re.search(r'hemoglobin.*?(\d+)', text, re.IGNORECASE)
+    if hb_match:
+        findings["Hemoglobin"] = int(hb_match.group(1))
+    return findings
+
+
+def synthetic_report(size, seed=0):
+    """Report text of about ``size`` characters with lab lines and prose."""
+    rng = random.Random(seed)
+    prose = ("Patient reviewed in clinic, no acute distress, advised diet "
+             "and exercise, follow up in four weeks. ")
+    lines = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.3:
+            analyte = rng.choice(CATALOG)
+            low = analyte.low or 0
+            high = analyte.high or low * 2 or 100
+            value = round(rng.uniform(low * 0.8, high * 1.2), 1)
+            line = f"{rng.choice(analyte.synonyms).title()} : {value} {analyte.unit}"
+        else:
+            line = prose * rng.randint(1, 4)
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def adversarial_report(size):
+    """One long line of names with no number: .*? rescans to the end
+    from every occurrence."""
+    return ("cholesterol hemoglobin " * (size // 23 + 1))[:size]
+
+
+def best_of(fn, text, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    failures = check_regressions()
+    if failures:
+        sys.exit("Lab extraction regressions:\n  " + "\n  ".join(failures))
+    print(f"{len(REGRESSION_CASES)} regression cases OK\n")
+
+    print(f"{'report':<12}{'chars':>12}{'analytes':>10}"
+          f"{'legacy ms':>12}{'catalog ms':>12}{'MB/s':>8}")
+
+    cases = [("synthetic", synthetic_report(size)) for size in args.sizes]
+    # Legacy .*? search is quadratic here, so keep this one small
+    cases.append(("adversarial", adversarial_report(100_000)))
+
+    for kind, text in cases:
+        found = len(extract_lab_values(text))
+        legacy = best_of(legacy_extract, text)
+        catalog = best_of(extract_lab_values, text)
+        print(f"{kind:<12}{len(text):>12}{found:>10}"
+              f"{legacy * 1000:>12.1f}{catalog * 1000:>12.1f}"
+              f"{len(text) / catalog / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Cold-start time and import breakdown for the login gate and the pages.
+
+    python benchmarks/startup_time.py [--page pages/3_Heart_Risk.py] [--top 15] [--check]
+
+Each page runs once with Streamlit's AppTest in a fresh interpreter started
+with ``-X importtime``. The timer covers the page script only, because the
+Streamlit server itself is already imported when a user opens a page.
+The login gate runs logged out; every other page runs as a signed-in
+doctor and must render without calling st.stop, or it is reported as
+not rendered instead of timed. ``--check`` exits non-zero if any page
+goes over STARTUP_BUDGET_MS or did not render.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+
+sys.path.insert(0, APP_DIR)
+
+from config import STARTUP_BUDGET_MS  # noqa: E402
+
+PAGES = [
+    "app.py",
+    "pages/2_Disease_Predictor.py",
+    "pages/3_Heart_Risk.py",
+    "pages/4_Report_Analyzer.py",
+    "pages/5_Telemedicine.py",
+    "pages/6_Model_Insights.py",
+    "pages/9_Admin_Dashboard.py",
+]
+
+# Expected to stop at its sign-in form
+LOGIN_GATE = "app.py"
+
+MARKER = "--- page start ---"
+
+# Runs in the child interpreter. The database module is imported before the
+# timer so the page writes to a throwaway file instead of patient_data.db.
+# st.stop is wrapped to tell a rendered page from one that stopped early.
+RUNNER = f"""
+import json, os, sys, time
+sys.path.insert(0, {APP_DIR!r})
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+from database import db
+db.DB_NAME = os.path.join(sys.argv[2], "startup.db")
+stopped = []
+_stop = st.stop
+def stop():
+    stopped.append(True)
+    _stop()
+st.stop = stop
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+if sys.argv[3] == "signed-in":
+    at.session_state["authenticated"] = True
+    at.session_state["username"] = "startup-doctor"
+    at.session_state["role"] = "doctor"
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "stopped": bool(stopped),
+    "errors": [e.value for e in at.exception],
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Self time in microseconds per top-level package, after the marker."""
+    by_package = defaultdict(int)
+    started = False
+
+    for line in stderr.splitlines():
+        if line == MARKER:
+            started = True
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        package = fields[2].strip().split(".")[0]
+        by_package[package] += int(fields[0])
+
+    return by_package
+
+
+def measure(page, tmp):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore",
+         "-c", RUNNER, os.path.join(APP_DIR, page), tmp,
+         "signed-out" if page == LOGIN_GATE else "signed-in"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return result, parse_importtime(proc.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page", action="append",
+                        help="path relative to app/ (repeatable)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=int, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if a page exceeds the budget")
+    args = parser.parse_args()
+
+    over_budget = []
+    not_rendered = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for page in args.page or PAGES:
+            result, by_package = measure(page, tmp)
+
+            if result["stopped"] and page != LOGIN_GATE:
+                # Only the imports and the gate ran; the time means nothing
+                not_rendered.append(page)
+                print(f"\n{page}: stopped before rendering, not timed")
+            else:
+                status = "OK" if result["ms"] <= args.budget_ms else "OVER"
+                if status == "OVER":
+                    over_budget.append(page)
+                print(f"\n{page}: {result['ms']:.0f} ms "
+                      f"(budget {args.budget_ms} ms) {status}")
+            for error in result["errors"]:
+                print(f"  page raised: {error}")
+
+            imported = sorted(by_package.items(), key=lambda kv: -kv[1])
+            print(f"  {'package':<24}{'import ms':>10}")
+            for package, us in imported[:args.top]:
+                print(f"  {package:<24}{us / 1000:>10.1f}")
+
+    if not_rendered:
+        print(f"\nNot rendered: {', '.join(not_rendered)}")
+    if over_budget:
+        print(f"\nOver budget: {', '.join(over_budget)}")
+    if args.check and (over_budget or not_rendered):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
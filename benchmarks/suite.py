@@ -0,0 +1,429 @@
+"""Offline benchmark suite for every hot path, with JSON results.
+
+    python benchmarks/suite.py run [--only disease heart shap pdf regex nlp db metrics]
+                                   [--db-sizes 1000 10000 100000 1000000]
+                                   [--out bench.json]
+    python benchmarks/suite.py compare baseline.json candidate.json [--threshold 0.15]
+
+``run`` builds its fixtures from training/datasets (see fixtures.py) and
+writes one median/p95 timing per case, plus environment metadata. ``compare``
+lines up two result files and exits 1 when a case got slower than the
+threshold allows.
+"""
+import argparse
+import datetime
+import importlib.metadata
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import fixtures  # noqa: E402
+
+GROUPS = ["disease", "heart", "shap", "pdf", "regex", "nlp", "db", "metrics"]
+DB_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+PACKAGES = [
+    "numpy", "pandas", "scikit-learn", "scipy", "shap", "torch",
+    "transformers", "pymupdf", "streamlit", "bcrypt",
+]
+
+
+# ==================================================
+# TIMING AND METADATA
+# ==================================================
+
+def measure(fn, repeat=20, warmup=1):
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+
+    times.sort()
+    return {
+        "median_ms": statistics.median(times),
+        "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))],
+        "min_ms": times[0],
+        "runs": repeat,
+    }
+
+
+def environment():
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=fixtures.ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+        "env": {
+            name: os.environ[name] for name in sorted(os.environ)
+            if name in ("CPU_FAST_MODELS", "COMPILED_TREE_MAX_ROWS",
+                        "TORCH_INTRA_OP_THREADS", "OMP_NUM_THREADS",
+                        "PDF_WORKERS", "SUMMARY_BATCH_SIZE")
+        },
+    }
+
+
+# ==================================================
+# GROUPS
+# ==================================================
+
+def bench_disease(ctx, results):
+    from services.prediction.disease_service import DiseasePredictor
+    from services.prediction.prediction_cache import PredictionCache
+
+    predictor = DiseasePredictor.from_artifacts(ctx["models_dir"])
+    batch = predictor.encode_frame(
+        fixtures.synthetic_symptoms(fixtures.load_training(), 1000)
+    )
+    single = batch[:1]
+
+    results["disease.single.predict_proba"] = measure(
+        lambda: predictor.predict_proba(single), repeat=200)
+    results["disease.single.sklearn"] = measure(
+        lambda: predictor.model.predict_proba(predictor.to_frame(single)))
+    results["disease.batch_1000.predict_proba"] = measure(
+        lambda: predictor.predict_proba(batch), repeat=5)
+
+    cache = PredictionCache(predictor)
+    cache.top_k(batch, 3)
+    results["disease.single.cache_hit"] = measure(
+        lambda: cache.top_k(single, 3), repeat=500)
+    results["disease.batch_1000.cache_hit"] = measure(
+        lambda: cache.top_k(batch, 3), repeat=20)
+
+
+def bench_heart(ctx, results):
+    import io
+
+    from services.prediction.heart_service import HeartPredictor
+
+    predictor = HeartPredictor.from_artifacts(ctx["models_dir"])
+    roster = fixtures.synthetic_heart(fixtures.load_heart(), 10_000)
+    single = roster.iloc[:1]
+    batch = roster.iloc[:1000]
+    roster_csv = roster.to_csv(index=False)
+
+    results["heart.single.score"] = measure(
+        lambda: predictor.score(single), repeat=200)
+    results["heart.batch_1000.score"] = measure(
+        lambda: predictor.score(batch), repeat=5)
+    results["heart.cohort_10000.score_cohort"] = measure(
+        lambda: predictor.score_cohort(io.StringIO(roster_csv), io.StringIO()),
+        repeat=3)
+
+
+def bench_shap(ctx, results):
+    from services.prediction.explainer_cache import ExplainerCache
+    from services.prediction.heart_service import HeartPredictor
+
+    predictor = HeartPredictor.from_artifacts(ctx["models_dir"])
+    rows = predictor.to_frame(predictor.encode(
+        fixtures.synthetic_heart(fixtures.load_heart(), 50, seed=1)
+    ))
+    cache = ExplainerCache(predictor.model)
+    cache.explain(rows[:1])  # build the TreeExplainer once
+
+    misses = itertools.cycle(range(1, len(rows)))
+    results["shap.heart.explain_miss"] = measure(
+        lambda: cache.explain(rows.iloc[[next(misses)]]), repeat=10)
+    results["shap.heart.explain_hit"] = measure(
+        lambda: cache.explain(rows[:1]), repeat=200)
+
+
+def bench_pdf(ctx, results):
+    from services.nlp.pdf_extractor import extract_text
+
+    for pages in (10, 200):
+        path = fixtures.make_pdf(
+            os.path.join(ctx["work_dir"], f"report_{pages}.pdf"), pages
+        )
+        with open(path, "rb") as f:
+            data = f.read()
+
+        results[f"pdf.pages_{pages}.extract_serial"] = measure(
+            lambda: extract_text(data, parallel_threshold=10**9), repeat=5)
+        results[f"pdf.pages_{pages}.extract_default"] = measure(
+            lambda: extract_text(data), repeat=5)
+
+
+def bench_regex(ctx, results):
+    from services.nlp.lab_values import extract_lab_values, extract_medical_values
+
+    for size in (10_000, 1_000_000):
+        text = fixtures.synthetic_report(size)
+        results[f"regex.chars_{size}.extract_lab_values"] = measure(
+            lambda: extract_lab_values(text), repeat=10)
+    results["regex.chars_10000.extract_medical_values"] = measure(
+        lambda: extract_medical_values(fixtures.synthetic_report(10_000)),
+        repeat=10)
+
+
+def bench_nlp(ctx, results):
+    from services.model_registry import registry, seq2seq_loader
+    from services.nlp import summarizer
+    from utils import translator
+
+    # Same code paths as flan-t5 / opus-mt, with a locally built model
+    tiny = fixtures.tiny_seq2seq(os.path.join(ctx["work_dir"], "tiny_t5"))
+    for name in (summarizer.SUMMARIZER_MODEL, translator.TRANSLATOR_MODEL):
+        registry.register(name, seq2seq_loader(tiny), replace=True)
+
+    tokenizer, model = summarizer.load_summarizer()
+    reports = [fixtures.synthetic_report(6000, seed=i) for i in range(4)]
+    sentences = [line for line in fixtures.synthetic_report(4000).splitlines()][:32]
+
+    results["nlp.summarize.one_report"] = measure(
+        lambda: summarizer.summarize_many(reports[:1], tokenizer, model,
+                                          max_length=32), repeat=3)
+    results["nlp.summarize.four_reports"] = measure(
+        lambda: summarizer.summarize_many(reports, tokenizer, model,
+                                          max_length=32), repeat=3)
+    results["nlp.translate.sentences_32"] = measure(
+        lambda: translator.generate_translations(sentences), repeat=3)
+
+
+def _populate(db, size):
+    rng = fixtures.random.Random(size)
+    today = datetime.date.today()
+    now = datetime.datetime.now()
+    doctors = [f"Dr. {name}" for name in ("Sharma", "Verma", "Iyer", "Khan", "Rao")]
+
+    with db.get_connection() as conn:
+        conn.executemany("""
+        INSERT INTO consultations
+        (patient_username, name, age, doctor, date, time, symptoms)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (f"user{i % 5000}", f"Patient {i}", rng.randint(1, 90),
+             rng.choice(doctors),
+             str(today - datetime.timedelta(days=rng.randint(0, 365))),
+             "10:00", "fever, cough")
+            for i in range(size)
+        ))
+        conn.executemany("""
+        INSERT INTO login_history (username, role, login_time)
+        VALUES (?, ?, ?)
+        """, (
+            (f"user{i % 5000}", rng.choice(("doctor", "patient")),
+             (now - datetime.timedelta(minutes=rng.randint(0, 400 * 1440)))
+             .strftime(db.LOGIN_TIME_FORMAT))
+            for i in range(size)
+        ))
+        conn.executemany("""
+        INSERT INTO users (username, password, role) VALUES (?, ?, ?)
+        """, ((f"user{i}", "$2b$12$" + "x" * 53, "patient") for i in range(size)))
+        conn.executemany("""
+        INSERT INTO translations (source_text, language, translated_text)
+        VALUES (?, ?, ?)
+        """, ((f"text {i}", "Hindi", f"paath {i}") for i in range(size)))
+
+
+def bench_db(ctx, results):
+    from database import db
+
+    for size in ctx["db_sizes"]:
+        db.DB_NAME = os.path.join(ctx["work_dir"], f"bench_{size}.db")
+        _populate(db, size)
+        prefix = f"db.rows_{size}"
+        many = 3 if size >= 100_000 else 20
+        names = itertools.count()
+        misses = itertools.count(size // 2)
+        texts = [f"text {i}" for i in range(0, size, max(1, size // 200))]
+
+        cases = {
+            "save_consultation": lambda: db.save_consultation(
+                "bench", "Bench", 40, "Dr. Rao", "2024-01-01", "10:00", "x"),
+            "get_consultations": (db.get_consultations, many),
+            "get_consultations_by_user.patient": lambda: db.get_consultations_by_user(
+                "user7", "patient"),
+            "get_consultations_by_user.doctor": (
+                lambda: db.get_consultations_by_user("dr", "doctor"), many),
+            "get_consultations_page": lambda: db.get_consultations_page(
+                "dr", "doctor", before_id=size // 2),
+            "get_consultations_page.filtered": lambda: db.get_consultations_page(
+                "dr", "doctor", doctor="Dr. Iyer", date_from="2000-01-01"),
+            "get_statistics": db.get_statistics,
+            "get_doctor_counts": db.get_doctor_counts,
+            "get_daily_counts": db.get_daily_counts,
+            "rebuild_consultation_stats": (db.rebuild_consultation_stats, many),
+            "save_login_history": lambda: db.save_login_history("bench", "doctor"),
+            "save_login_events.256": lambda: db.save_login_events(
+                [("bench", "patient", "2024-01-01 10:00:00")] * 256),
+            "get_login_history": db.get_login_history,
+            "get_login_history_page": lambda: db.get_login_history_page(
+                before_id=size // 2),
+            "get_login_counts_by_day": (db.get_login_counts_by_day, many),
+            "create_user": lambda: db.create_user(
+                f"new{next(names)}", "$2b$12$" + "y" * 53, "doctor"),
+            "update_user_password": lambda: db.update_user_password(
+                "user1", "$2b$12$" + "z" * 53),
+            "get_user.cached": lambda: db.get_user("user2"),
+            "get_user.uncached": lambda: db.get_user(f"user{next(misses) % size}"),
+            "get_cached_translations.200": lambda: db.get_cached_translations(
+                texts, "Hindi"),
+            "save_translations.100": lambda: db.save_translations(
+                {f"new {i}": "x" for i in range(100)}, "Hindi"),
+        }
+
+        for name, case in cases.items():
+            fn, repeat = case if isinstance(case, tuple) else (case, 50)
+            results[f"{prefix}.{name}"] = measure(fn, repeat=repeat)
+
+        # Destructive, so timed once after everything else
+        results[f"{prefix}.apply_login_retention"] = measure(
+            lambda: db.apply_login_retention(30, 180), repeat=1, warmup=0)
+
+        db.close_connections()
+        os.remove(db.DB_NAME)
+
+
+def bench_metrics(ctx, results):
+    from utils import metrics
+
+    def spans(n=1000):
+        for _ in range(n):
+            with metrics.span("bench"):
+                pass
+        metrics._buffer.clear()
+
+    # Per 1000 spans, so median_ms reads as microseconds per span
+    results["metrics.span_x1000"] = measure(spans, repeat=20)
+
+
+BENCHES = {
+    "disease": bench_disease,
+    "heart": bench_heart,
+    "shap": bench_shap,
+    "pdf": bench_pdf,
+    "regex": bench_regex,
+    "nlp": bench_nlp,
+    "db": bench_db,
+    "metrics": bench_metrics,
+}
+
+
+# ==================================================
+# COMMANDS
+# ==================================================
+
+def run(args):
+    with tempfile.TemporaryDirectory() as work_dir:
+        fixtures_dir = args.fixtures_dir or work_dir
+        ctx = {
+            "work_dir": fixtures_dir,
+            "db_sizes": args.db_sizes,
+            "models_dir": fixtures.prediction_models(
+                os.path.join(fixtures_dir, "models")
+            ),
+        }
+
+        results = {}
+        for group in args.only or GROUPS:
+            start = time.perf_counter()
+            BENCHES[group](ctx, results)
+            print(f"{group:<8} done in {time.perf_counter() - start:.1f} s",
+                  file=sys.stderr)
+
+    report = {"environment": environment(), "results": results}
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    print(f"{'case':<60}{'median ms':>12}{'p95 ms':>12}")
+    for name, stats in sorted(results.items()):
+        print(f"{name:<60}{stats['median_ms']:>12.3f}{stats['p95_ms']:>12.3f}")
+    print(f"\nWrote {len(results)} results to {args.out}")
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    for key in ("git_commit", "cpu_count", "machine", "python", "packages"):
+        before = baseline["environment"].get(key)
+        after = candidate["environment"].get(key)
+        if before != after:
+            print(f"note: {key} differs ({before} -> {after})")
+
+    regressions = []
+    print(f"{'case':<60}{'base ms':>10}{'new ms':>10}{'change':>9}")
+
+    for name in sorted(set(baseline["results"]) & set(candidate["results"])):
+        before = baseline["results"][name]["median_ms"]
+        after = candidate["results"][name]["median_ms"]
+        change = (after - before) / before if before else 0.0
+
+        flag = ""
+        if change > args.threshold and after - before > args.min_ms:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -args.threshold:
+            flag = "  faster"
+
+        print(f"{name:<60}{before:>10.3f}{after:>10.3f}{change:>+9.1%}{flag}")
+
+    for name in sorted(set(baseline["results"]) ^ set(candidate["results"])):
+        print(f"{name:<60}  only in one file")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite")
+    run_parser.add_argument("--only", nargs="+", choices=GROUPS)
+    run_parser.add_argument("--db-sizes", nargs="+", type=int, default=DB_SIZES)
+    run_parser.add_argument("--out", default="bench.json")
+    run_parser.add_argument("--fixtures-dir",
+                            help="keep generated models and PDFs here for reuse")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.15,
+                                help="relative slowdown that counts as a regression")
+    compare_parser.add_argument("--min-ms", type=float, default=0.05,
+                                help="ignore absolute slowdowns below this")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compiled array-based tree inference vs. sklearn predict_proba.
+
+    python benchmarks/tree_inference.py [--models-dir models] [--rows 200]
+
+Checks that the compiled forests reproduce sklearn's probabilities bit for
+bit on every row of Training.csv and heart.csv, then reports single-row and
+full-batch latency for sklearn, the compiled forest, and the predictor
+(which picks one by COMPILED_TREE_MAX_ROWS).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+from config import MODELS_DIR  # noqa: E402
+from services.prediction.disease_service import DiseasePredictor  # noqa: E402
+from services.prediction.heart_service import HeartPredictor  # noqa: E402
+
+DATASETS_DIR = os.path.join(ROOT, "training", "datasets")
+
+
+def sklearn_proba(model, matrix, columns):
+    # What the predictors did before compilation
+    if hasattr(model, "feature_names_in_"):
+        matrix = pd.DataFrame(matrix, columns=columns)
+    return model.predict_proba(matrix)
+
+
+def median_ms(fn, inputs):
+    times = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def bench(name, predictor, matrix, columns, rows):
+    model, compiled = predictor.model, predictor.compiled
+    if compiled is None:
+        print(f"\n{name}: {type(model).__name__} is not compilable, skipped")
+        return True
+
+    expected = sklearn_proba(model, matrix, columns)
+    actual = compiled.predict_proba(matrix)
+    identical = np.array_equal(expected, actual)
+
+    singles = [matrix[i:i + 1] for i in range(min(rows, len(matrix)))]
+    sk_single = median_ms(lambda x: sklearn_proba(model, x, columns), singles)
+    cf_single = median_ms(compiled.predict_proba, singles)
+    sk_batch = median_ms(lambda x: sklearn_proba(model, x, columns), [matrix] * 3)
+    cf_batch = median_ms(compiled.predict_proba, [matrix] * 3)
+    auto_single = median_ms(predictor.predict_proba, singles)
+    auto_batch = median_ms(predictor.predict_proba, [matrix] * 3)
+
+    print(f"\n{name}: {compiled.n_trees} trees, max depth {compiled.max_depth}, "
+          f"{len(matrix)} rows, bit-for-bit {'OK' if identical else 'MISMATCH'}")
+    print(f"{'path':<10}{'1 row ms':>10}{'batch ms':>10}")
+    print(f"{'sklearn':<10}{sk_single:>10.3f}{sk_batch:>10.1f}")
+    print(f"{'compiled':<10}{cf_single:>10.3f}{cf_batch:>10.1f}")
+    print(f"{'predictor':<10}{auto_single:>10.3f}{auto_batch:>10.1f}")
+    print(f"speedup   {sk_single / auto_single:>9.1f}x{sk_batch / auto_batch:>9.1f}x")
+    return identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--datasets-dir", default=DATASETS_DIR)
+    parser.add_argument("--rows", type=int, default=200,
+                        help="rows timed one at a time")
+    args = parser.parse_args()
+
+    disease = DiseasePredictor.from_artifacts(args.models_dir)
+    training = pd.read_csv(os.path.join(args.datasets_dir, "Training.csv"))
+    disease_matrix = disease.encode_frame(training)
+
+    heart = HeartPredictor.from_artifacts(args.models_dir)
+    heart_df = pd.read_csv(os.path.join(args.datasets_dir, "heart.csv"))
+    heart_matrix = heart.encode(heart_df)
+
+    ok = bench("disease", disease, disease_matrix, disease.symptoms, args.rows)
+    ok &= bench("heart", heart, heart_matrix, heart.columns, args.rows)
+
+    if not ok:
+        sys.exit("Compiled probabilities differ from sklearn predict_proba")
+
+
+if __name__ == "__main__":
+    main()